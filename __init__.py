@@ -3,8 +3,68 @@ Chord diagram
 =============
 
 Tools to draw a chord diagram in Python, using matplotlib.
-"""
 
-from .chord_diagram import chord_diagram
+The layout functions (:func:`compute_layout`, :func:`compute_geometry`) only
+require NumPy and SciPy: matplotlib is imported only when one of the plotting
+functions or classes is accessed.
+
+All submodules are imported on first access to one of their objects, so that
+``import mpl_chord_diagram`` stays cheap. The plotting function is defined in
+the private ``_chord_diagram`` submodule, so that importing it (e.g. through
+another submodule) never shadows :func:`chord_diagram` in the package
+namespace. The former ``chord_diagram`` submodule is kept as a deprecated,
+callable alias.
+"""
 
 __version__ = "0.5.0-dev"
+
+
+# public objects and the submodules defining them
+_lazy_objects = {
+    "chord_diagram": "._chord_diagram",
+    "chord_arc": "._chord_diagram",
+    "ideogram_arc": "._chord_diagram",
+    "self_chord_arc": "._chord_diagram",
+    "ChordDiagram": ".diagram",
+    "NodeGrouping": ".grouping",
+    "grouped_chord_diagram": ".grouping",
+    "label_propagation": ".grouping",
+    "RenderResult": ".batch",
+    "load_matrix": ".batch",
+    "render_batch": ".batch",
+    "ProfileReport": ".profiling",
+    "StageRecord": ".profiling",
+    "profile_stages": ".profiling",
+    "write_svg": ".svg",
+    "aggregate_edges": ".edgelist",
+    "read_edge_list": ".edgelist",
+    "LayoutCache": ".cache",
+    "PickIndex": ".picking",
+    "PickResult": ".picking",
+    "chord_grid": ".grid",
+    "ChordGeometry": ".layout",
+    "ChordLayout": ".layout",
+    "compute_geometry": ".layout",
+    "compute_layout": ".layout",
+}
+
+__all__ = list(_lazy_objects)
+
+
+def __getattr__(name):
+    if name in _lazy_objects:
+        from importlib import import_module
+
+        obj = getattr(import_module(_lazy_objects[name], __name__), name)
+
+        # cache the object so that __getattr__ is not called again
+        globals()[name] = obj
+
+        return obj
+
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_objects))
@@ -0,0 +1,108 @@
+"""
+Command line interface to render chord diagrams from matrix files.
+
+Usage: python -m mpl_chord_diagram [options] matrix [matrix ...]
+"""
+
+import argparse
+import os
+import sys
+
+from .batch import _duplicates, _use_agg, render_batch
+
+
+def main(argv=None):
+    '''
+    Render the matrices given on the command line, return the exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        prog="mpl_chord_diagram",
+        description="Render chord diagrams from .npy, .npz or CSV matrices "
+                    "in parallel.")
+
+    parser.add_argument("matrices", nargs="+", help="Matrix files.")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="Directory of the images (default: current).")
+    parser.add_argument("-f", "--format", default="png",
+                        help="Format (extension) of the images (default: "
+                             "png).")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: number "
+                             "of CPUs, 0 to render in the main process).")
+    parser.add_argument("--dpi", type=float, default=None,
+                        help="Resolution of the images.")
+    parser.add_argument("--figsize", type=float, nargs=2, default=None,
+                        metavar=("WIDTH", "HEIGHT"),
+                        help="Size of the figures, in inches.")
+    parser.add_argument("--names",
+                        help="Text file with one node name per line.")
+    parser.add_argument("--directed", action="store_true",
+                        help="Draw directed chords.")
+    parser.add_argument("--use-gradient", action="store_true",
+                        help="Draw chords with color gradients.")
+    parser.add_argument("--sort", default="size",
+                        choices=("size", "distance", "none"),
+                        help="Order of the chords (default: size).")
+    parser.add_argument("--cmap", default=None, help="Colormap of the arcs.")
+    parser.add_argument("--max-chords", type=int, default=None,
+                        help="Maximal number of chords drawn.")
+
+    args = parser.parse_args(argv)
+
+    kwargs = dict(
+        directed=args.directed, use_gradient=args.use_gradient,
+        sort=None if args.sort == "none" else args.sort, cmap=args.cmap,
+        max_chords=args.max_chords)
+
+    if args.names is not None:
+        with open(args.names) as f:
+            kwargs["names"] = [line.strip() for line in f if line.strip()]
+
+    out_paths = [
+        os.path.join(args.output_dir, "{}.{}".format(
+            os.path.splitext(os.path.basename(m))[0], args.format))
+        for m in args.matrices
+    ]
+
+    # several inputs with the same name (e.g. a/x.npy and b/x.csv) would
+    # overwrite each other's image
+    duplicates = _duplicates(out_paths)
+
+    if duplicates:
+        sources = [
+            m for m, out in zip(args.matrices, out_paths)
+            if out in duplicates
+        ]
+
+        parser.error(
+            "several matrices would be rendered to the same image ({}): "
+            "{}".format(", ".join(duplicates), ", ".join(sources)))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.workers == 0:
+        # the diagrams are drawn in this process
+        _use_agg()
+
+    def report(result):
+        if result.error is None:
+            print("ok      {:8.3f}s  {} -> {}".format(
+                result.time, result.source, result.out_path))
+        else:
+            print("FAILED  {:8.3f}s  {}\n{}".format(
+                result.time, result.source, result.error), file=sys.stderr)
+
+    results = render_batch(args.matrices, out_paths, workers=args.workers,
+                           figsize=args.figsize, dpi=args.dpi,
+                           callback=report, **kwargs)
+
+    num_failed = sum(r.error is not None for r in results)
+
+    print("{} diagrams rendered, {} failed.".format(
+        len(results) - num_failed, num_failed))
+
+    return 1 if num_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,788 @@
+"""
+Tools to draw a chord diagram in python
+"""
+
+from collections.abc import Sequence
+
+import matplotlib as mpl
+
+from matplotlib.collections import PathCollection
+from matplotlib.colors import ColorConverter, Colormap
+from matplotlib.path import Path
+
+import numpy as np
+
+from .geometry import (ARC_CODES, CHORD_CODES, DIRECTED_CHORD_CODES,
+                       SELF_CHORD_CODES, arc_path, chord_vertices,
+                       chord_triangles, gradient_points,
+                       ideogram_vertices, self_chord_vertices)
+from .gradient import GradientMesh, gradient, gradient_image, gradient_mesh
+from .layout import compute_geometry, compute_layout
+from .profiling import _stage
+
+
+LW = 0.3
+
+
+def chord_diagram(mat, names=None, order=None, sort="size", directed=False,
+                  colors=None, cmap=None, use_gradient=False, chord_colors=None,
+                  alpha=0.7, start_at=0, extent=360, width=0.1, pad=2., gap=0.03,
+                  chordwidth=0.7, min_chord_width=0, fontsize=12.8,
+                  fontcolor="k", rotate_names=False, ax=None, show=False,
+                  use_collections=False, gradient_resolution=None,
+                  gradient_mode="image", max_chords=None,
+                  min_flux_fraction=None, top_k=None, other_color="lightgrey",
+                  rasterize_chords=False, cache=None, min_name_angle=0,
+                  hide_overlapping_names=False, dtype=float):
+    """
+    Plot a chord diagram.
+
+    Draws a representation of many-to-many interactions between elements, given
+    by an interaction matrix.
+    The elements are represented by arcs proportional to their degree and the
+    interactions (or fluxes) are drawn as chords joining two arcs:
+
+    * for undirected chords, the size of the arc is proportional to its
+      out-degree (or simply its degree if the matrix is fully symmetrical), i.e.
+      the sum of the element's row.
+    * for directed chords, the size is proportional to the total-degree, i.e.
+      the sum of the element's row and column.
+
+    Parameters
+    ----------
+    mat : square matrix
+        Flux data, ``mat[i, j]`` is the flux from i to j.
+    names : list of str, optional (default: no names)
+        Names of the nodes that will be displayed (must be ordered as the
+        matrix entries).
+    order : list, optional (default: order of the matrix entries)
+        Order in which the arcs should be placed around the trigonometric
+        circle.
+    sort : str, optional (default: "size")
+        Order in which the chords should be sorted: either None (unsorted),
+        "size" (default, drawing largest chords first), or "distance"
+        (drawing the chords of the two closest arcs at each end of the current
+        arc, then progressing towards the connexions with the farthest arcs in
+        both drections as we move towards the center of the current arc).
+    directed : bool, optional (default: False)
+        Whether the chords should be directed, like edges in a graph, with one
+        part of each arc dedicated to outgoing chords and the other to incoming
+        ones.
+    colors : list, optional (default: from `cmap`)
+        List of user defined colors or floats.
+    cmap : str or colormap object (default: viridis)
+        Colormap that will be used to color the arcs and chords by default.
+        See `chord_colors` to use different colors for chords.
+    use_gradient : bool, optional (default: False)
+        Whether a gradient should be use so that chord extremities have the
+        same color as the arc they belong to.
+    chord_colors : str, or list of colors, optional (default: None)
+        Specify color(s) to fill the chords differently from the arcs.
+        When the keyword is not used, chord colors default to the colomap given
+        by `colors`.
+        Possible values for `chord_colors` are:
+
+        * a single color (do not use an RGB tuple, use hex format instead),
+          e.g. "red" or "#ff0000"; all chords will have this color
+        * a list of colors, e.g. ``["red", "green", "blue"]``, one per node
+          (in this case, RGB tuples are accepted as entries to the list).
+          Each chord will get its color from its associated source node, or
+          from both nodes if `use_gradient` is True.
+    alpha : float in [0, 1], optional (default: 0.7)
+        Opacity of the chord diagram.
+    start_at : float, optional (default : 0)
+        Location, in degrees, where the diagram should start on the unit circle.
+        Default is to start at 0 degrees, i.e. (x, y) = (1, 0) or 3 o'clock),
+        and move counter-clockwise
+    extent : float, optional (default : 360)
+        The angular aperture, in degrees, of the diagram.
+        Default is to use the whole circle, i.e. 360 degrees, but in some cases
+        it can be useful to use only a part of it.
+    width : float, optional (default: 0.1)
+        Width/thickness of the ideogram arc.
+    pad : float, optional (default: 2)
+        Distance between two neighboring ideogram arcs. Unit: degree.
+    gap : float, optional (default: 0)
+        Distance between the arc and the beginning of the cord.
+    chordwidth : float, optional (default: 0.7)
+        Position of the control points for the chords, controlling their shape.
+    min_chord_width : float, optional (default: 0)
+        Minimal chord width to replace small entries and zero reciprocals in
+        the matrix.
+    fontsize : float, optional (default: 12.8)
+        Size of the fonts for the names.
+    fontcolor : str or list, optional (default: black)
+        Color of the fonts for the names.
+    rotate_names : (list of) bool(s), optional (default: False)
+        Whether to rotate all names (if single boolean) or some of them (if
+        list) by 90°.
+    ax : matplotlib axis, optional (default: new axis)
+        Matplotlib axis where the plot should be drawn.
+    show : bool, optional (default: False)
+        Whether the plot should be displayed immediately via an automatic call
+        to `plt.show()`.
+    use_collections : bool, optional (default: False)
+        Whether all arcs and chords should be drawn as two batched
+        :class:`~matplotlib.collections.PathCollection` objects instead of one
+        patch per shape. This is much faster for large matrices and makes it
+        possible to restyle all arcs or chords at once.
+    gradient_resolution : int, optional (default: axis size in pixels)
+        Number of pixels along each side of the image containing the chord
+        gradients if `use_gradient` is True. All gradients are composited
+        into this single image. By default, it follows the size of the axis
+        at the figure's dpi; increase it when saving at a higher dpi.
+    gradient_mode : str, optional (default: "image")
+        How the gradients are drawn if `use_gradient` is True: either "image"
+        (a single raster image, transparent outside of the chords) or "mesh"
+        (a single mesh of triangles with Gouraud shading, which does not
+        depend on the resolution and stays a vector shape in PDF/SVG
+        outputs).
+    max_chords : int, optional (default: all chords)
+        Maximal number of chords to draw, only the largest ones are kept.
+    min_flux_fraction : float, optional (default: 0)
+        Only draw the chords carrying at least this fraction of the total flux.
+    top_k : int, optional (default: all chords)
+        Only draw the chords that are among the `top_k` largest chords of one
+        of their nodes (of their source node if `directed` is True).
+    other_color : valid matplotlib color, optional (default: "lightgrey")
+        If some chords are pruned via `max_chords`, `min_flux_fraction`, or
+        `top_k`, color of the stubs showing the pruned flux at the end of each
+        arc. Use None to hide them. The arcs always keep their exact sizes.
+    rasterize_chords : bool or float, optional (default: False)
+        Whether the chords should be drawn as a single image when the figure
+        is saved in a vector format (PDF, SVG, PS), while the arcs and names
+        stay vectors. This bounds the size of the file for diagrams with many
+        chords. If a float is given, it is the resolution (in DPI) of the
+        image, otherwise the `dpi` passed to ``savefig`` is used.
+        Gradient images (`gradient_mode` "image") are rasters anyway and are
+        not affected.
+    cache : :class:`~mpl_chord_diagram.LayoutCache`, optional (default: None)
+        Cache where the layout and geometry are looked up before being
+        computed, so that drawing the same matrix again with a different style
+        skips all the layout computations.
+    min_name_angle : float, optional (default: 0)
+        Nodes whose arc is smaller than this angle (in degrees) get no name.
+    hide_overlapping_names : bool, optional (default: False)
+        Whether to hide the names that would overlap, keeping those of the
+        largest arcs. Together with `min_name_angle`, this keeps diagrams
+        with many nodes readable, and only the visible names are created
+        (text layout then only depends on the number of visible names).
+    dtype : numpy dtype, optional (default: float)
+        Floating-point type of the layout and geometry (see
+        :func:`~mpl_chord_diagram.compute_layout`), e.g. ``np.float32`` to
+        halve their memory when they are kept in a `cache`.
+
+    Returns
+    -------
+    nodePos : list
+        Position and angle of the names for each node, as (x, y, angle).
+    arcs, chords : :class:`~matplotlib.collections.PathCollection`
+        Only if `use_collections` is True, the collections containing the arcs
+        and the chords.
+    """
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots()
+
+    num_nodes = np.shape(mat)[0]
+
+    # don't use gradient with directed chords
+    use_gradient *= not directed
+
+    if gradient_mode not in ("image", "mesh"):
+        raise ValueError(
+            "Invalid `gradient_mode`: '{}'".format(gradient_mode))
+
+    with _stage("inputs"):
+        names, colors, chord_colors, fontcolor, rotate_names = _check_inputs(
+            num_nodes, names, order, colors, cmap, chord_colors, fontcolor,
+            rotate_names)
+
+    # compute all positions and optionally apply sort
+    layout_kwargs = dict(
+        order=order, sort=sort, directed=directed, start_at=start_at,
+        extent=extent, pad=pad, min_chord_width=min_chord_width,
+        max_chords=max_chords, min_flux_fraction=min_flux_fraction,
+        top_k=top_k, dtype=dtype)
+
+    geometry_kwargs = dict(width=width, gap=gap, chordwidth=chordwidth)
+
+    if cache is None:
+        with _stage("layout"):
+            layout = compute_layout(mat, **layout_kwargs)
+
+        # build the paths of all shapes at once
+        with _stage("geometry"):
+            geometry = compute_geometry(layout, **geometry_kwargs)
+    else:
+        with _stage("cache"):
+            layout, geometry = cache.get(mat, **geometry_kwargs,
+                                         **layout_kwargs)
+
+    nodePos, collections = _draw_diagram(
+        layout, geometry, ax, names, colors, chord_colors, fontcolor,
+        rotate_names, fontsize, alpha, use_gradient, gradient_mode,
+        gradient_resolution, use_collections, other_color, rasterize_chords,
+        min_name_angle, hide_overlapping_names)
+
+    with _stage("tight_layout"):
+        plt.tight_layout()
+
+    if show:
+        plt.show()
+
+    if use_collections:
+        return (nodePos,) + collections
+
+    return nodePos
+
+
+# ------------ #
+# Subfunctions #
+# ------------ #
+
+def _draw_diagram(layout, geometry, ax, names, colors, chord_colors,
+                  fontcolor, rotate_names, fontsize, alpha, use_gradient,
+                  gradient_mode, gradient_resolution, use_collections,
+                  other_color, rasterize_chords, min_name_angle,
+                  hide_overlapping_names):
+    '''
+    Draw the shapes and names of a diagram on `ax` from its layout and
+    geometry (checked inputs, see :func:`_check_inputs`).
+
+    Returns the positions of the names and, if `use_collections` is True,
+    the arc and chord collections (None otherwise).
+    '''
+    nodePos = [tuple(p) for p in layout.node_pos.tolist()]
+
+    radius = geometry.radius
+
+    with _stage("paths"):
+        arc_paths, chord_paths = _get_paths(layout, geometry)
+
+    # plot
+    chord_ax = ax
+
+    if rasterize_chords:
+        from .raster import RasterizedLayer
+
+        dpi = None if rasterize_chords is True else float(rasterize_chords)
+
+        chord_ax = RasterizedLayer(ax, dpi=dpi)
+
+    with _stage("artists", ax):
+        if use_collections:
+            arc_collection, chord_collection = _add_collections(
+                layout, arc_paths, chord_paths, colors, chord_colors, alpha,
+                use_gradient, ax, chord_ax)
+        else:
+            _add_patches(layout, arc_paths, chord_paths, colors,
+                         chord_colors, alpha, use_gradient, ax, chord_ax)
+
+        if rasterize_chords:
+            ax.add_artist(chord_ax)
+
+    if other_color is not None and len(layout.other_node):
+        with _stage("other", ax):
+            _add_other(geometry, other_color, alpha, chord_ax)
+
+    extent = layout.extent
+
+    if use_gradient and gradient_mode == "mesh":
+        with _stage("gradients", ax):
+            _add_gradient_mesh(layout, chord_paths, chord_colors, radius,
+                               extent, alpha, chord_ax)
+    elif use_gradient:
+        with _stage("gradients", ax):
+            _add_gradients(layout, chord_paths, chord_colors, radius, extent,
+                           alpha, gradient_resolution, ax)
+
+    # add names if necessary
+    if names is not None:
+        with _stage("names", ax):
+            _add_names(layout, names, rotate_names, fontsize, fontcolor, ax,
+                       min_name_angle, hide_overlapping_names)
+
+    # configure axis
+    ax.set_xlim(-1.1, 1.1)
+    ax.set_ylim(-1.1, 1.1)
+
+    ax.set_aspect(1)
+    ax.axis('off')
+
+    if use_collections:
+        return nodePos, (arc_collection, chord_collection)
+
+    return nodePos, None
+
+
+def initial_path(start, end, radius, width, factor=4/3):
+    ''' First 16 vertices and 15 instructions are the same for everyone '''
+    start, end, verts = arc_path(start, end, radius, factor)
+
+    return start[0], end[0], list(verts[0]), list(ARC_CODES[:16])
+
+
+def ideogram_arc(start, end, radius=1., width=0.2, color="r", alpha=0.7,
+                 ax=None):
+    '''
+    Draw an arc symbolizing a region of the chord diagram.
+
+    Parameters
+    ----------
+    start : float (degree in 0, 360)
+        Starting degree.
+    end : float (degree in 0, 360)
+        Final degree.
+    radius : float, optional (default: 1)
+        External radius of the arc.
+    width : float, optional (default: 0.2)
+        Width of the arc.
+    ax : matplotlib axis, optional (default: not plotted)
+        Axis on which the arc should be plotted.
+    color : valid matplotlib color, optional (default: "r")
+        Color of the arc.
+
+    Returns
+    -------
+    verts, codes : lists
+        Vertices and path instructions to draw the shape.
+    '''
+    verts = list(ideogram_vertices(start, end, radius, width)[0])
+    codes = list(ARC_CODES)
+
+    if ax is not None:
+        from matplotlib.patches import PathPatch
+
+        path  = Path(verts, codes)
+        patch = PathPatch(path, facecolor=color, alpha=alpha,
+                          edgecolor=color, lw=LW)
+        ax.add_patch(patch)
+
+    return verts, codes
+
+
+def chord_arc(start1, end1, start2, end2, radius=1.0, gap=0.03, pad=2,
+              chordwidth=0.7, ax=None, color="r", cend="r", alpha=0.7,
+              use_gradient=False, extent=360, directed=False,
+              gradient_mode="image"):
+    '''
+    Draw a chord between two regions (arcs) of the chord diagram.
+
+    Parameters
+    ----------
+    start1 : float (degree in 0, 360)
+        Starting degree.
+    end1 : float (degree in 0, 360)
+        Final degree.
+    start2 : float (degree in 0, 360)
+        Starting degree.
+    end2 : float (degree in 0, 360)
+        Final degree.
+    radius : float, optional (default: 1)
+        External radius of the arc.
+    gap : float, optional (default: 0)
+        Distance between the arc and the beginning of the cord.
+    chordwidth : float, optional (default: 0.2)
+        Width of the chord.
+    ax : matplotlib axis, optional (default: not plotted)
+        Axis on which the chord should be plotted.
+    color : valid matplotlib color, optional (default: "r")
+        Color of the chord or of its beginning if `use_gradient` is True.
+    cend : valid matplotlib color, optional (default: "r")
+        Color of the end of the chord if `use_gradient` is True.
+    alpha : float, optional (default: 0.7)
+        Opacity of the chord.
+    use_gradient : bool, optional (default: False)
+        Whether a gradient should be use so that chord extremities have the
+        same color as the arc they belong to.
+    extent : float, optional (default : 360)
+        The angular aperture, in degrees, of the diagram.
+        Default is to use the whole circle, i.e. 360 degrees, but in some cases
+        it can be useful to use only a part of it.
+    directed : bool, optional (default: False)
+        Whether the chords should be directed, ending in an arrow.
+    gradient_mode : str, optional (default: "image")
+        Whether the gradient is drawn as a raster "image" clipped by the chord
+        or as a "mesh" of triangles with Gouraud shading.
+
+    Returns
+    -------
+    verts, codes : lists
+        Vertices and path instructions to draw the shape.
+    '''
+    verts = chord_vertices(start1, end1, start2, end2, radius=radius, gap=gap,
+                           pad=pad, chordwidth=chordwidth, extent=extent,
+                           directed=directed)
+
+    verts = list(verts[0])
+    codes = list(DIRECTED_CHORD_CODES if directed else CHORD_CODES)
+
+    if ax is not None:
+        from matplotlib.patches import PathPatch
+
+        path = Path(verts, codes)
+
+        if use_gradient and gradient_mode == "mesh":
+            starts, ends, min_angles = gradient_points(
+                start1, end1, start2, end2, radius=radius, extent=extent)
+
+            triangles = chord_triangles([verts], directed=directed)
+
+            ax.add_artist(gradient_mesh(triangles, starts, ends, min_angles,
+                                        [color], [cend], alpha))
+        elif use_gradient:
+            # make the patch
+            patch = PathPatch(path, facecolor="none", edgecolor="none",
+                              lw=LW)
+            ax.add_patch(patch)  # this is required to clip the gradient
+
+            _chord_gradient(start1, end1, start2, end2, radius, extent, color,
+                            cend, alpha, patch, ax)
+        else:
+            patch = PathPatch(path, facecolor=color, alpha=alpha,
+                              edgecolor=color, lw=LW)
+
+            ax.add_patch(patch)
+
+    return verts, codes
+
+
+def _check_inputs(num_nodes, names, order, colors, cmap, chord_colors,
+                  fontcolor, rotate_names):
+    '''
+    Check and reorder the names and rotations, and convert the colors.
+    '''
+    # check name rotations
+    if isinstance(rotate_names, Sequence):
+        assert len(rotate_names) == num_nodes, \
+            "Wrong number of entries in 'rotate_names'."
+    else:
+        rotate_names = [rotate_names]*num_nodes
+
+    # check order
+    if order is not None:
+        rotate_names = [rotate_names[i] for i in order]
+
+        if names is not None:
+            names = [names[i] for i in order]
+
+        if colors is not None:
+            colors = [colors[i] for i in order]
+
+    # configure colors
+    if colors is None:
+        colors = np.linspace(0, 1, num_nodes)
+
+    if isinstance(fontcolor, str):
+        fontcolor = [fontcolor]*num_nodes
+    else:
+        assert len(fontcolor) == num_nodes, \
+            "One fontcolor per node is required."
+
+    if cmap is None:
+        cmap = mpl.colormaps["viridis"]
+    elif not isinstance(cmap, Colormap):
+        cmap = mpl.colormaps[cmap]
+
+    if isinstance(colors, (list, tuple, np.ndarray)):
+        assert len(colors) == num_nodes, "One color per node is required."
+
+        # check color type
+        first_color = colors[0]
+
+        if isinstance(first_color, (int, float, np.integer)):
+            colors = cmap(colors)[:, :3]
+        else:
+            colors = [ColorConverter.to_rgb(c) for c in colors]
+    else:
+        raise ValueError("`colors` should be a list.")
+
+    if chord_colors is None:
+       chord_colors = colors
+    else:
+        try:
+            chord_colors = [ColorConverter.to_rgb(chord_colors)] * num_nodes
+        except ValueError:
+            assert len(chord_colors) == num_nodes, \
+                "If `chord_colors` is a list of colors, it should include " \
+                "one color per node (here {} colors).".format(num_nodes)
+
+    return names, colors, chord_colors, fontcolor, rotate_names
+
+
+def _add_names(layout, names, rotate_names, fontsize, fontcolor, ax,
+               min_name_angle=0, hide_overlapping_names=False):
+    '''
+    Add the visible names of the nodes to `ax` and return the texts.
+    '''
+    assert len(names) == layout.num_nodes, "One name per node is required."
+
+    visible = _visible_names(layout, names, rotate_names, fontsize, ax,
+                             min_name_angle, hide_overlapping_names)
+
+    texts = []
+
+    for i in np.where(visible)[0]:
+        name = names[i]
+
+        x, y, rotation, ha, va = _name_props(layout, i, rotate_names[i])
+
+        texts.append(ax.text(x, y, name, rotation=rotation, ha=ha, va=va,
+                             fontsize=fontsize, color=fontcolor[i],
+                             rotation_mode="anchor"))
+
+    return texts
+
+
+def _visible_names(layout, names, rotate_names, fontsize, ax,
+                   min_name_angle, hide_overlapping_names):
+    '''
+    Boolean mask of the names to display.
+    '''
+    from .labels import name_extents, visible_names
+
+    extents = None
+
+    if hide_overlapping_names:
+        extents = name_extents(names, fontsize, rotate_names, ax)
+
+    return visible_names(layout, extents, min_angle=min_name_angle,
+                         avoid_overlap=hide_overlapping_names)
+
+
+def _name_props(layout, i, rotate):
+    '''
+    Position, rotation, and alignment of the name of node `i`.
+    '''
+    x, y, angle = layout.node_pos[i]
+
+    ha, va = "center", "center"
+
+    if rotate:
+        average = np.average(layout.arcs[i])
+        rotate  = 90
+
+        if 90 < average < 180 or 270 < average:
+            rotate = -90
+
+        if 90 < average < 270:
+            ha = "right"
+        else:
+            ha = "left"
+    elif layout.rotation[i]:
+        va = "top"
+    else:
+        va = "bottom"
+
+    return x, y, angle + rotate, ha, va
+
+
+def _get_paths(layout, geometry):
+    '''
+    Build the paths of all arcs and chords of a layout from its geometry.
+    '''
+    arc_paths = [Path(v, geometry.arc_codes) for v in geometry.arc_vertices]
+
+    chord_paths = np.empty(len(layout), dtype=object)
+
+    chord_paths[geometry.self_chord_ids] = [
+        Path(v, geometry.self_chord_codes)
+        for v in geometry.self_chord_vertices
+    ]
+
+    chord_paths[geometry.chord_ids] = [
+        Path(v, geometry.chord_codes) for v in geometry.chord_vertices
+    ]
+
+    return arc_paths, list(chord_paths)
+
+
+def _get_other_paths(geometry):
+    '''
+    Paths of the stubs showing the pruned flux.
+    '''
+    return [
+        Path(v, geometry.self_chord_codes) for v in geometry.other_vertices
+    ]
+
+
+def _get_chord_colors(layout, chord_colors, use_gradient):
+    '''
+    Chords are colored by their source, gradient chords are only used to
+    clip the gradient images.
+    '''
+    return [
+        "none" if use_gradient and not s else chord_colors[i]
+        for i, s in zip(layout.row, layout.is_self)
+    ]
+
+
+def _add_collections(layout, arc_paths, chord_paths, colors, chord_colors,
+                     alpha, use_gradient, ax, chord_ax=None):
+    '''
+    Add all arcs and chords to `ax` as two PathCollections (the chords go to
+    `chord_ax` if it is given).
+    '''
+    arc_collection = PathCollection(
+        arc_paths, facecolors=colors, edgecolors=colors, linewidths=LW,
+        alpha=alpha)
+
+    chord_fc = _get_chord_colors(layout, chord_colors, use_gradient)
+
+    chord_collection = PathCollection(
+        chord_paths, facecolors=chord_fc, edgecolors=chord_fc, linewidths=LW,
+        alpha=alpha)
+
+    ax.add_collection(arc_collection)
+
+    (ax if chord_ax is None else chord_ax).add_collection(chord_collection)
+
+    return arc_collection, chord_collection
+
+
+def _add_patches(layout, arc_paths, chord_paths, colors, chord_colors, alpha,
+                 use_gradient, ax, chord_ax=None):
+    '''
+    Add one patch per arc and per chord to `ax` (the chords go to `chord_ax`
+    if it is given).
+    '''
+    from matplotlib.patches import PathPatch
+
+    for path, color in zip(arc_paths, colors):
+        ax.add_patch(PathPatch(path, facecolor=color, alpha=alpha,
+                               edgecolor=color, lw=LW))
+
+    chord_fc = _get_chord_colors(layout, chord_colors, use_gradient)
+
+    chord_ax = ax if chord_ax is None else chord_ax
+
+    for path, color in zip(chord_paths, chord_fc):
+        chord_ax.add_patch(PathPatch(path, facecolor=color, alpha=alpha,
+                                     edgecolor=color, lw=LW))
+
+
+def _add_other(geometry, color, alpha, ax):
+    '''
+    Add the stubs showing the pruned flux of each node as a PathCollection.
+    '''
+    collection = PathCollection(_get_other_paths(geometry), facecolors=color,
+                                edgecolors=color, linewidths=LW, alpha=alpha)
+
+    ax.add_collection(collection)
+
+    return collection
+
+
+def _add_gradients(layout, chord_paths, chord_colors, radius, extent, alpha,
+                   resolution, ax):
+    '''
+    Add the gradients of all chords (except self-chords) as a single image.
+    '''
+    image = _get_gradient_image(layout, chord_paths, chord_colors, radius,
+                                extent, alpha, resolution, ax)
+
+    if image is None:
+        return None
+
+    # the opacity of the image already follows the chords, so it is not
+    # clipped (a clip path made of all chords is costly to draw and to lay
+    # out)
+    return ax.imshow(image, interpolation='bilinear', origin='lower',
+                     extent=[-1, 1, -1, 1])
+
+
+def _get_gradient_image(layout, chord_paths, chord_colors, radius, extent,
+                        alpha, resolution, ax):
+    '''
+    Image containing the gradients of all chords (except self-chords), None
+    if there are no such chords.
+    '''
+    ids = np.where(~layout.is_self)[0]
+
+    if len(ids) == 0:
+        return None
+
+    starts, ends, min_angles = gradient_points(*layout.positions[ids].T,
+                                               radius=radius, extent=extent)
+
+    if resolution is None:
+        # follow the size of the axis in pixels
+        resolution = max(ax.bbox.width, ax.bbox.height) / 1.1
+
+    return gradient_image(
+        [chord_paths[k] for k in ids], starts, ends, min_angles,
+        [chord_colors[i] for i in layout.row[ids]],
+        [chord_colors[j] for j in layout.col[ids]], alpha,
+        resolution=max(int(resolution), 2))
+
+
+def _add_gradient_mesh(layout, chord_paths, chord_colors, radius, extent,
+                       alpha, ax):
+    '''
+    Add the gradients of all chords (except self-chords) as a single mesh of
+    Gouraud-shaded triangles.
+    '''
+    mesh = _get_gradient_mesh(layout, chord_paths, chord_colors, radius,
+                              extent, alpha)
+
+    ax.add_artist(mesh)
+
+    return mesh
+
+
+def _get_gradient_mesh(layout, chord_paths, chord_colors, radius, extent,
+                       alpha):
+    '''
+    Mesh containing the gradients of all chords (except self-chords).
+    '''
+    ids = np.where(~layout.is_self)[0]
+
+    if len(ids) == 0:
+        return GradientMesh(np.empty((0, 0, 3, 2)), np.empty((0, 0, 3, 4)),
+                            alpha=alpha)
+
+    starts, ends, min_angles = gradient_points(*layout.positions[ids].T,
+                                               radius=radius, extent=extent)
+
+    triangles = chord_triangles(
+        np.array([chord_paths[k].vertices for k in ids]),
+        directed=layout.directed)
+
+    return gradient_mesh(triangles, starts, ends, min_angles,
+                         [chord_colors[i] for i in layout.row[ids]],
+                         [chord_colors[j] for j in layout.col[ids]], alpha)
+
+
+def _chord_gradient(start1, end1, start2, end2, radius, extent, color, cend,
+                    alpha, clip, ax):
+    '''
+    Add the gradient image of a chord, clipped by `clip` (a patch or a
+    transformed path).
+    '''
+    starts, ends, min_angles = gradient_points(
+        start1, end1, start2, end2, radius=radius, extent=extent)
+
+    # make the grid
+    x = y = np.linspace(-1, 1, 100)
+    meshgrid = np.meshgrid(x, y)
+
+    gradient(starts[0], ends[0], min_angles[0], color, cend, meshgrid, clip,
+             ax, alpha)
+
+
+def self_chord_arc(start, end, radius=1.0, chordwidth=0.7, ax=None,
+                   color=(1,0,0), alpha=0.7):
+    verts = list(self_chord_vertices(start, end, radius, chordwidth)[0])
+    codes = list(SELF_CHORD_CODES)
+
+    if ax is not None:
+        from matplotlib.patches import PathPatch
+
+        path  = Path(verts, codes)
+        patch = PathPatch(path, facecolor=color, alpha=alpha,
+                          edgecolor=color, lw=LW)
+        ax.add_patch(patch)
+
+    return verts, codes
@@ -0,0 +1,232 @@
+"""
+Render many chord diagrams in parallel worker processes.
+"""
+
+import os
+import time
+import traceback
+
+from collections import namedtuple
+
+
+RenderResult = namedtuple("RenderResult", ["source", "out_path", "time",
+                                           "error"])
+RenderResult.__doc__ = '''
+Outcome of the rendering of one diagram by :func:`render_batch`.
+
+Attributes
+----------
+source : str or int
+    Path of the matrix file, or index of the matrix in the batch.
+out_path : str
+    Path of the output image.
+time : float
+    Wall time (in seconds) spent loading, drawing, and saving the diagram.
+error : str or None
+    Traceback of the exception that made the rendering fail, None on success.
+'''
+
+
+def render_batch(matrices, out_paths, workers=None, figsize=None, dpi=None,
+                 callback=None, **kwargs):
+    '''
+    Render several chord diagrams to files, in parallel.
+
+    Each diagram is drawn on its own figure, which is closed once saved, in
+    a worker process using the headless Agg backend, so the pyplot state of
+    the calling process is left untouched. A failing diagram is reported in
+    the results and does not stop the batch.
+
+    Parameters
+    ----------
+    matrices : list of matrices or of file paths
+        Flux data of each diagram, either as arrays/sparse matrices or as
+        paths to files readable by :func:`load_matrix` (files are then read
+        by the workers).
+    out_paths : list of str
+        Output file of each diagram; the format is given by the extension.
+        All paths must be different.
+    workers : int, optional (default: number of CPUs)
+        Number of worker processes. If 0, the diagrams are rendered
+        sequentially in the current process, with its current backend (which
+        is not changed, so that its open figures are kept).
+    figsize : tuple of floats, optional (default: matplotlib default)
+        Size of the figures, in inches.
+    dpi : float, optional (default: matplotlib default)
+        Resolution of the raster outputs.
+    callback : callable, optional (default: None)
+        Function called with each :class:`RenderResult` as soon as it is
+        available (e.g. to report progress).
+    **kwargs
+        Other arguments of :func:`~mpl_chord_diagram.chord_diagram` (`ax` and
+        `show` are not allowed).
+
+    Returns
+    -------
+    results : list of :class:`RenderResult`
+        Outcome of each rendering, in the order of `matrices`.
+
+    Examples
+    --------
+    >>> results = render_batch(["a.npy", "b.csv"], ["a.png", "b.png"],
+    ...                        workers=2, use_gradient=True)
+    >>> failed = [r for r in results if r.error is not None]
+    '''
+    if len(matrices) != len(out_paths):
+        raise ValueError("`matrices` and `out_paths` must have the same "
+                         "length.")
+
+    duplicates = _duplicates(out_paths)
+
+    if duplicates:
+        raise ValueError("Several diagrams would be saved to {}.".format(
+            ", ".join(repr(p) for p in duplicates)))
+
+    for key in ("ax", "show"):
+        if key in kwargs:
+            raise ValueError("`{}` cannot be used in `render_batch`.".format(
+                key))
+
+    tasks = [
+        (m if isinstance(m, (str, os.PathLike)) else i, m, str(out), figsize,
+         dpi, kwargs)
+        for i, (m, out) in enumerate(zip(matrices, out_paths))
+    ]
+
+    results = [None]*len(tasks)
+
+    if workers == 0:
+        for i, task in enumerate(tasks):
+            results[i] = _render(*task)
+
+            if callback is not None:
+                callback(results[i])
+
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_use_agg) as executor:
+        futures = {
+            executor.submit(_render, *task): i for i, task in enumerate(tasks)
+        }
+
+        for future in as_completed(futures):
+            i = futures[future]
+
+            try:
+                results[i] = future.result()
+            except Exception:
+                # the worker itself failed (e.g. it was killed)
+                source, _, out = tasks[i][:3]
+
+                results[i] = RenderResult(source, out, float("nan"),
+                                          traceback.format_exc())
+
+            if callback is not None:
+                callback(results[i])
+
+    return results
+
+
+def load_matrix(path):
+    '''
+    Load a flux matrix from a file.
+
+    Parameters
+    ----------
+    path : str
+        Path to a ``.npy`` file, to a ``.npz`` file (either saved by
+        :func:`scipy.sparse.save_npz` or containing a single array, or an
+        array named "mat"), or to a CSV file (comma-separated, lines starting
+        with "#" are ignored).
+
+    Returns
+    -------
+    mat : array or :class:`scipy.sparse.csr_matrix`
+    '''
+    import numpy as np
+
+    ext = os.path.splitext(str(path))[1].lower()
+
+    if ext == ".npy":
+        return np.load(path)
+
+    if ext == ".npz":
+        with np.load(path) as data:
+            if "format" in data.files:
+                # any sparse format saved by scipy (CSR, CSC, COO...)
+                import scipy.sparse as ssp
+
+                return ssp.load_npz(path).tocsr()
+
+            if "mat" in data.files:
+                return data["mat"]
+
+            if len(data.files) == 1:
+                return data[data.files[0]]
+
+        raise ValueError("'{}' contains several arrays but none is named "
+                         "'mat'.".format(path))
+
+    if ext in (".csv", ".txt"):
+        return np.loadtxt(path, delimiter=",", ndmin=2)
+
+    raise ValueError("Unsupported matrix file: '{}'.".format(path))
+
+
+# In-file functions
+
+def _duplicates(out_paths):
+    ''' Output paths used for several diagrams '''
+    seen, duplicates = set(), []
+
+    for out in out_paths:
+        key = os.path.normcase(os.path.abspath(str(out)))
+
+        if key in seen and str(out) not in duplicates:
+            duplicates.append(str(out))
+
+        seen.add(key)
+
+    return duplicates
+
+
+def _use_agg():
+    ''' Switch to the headless Agg backend (worker initializer) '''
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+
+
+def _render(source, mat, out_path, figsize, dpi, kwargs):
+    '''
+    Load, draw and save one diagram, returning a :class:`RenderResult`.
+    '''
+    import matplotlib.pyplot as plt
+
+    from ._chord_diagram import chord_diagram
+
+    start = time.perf_counter()
+
+    fig = None
+
+    try:
+        if isinstance(mat, (str, os.PathLike)):
+            mat = load_matrix(mat)
+
+        fig, ax = plt.subplots(figsize=figsize)
+
+        chord_diagram(mat, ax=ax, **kwargs)
+
+        fig.savefig(out_path, dpi=dpi)
+
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        if fig is not None:
+            plt.close(fig)
+
+    return RenderResult(source, out_path, time.perf_counter() - start, error)
@@ -0,0 +1,227 @@
+"""
+Benchmarks of the layout and drawing of chord diagrams, to run with asv
+(https://asv.readthedocs.io).
+
+Each class sweeps some parameters and measures the wall time (``time_*``)
+and the peak memory allocated by Python (``track_*_memory``, via
+tracemalloc) of one stage: layout, geometry, drawing, or saving.
+Combinations that would be too large (e.g. dense 10k x 10k matrices or
+drawing millions of chords) are skipped.
+"""
+
+import subprocess
+import sys
+import tracemalloc
+
+import numpy as np
+import scipy.sparse as ssp
+
+
+# maximal number of nonzero entries for each stage
+MAX_NNZ_LAYOUT = 1_000_000
+MAX_NNZ_DRAW = 20_000
+MAX_DENSE_NODES = 1000
+
+
+def random_matrix(num_nodes, density, sparse, seed=0):
+    '''
+    Random flux matrix with ``density*num_nodes**2`` nonzero entries.
+    '''
+    rng = np.random.default_rng(seed)
+
+    mat = ssp.random(num_nodes, num_nodes, density=density, format="csr",
+                     random_state=rng, data_rvs=lambda n: rng.random(n) + 0.1)
+
+    return mat if sparse else mat.toarray()
+
+
+def check_size(num_nodes, density, sparse, max_nnz):
+    ''' Skip the benchmark (see asv docs) if the matrix is too large '''
+    if density*num_nodes**2 > max_nnz:
+        raise NotImplementedError("Too many chords.")
+
+    if not sparse and num_nodes > MAX_DENSE_NODES:
+        raise NotImplementedError("Dense matrix is too large.")
+
+
+def peak_memory(func, *args, **kwargs):
+    ''' Peak memory (in bytes) allocated during a call to `func` '''
+    tracemalloc.start()
+
+    try:
+        func(*args, **kwargs)
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _unit(unit):
+    ''' Set the unit of a track_* benchmark '''
+    def decorator(func):
+        func.unit = unit
+        return func
+
+    return decorator
+
+
+class Layout:
+    ''' Scaling of compute_layout with the size and density of the matrix '''
+
+    params = ([10, 100, 1000, 10000], [0.001, 0.01, 0.1, 1.], [False, True])
+    param_names = ["num_nodes", "density", "sparse"]
+
+    def setup(self, num_nodes, density, sparse):
+        from mpl_chord_diagram import compute_layout
+
+        check_size(num_nodes, density, sparse, MAX_NNZ_LAYOUT)
+
+        self.compute_layout = compute_layout
+        self.mat = random_matrix(num_nodes, density, sparse)
+
+    def time_layout(self, num_nodes, density, sparse):
+        self.compute_layout(self.mat)
+
+    @_unit("bytes")
+    def track_layout_memory(self, num_nodes, density, sparse):
+        return peak_memory(self.compute_layout, self.mat)
+
+
+class LayoutOptions:
+    ''' Cost of the layout options on a medium-sized sparse matrix '''
+
+    params = ([False, True], [None, "size", "distance"], [0, 0.5])
+    param_names = ["directed", "sort", "min_chord_width"]
+
+    def setup(self, directed, sort, min_chord_width):
+        from mpl_chord_diagram import compute_layout
+
+        self.compute_layout = compute_layout
+        self.mat = random_matrix(500, 0.05, True)
+
+    def time_layout(self, directed, sort, min_chord_width):
+        self.compute_layout(self.mat, directed=directed, sort=sort,
+                            min_chord_width=min_chord_width)
+
+    @_unit("bytes")
+    def track_layout_memory(self, directed, sort, min_chord_width):
+        return peak_memory(self.compute_layout, self.mat, directed=directed,
+                           sort=sort, min_chord_width=min_chord_width)
+
+
+class Geometry:
+    ''' Computation of the Bezier vertices of all shapes '''
+
+    params = ([10, 100, 1000, 10000], [0.01, 0.1], [False, True])
+    param_names = ["num_nodes", "density", "directed"]
+
+    def setup(self, num_nodes, density, directed):
+        from mpl_chord_diagram import compute_geometry, compute_layout
+
+        check_size(num_nodes, density, True, MAX_NNZ_LAYOUT)
+
+        self.compute_geometry = compute_geometry
+        self.layout = compute_layout(random_matrix(num_nodes, density, True),
+                                     directed=directed)
+
+    def time_geometry(self, num_nodes, density, directed):
+        self.compute_geometry(self.layout)
+
+    @_unit("bytes")
+    def track_geometry_memory(self, num_nodes, density, directed):
+        return peak_memory(self.compute_geometry, self.layout)
+
+
+class Draw:
+    ''' Full chord_diagram call (layout and artists) and saving to PNG '''
+
+    # gradient: False (no gradient) or the `gradient_mode` used
+    params = ([10, 100, 1000], [0.01, 0.1, 1.], [False, True],
+              [False, "image", "mesh"])
+    param_names = ["num_nodes", "density", "directed", "gradient"]
+
+    # drawing large diagrams with gradients is slow
+    timeout = 600
+
+    def setup(self, num_nodes, density, directed, gradient):
+        import matplotlib
+
+        matplotlib.use("Agg")
+
+        import matplotlib.pyplot as plt
+
+        from mpl_chord_diagram import chord_diagram
+
+        check_size(num_nodes, density, True, MAX_NNZ_DRAW)
+
+        if directed and gradient:
+            # gradients are not used for directed chords
+            raise NotImplementedError("No gradient for directed chords.")
+
+        self.plt = plt
+        self.chord_diagram = chord_diagram
+        self.mat = random_matrix(num_nodes, density, True)
+        self.kwargs = dict(directed=directed, use_gradient=bool(gradient),
+                           use_collections=True,
+                           gradient_mode=gradient or "image")
+
+        # figure used to measure the saving stage
+        self.fig, ax = plt.subplots()
+
+        chord_diagram(self.mat, ax=ax, **self.kwargs)
+
+    def teardown(self, *args):
+        self.plt.close("all")
+
+    def _draw(self):
+        fig, ax = self.plt.subplots()
+
+        self.chord_diagram(self.mat, ax=ax, **self.kwargs)
+
+        self.plt.close(fig)
+
+    def _save(self):
+        from io import BytesIO
+
+        self.fig.savefig(BytesIO(), format="png", dpi=100)
+
+    def time_draw(self, *args):
+        self._draw()
+
+    def time_save(self, *args):
+        self._save()
+
+    @_unit("bytes")
+    def track_draw_memory(self, *args):
+        return peak_memory(self._draw)
+
+    @_unit("bytes")
+    def track_save_memory(self, *args):
+        return peak_memory(self._save)
+
+
+class Import:
+    ''' Import time of the package and of its entry points '''
+
+    def timeraw_import_package(self):
+        return "import mpl_chord_diagram"
+
+    def timeraw_import_layout(self):
+        return "from mpl_chord_diagram import compute_layout"
+
+    def timeraw_import_chord_diagram(self):
+        return "from mpl_chord_diagram import chord_diagram"
+
+    @_unit("modules")
+    def track_heavy_modules_on_import(self):
+        '''
+        Number of heavy dependencies loaded by ``import mpl_chord_diagram``,
+        which should stay 0 (see the import-time budget in the README).
+        '''
+        code = ("import sys, mpl_chord_diagram; print(sum(m in sys.modules "
+                "for m in ('numpy', 'scipy', 'matplotlib')))")
+
+        out = subprocess.run([sys.executable, "-c", code], check=True,
+                             capture_output=True, text=True).stdout
+
+        return int(out)
@@ -0,0 +1,248 @@
+"""
+Cache of the layouts and geometries of chord diagrams.
+"""
+
+import hashlib
+import inspect
+import numbers
+import os
+import tempfile
+
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as ssp
+
+from .layout import (ChordGeometry, ChordLayout, compute_geometry,
+                     compute_layout)
+
+
+class LayoutCache:
+    '''
+    Least-recently-used cache of the layouts and geometries computed for a
+    matrix, to reuse them when the same data is drawn again with a different
+    style (colors, names, fonts, alpha...).
+
+    Entries are keyed by a hash of the matrix data and of all the arguments
+    of :func:`~mpl_chord_diagram.compute_layout` and
+    :func:`~mpl_chord_diagram.compute_geometry`, so a cached result is only
+    reused for the exact same inputs.
+
+    Parameters
+    ----------
+    maxsize : int, optional (default: 32)
+        Maximal number of entries kept in memory, the least recently used
+        ones are discarded first.
+    directory : str, optional (default: no disk storage)
+        Directory where the entries are also stored, as ``.npz`` files, so
+        that they can be reused by other processes or sessions.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Number of calls to :meth:`get` that found an entry (in memory or on
+        disk) or had to compute it.
+
+    Examples
+    --------
+    >>> cache = LayoutCache(directory="layouts")
+    >>> for cmap in ("viridis", "magma"):
+    ...     chord_diagram(mat, cmap=cmap, cache=cache)
+    '''
+
+    def __init__(self, maxsize=32, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, mat, width=0.1, gap=0.03, chordwidth=0.7, **kwargs):
+        '''
+        Layout and geometry of `mat`, computed only if they are not cached.
+
+        Parameters
+        ----------
+        mat : square matrix
+            Flux data.
+        width, gap, chordwidth : float, optional
+            Arguments of :func:`~mpl_chord_diagram.compute_geometry`.
+        **kwargs
+            Arguments of :func:`~mpl_chord_diagram.compute_layout`.
+
+        Returns
+        -------
+        layout : :class:`~mpl_chord_diagram.ChordLayout`
+        geometry : :class:`~mpl_chord_diagram.ChordGeometry`
+
+        Notes
+        -----
+        The arrays of cached layouts and geometries are shared between calls
+        and are therefore read-only.
+        '''
+        key = _get_key(mat, kwargs, (width, gap, chordwidth))
+
+        entry = self._entries.get(key)
+
+        if entry is None and self.directory is not None:
+            entry = self._load(key)
+
+        if entry is None:
+            self.misses += 1
+
+            layout = compute_layout(mat, **kwargs)
+            geometry = compute_geometry(layout, width=width, gap=gap,
+                                        chordwidth=chordwidth)
+
+            entry = _freeze(layout, geometry)
+
+            if self.directory is not None:
+                self._save(key, entry)
+        else:
+            self.hits += 1
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self):
+        ''' Remove all entries from memory (files on disk are kept) '''
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "<LayoutCache: {} entries, {} hits, {} misses>".format(
+            len(self), self.hits, self.misses)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _load(self, key):
+        ''' Entry stored on disk, None if there is none '''
+        try:
+            with np.load(self._path(key)) as data:
+                return _freeze(*_from_arrays(data))
+        except FileNotFoundError:
+            return None
+
+    def _save(self, key, entry):
+        ''' Store an entry on disk (atomically, for concurrent processes) '''
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=self.directory)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **_to_arrays(*entry))
+
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+# In-file functions
+
+_LAYOUT_ARRAYS = ("arcs", "node_pos", "rotation", "row", "col", "positions",
+                  "flux", "reverse_flux", "other_node", "other_positions",
+                  "other_flux")
+
+_GEOMETRY_ARRAYS = ("arc_vertices", "chord_vertices", "chord_ids",
+                    "self_chord_vertices", "self_chord_ids", "other_vertices")
+
+
+def _get_key(mat, kwargs, geometry_args):
+    ''' Hash of the matrix data and of the layout and geometry arguments '''
+    from . import __version__
+
+    # use the same key whether the defaults are given explicitly or not
+    bound = inspect.signature(compute_layout).bind(mat, **kwargs)
+    bound.apply_defaults()
+
+    kwargs = dict(bound.arguments)
+
+    del kwargs["mat"]
+
+    h = hashlib.blake2b(digest_size=20)
+
+    if ssp.issparse(mat):
+        mat = ssp.csr_matrix(mat)
+
+        h.update(repr(("csr", mat.shape, mat.dtype.str)).encode())
+
+        for arr in (mat.indptr, mat.indices, mat.data):
+            h.update(np.ascontiguousarray(arr))
+    else:
+        mat = np.ascontiguousarray(mat)
+
+        h.update(repr(("dense", mat.shape, mat.dtype.str)).encode())
+        h.update(mat.reshape(-1).view(np.uint8))
+
+    order = kwargs.pop("order", None)
+
+    if order is not None:
+        h.update(np.asarray(order, dtype=np.int64).tobytes())
+
+    kwargs["dtype"] = np.dtype(kwargs["dtype"]).str
+
+    # 360 and 360.0 give the same layout
+    kwargs = {k: float(v) if isinstance(v, numbers.Number) else v
+              for k, v in kwargs.items()}
+
+    # the algorithms may change between versions
+    h.update(repr((__version__, sorted(kwargs.items()),
+                   tuple(float(x) for x in geometry_args))).encode())
+
+    return h.hexdigest()
+
+
+def _freeze(layout, geometry):
+    ''' Make all arrays of a cache entry read-only '''
+    for obj in (layout, geometry):
+        for value in vars(obj).values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+    return layout, geometry
+
+
+def _to_arrays(layout, geometry):
+    ''' Arrays storing a layout and its geometry '''
+    arrays = {"layout_" + k: getattr(layout, k) for k in _LAYOUT_ARRAYS}
+
+    arrays.update(
+        {"geometry_" + k: getattr(geometry, k) for k in _GEOMETRY_ARRAYS})
+
+    arrays.update(directed=layout.directed, extent=layout.extent,
+                  radius=geometry.radius, width=geometry.width,
+                  gap=geometry.gap)
+
+    return arrays
+
+
+def _from_arrays(data):
+    ''' Layout and geometry from the arrays returned by :func:`_to_arrays` '''
+    directed = bool(data["directed"])
+
+    layout_arrays = {k: data["layout_" + k] for k in _LAYOUT_ARRAYS}
+
+    layout = ChordLayout(directed=directed, extent=float(data["extent"]),
+                         dtype=layout_arrays["positions"].dtype,
+                         **layout_arrays)
+
+    geometry = ChordGeometry(
+        *(data["geometry_" + k] for k in _GEOMETRY_ARRAYS),
+        label_positions=layout.node_pos[:, :2],
+        label_angles=layout.node_pos[:, 2], label_flipped=layout.rotation,
+        radius=float(data["radius"]), directed=directed,
+        width=float(data["width"]), gap=float(data["gap"]))
+
+    return layout, geometry
@@ -0,0 +1,379 @@
+"""
+Stateful chord diagram, to update the artists in place (e.g. for animations).
+"""
+
+import numpy as np
+
+from matplotlib.collections import PathCollection
+
+from ._chord_diagram import (LW, _check_inputs, _get_chord_colors,
+                            _get_gradient_image, _get_gradient_mesh,
+                            _get_other_paths, _get_paths, _name_props)
+from .labels import name_extents, visible_names
+from .layout import compute_geometry, compute_layout
+
+
+class ChordDiagram:
+    '''
+    Chord diagram whose artists are created once and updated in place.
+
+    All arcs and chords are stored in two
+    :class:`~matplotlib.collections.PathCollection` objects.
+    Calling :meth:`update` with a new matrix recomputes the layout and
+    overwrites the paths, colors, and name positions of the existing artists,
+    which makes it suited to animations (e.g. with
+    :class:`~matplotlib.animation.FuncAnimation`, including blitting).
+
+    The arguments are those of :func:`~mpl_chord_diagram.chord_diagram`,
+    except `show` and `use_collections`: the diagram is always made of
+    collections and never shown automatically.
+
+    Parameters
+    ----------
+    mat : square matrix
+        Initial flux data, ``mat[i, j]`` is the flux from i to j.
+    gradient_mode : str, optional (default: "mesh")
+        How the gradients are drawn if `use_gradient` is True (see
+        :func:`~mpl_chord_diagram.chord_diagram`). The default "mesh" mode is
+        much cheaper to update than the "image" mode.
+    ax : matplotlib axis, optional (default: new axis)
+        Matplotlib axis where the diagram should be drawn.
+
+    Other Parameters
+    ----------------
+    names, order, colors, cmap, chord_colors : optional
+        Nodes and their colors, kept for all updates.
+    sort, directed, start_at, extent, pad, min_chord_width : optional
+        Positions of the arcs and chords.
+    max_chords, min_flux_fraction, top_k, other_color : optional
+        Pruning of the chords and color of the pruned flux.
+    width, gap, chordwidth, alpha, use_gradient, gradient_resolution : optional
+        Shapes and colors of the arcs and chords.
+    fontsize, fontcolor, rotate_names : optional
+        Style of the names.
+    min_name_angle, hide_overlapping_names : optional
+        Names that are displayed: one text is still created per node, and
+        the visible names are updated with the layout.
+    rasterize_chords : bool or float, optional
+        Draw the chords, stubs, and gradient mesh as a single image in vector
+        outputs.
+    cache : :class:`~mpl_chord_diagram.LayoutCache`, optional
+        Cache used for the initial layout and by :meth:`update`.
+    dtype : numpy dtype, optional
+        Floating-point type of the layout and geometry.
+
+    Attributes
+    ----------
+    ax : matplotlib axis
+        Axis containing the diagram.
+    layout : :class:`~mpl_chord_diagram.ChordLayout`
+        Layout of the current matrix.
+    geometry : :class:`~mpl_chord_diagram.ChordGeometry`
+        Vertices of the shapes of the current layout.
+    arcs, chords : :class:`~matplotlib.collections.PathCollection`
+        Collections containing the arcs and the chords.
+    other : :class:`~matplotlib.collections.PathCollection`
+        Stubs showing the pruned flux, if any (None if `other_color` is None).
+    layer : :class:`~mpl_chord_diagram.raster.RasterizedLayer`
+        Layer containing the chords, stubs and gradient mesh if
+        `rasterize_chords` is used (None otherwise).
+    gradient : artist
+        Image or mesh containing the gradients (None if `use_gradient` is
+        False).
+    texts : list of :class:`~matplotlib.text.Text`
+        Names of the nodes.
+
+    Examples
+    --------
+    >>> fig, ax = plt.subplots()
+    >>> diagram = ChordDiagram(matrices[0], names=names, ax=ax)
+    >>> anim = FuncAnimation(fig, lambda i: diagram.update(matrices[i]),
+    ...                      frames=len(matrices), blit=True)
+    '''
+
+    def __init__(self, mat, names=None, order=None, sort="size",
+                 directed=False, colors=None, cmap=None, use_gradient=False,
+                 chord_colors=None, alpha=0.7, start_at=0, extent=360,
+                 width=0.1, pad=2., gap=0.03, chordwidth=0.7,
+                 min_chord_width=0, fontsize=12.8, fontcolor="k",
+                 rotate_names=False, ax=None, gradient_resolution=None,
+                 gradient_mode="mesh", max_chords=None,
+                 min_flux_fraction=None, top_k=None,
+                 other_color="lightgrey", rasterize_chords=False,
+                 cache=None, min_name_angle=0, hide_overlapping_names=False,
+                 dtype=float):
+        import matplotlib.pyplot as plt
+
+        if ax is None:
+            _, ax = plt.subplots()
+
+        if gradient_mode not in ("image", "mesh"):
+            raise ValueError(
+                "Invalid `gradient_mode`: '{}'".format(gradient_mode))
+
+        self.ax = ax
+        self.num_nodes = np.shape(mat)[0]
+
+        names, colors, chord_colors, fontcolor, rotate_names = _check_inputs(
+            self.num_nodes, names, order, colors, cmap, chord_colors,
+            fontcolor, rotate_names)
+
+        self._chord_colors = chord_colors
+        self._rotate_names = rotate_names
+
+        # don't use gradient with directed chords
+        self._use_gradient = bool(use_gradient) and not directed
+
+        self._layout_kwargs = dict(
+            order=order, sort=sort, directed=directed, start_at=start_at,
+            extent=extent, pad=pad, min_chord_width=min_chord_width,
+            max_chords=max_chords, min_flux_fraction=min_flux_fraction,
+            top_k=top_k, dtype=dtype)
+
+        self._radius = 1 - width - gap
+        self._geometry_kwargs = dict(width=width, gap=gap,
+                                     chordwidth=chordwidth)
+        self._extent = extent
+        self._alpha = alpha
+        self._gradient_mode = gradient_mode
+        self._gradient_resolution = gradient_resolution
+
+        self._cache = cache
+        self._pick_index = None
+
+        self._min_name_angle = min_name_angle
+        self._hide_overlapping_names = hide_overlapping_names
+        self._name_extents = None
+
+        # create the artists
+        self.layout, self.geometry = self._compute(mat)
+
+        arc_paths, chord_paths = _get_paths(self.layout, self.geometry)
+
+        self.arcs = PathCollection(
+            arc_paths, facecolors=colors, edgecolors=colors, linewidths=LW,
+            alpha=alpha)
+
+        self.chords = PathCollection(chord_paths, linewidths=LW, alpha=alpha)
+
+        self._set_chord_colors()
+
+        self.layer = None
+
+        chord_ax = ax
+
+        if rasterize_chords:
+            from .raster import RasterizedLayer
+
+            dpi = None if rasterize_chords is True else float(rasterize_chords)
+
+            self.layer = chord_ax = RasterizedLayer(ax, dpi=dpi)
+
+        ax.add_collection(self.arcs)
+        chord_ax.add_collection(self.chords)
+
+        if self.layer is not None:
+            ax.add_artist(self.layer)
+
+        self.other = None
+
+        if other_color is not None:
+            self.other = PathCollection(
+                _get_other_paths(self.geometry), facecolors=other_color,
+                edgecolors=other_color, linewidths=LW, alpha=alpha)
+
+            chord_ax.add_collection(self.other)
+
+        self.gradient = None
+
+        if self._use_gradient and gradient_mode == "mesh":
+            self.gradient = _get_gradient_mesh(
+                self.layout, chord_paths, chord_colors, self._radius, extent,
+                alpha)
+
+            chord_ax.add_artist(self.gradient)
+        elif self._use_gradient:
+            self.gradient = ax.imshow(
+                np.zeros((2, 2, 4)), interpolation='bilinear',
+                origin='lower', extent=[-1, 1, -1, 1])
+
+            self._update_gradient_image(chord_paths)
+
+        self.texts = []
+
+        if names is not None:
+            assert len(names) == self.num_nodes, \
+                "One name per node is required."
+
+            for i, name in enumerate(names):
+                self.texts.append(
+                    ax.text(0, 0, name, fontsize=fontsize,
+                            color=fontcolor[i], rotation_mode="anchor"))
+
+            if hide_overlapping_names:
+                self._name_extents = name_extents(names, fontsize,
+                                                  rotate_names, ax)
+
+            self._update_names()
+
+        # configure axis
+        ax.set_xlim(-1.1, 1.1)
+        ax.set_ylim(-1.1, 1.1)
+
+        ax.set_aspect(1)
+        ax.axis('off')
+
+    @property
+    def artists(self):
+        ''' All the artists of the diagram (e.g. to return for blitting) '''
+        artists = [self.arcs, self.chords]
+
+        if self.other is not None:
+            artists.append(self.other)
+
+        if self.gradient is not None:
+            artists.append(self.gradient)
+
+        if self.layer is not None:
+            # the artists of the layer are drawn by the layer
+            layered = set(self.layer.get_children())
+
+            artists = [a for a in artists if a not in layered]
+            artists.insert(1, self.layer)
+
+        return artists + self.texts
+
+    def update(self, mat):
+        '''
+        Recompute the layout for `mat` and update the artists in place.
+
+        Parameters
+        ----------
+        mat : square matrix
+            New flux data, with the same number of nodes.
+
+        Returns
+        -------
+        artists : list
+            The updated artists (see :attr:`artists`).
+        '''
+        if np.shape(mat)[0] != self.num_nodes:
+            raise ValueError("The number of nodes cannot change: expected "
+                             "{}, got {}.".format(self.num_nodes,
+                                                  np.shape(mat)[0]))
+
+        old_layout = self.layout
+
+        self.layout, self.geometry = self._compute(mat)
+
+        self._pick_index = None
+
+        geometry = self.geometry
+
+        same_chords = (np.array_equal(old_layout.row, self.layout.row)
+                       and np.array_equal(old_layout.col, self.layout.col))
+
+        if same_chords:
+            # overwrite the vertices of the existing paths
+            chord_paths = self.chords.get_paths()
+
+            for path, verts in zip(self.arcs.get_paths(),
+                                   geometry.arc_vertices):
+                path.vertices = verts
+
+            for k, verts in zip(geometry.self_chord_ids,
+                                geometry.self_chord_vertices):
+                chord_paths[k].vertices = verts
+
+            for k, verts in zip(geometry.chord_ids, geometry.chord_vertices):
+                chord_paths[k].vertices = verts
+
+            self.arcs.stale = True
+            self.chords.stale = True
+        else:
+            arc_paths, chord_paths = _get_paths(self.layout, geometry)
+
+            self.arcs.set_paths(arc_paths)
+            self.chords.set_paths(chord_paths)
+
+            self._set_chord_colors()
+
+        if self.other is not None:
+            self.other.set_paths(_get_other_paths(geometry))
+
+        if self._use_gradient and self._gradient_mode == "mesh":
+            mesh = _get_gradient_mesh(self.layout, chord_paths,
+                                      self._chord_colors, self._radius,
+                                      self._extent, self._alpha)
+
+            self.gradient.set_data(mesh.get_triangles(), mesh.get_colors())
+        elif self._use_gradient:
+            self._update_gradient_image(chord_paths)
+
+        self._update_names()
+
+        return self.artists
+
+    def pick(self, x, y):
+        '''
+        Node or chord under the point (x, y), in data coordinates (see
+        :meth:`~mpl_chord_diagram.PickIndex.pick`).
+
+        The :class:`~mpl_chord_diagram.PickIndex` of the current layout is
+        built on the first call after each update.
+        '''
+        if self._pick_index is None:
+            from .picking import PickIndex
+
+            self._pick_index = PickIndex(self.layout, self.geometry)
+
+        return self._pick_index.pick(x, y)
+
+    def _compute(self, mat):
+        ''' Layout and geometry of `mat`, from the cache if there is one '''
+        if self._cache is not None:
+            return self._cache.get(mat, **self._geometry_kwargs,
+                                   **self._layout_kwargs)
+
+        layout = compute_layout(mat, **self._layout_kwargs)
+
+        return layout, compute_geometry(layout, **self._geometry_kwargs)
+
+    def _set_chord_colors(self):
+        ''' Set the colors of the chords of the current layout '''
+        colors = _get_chord_colors(self.layout, self._chord_colors,
+                                   self._use_gradient)
+
+        if len(colors) == 0:
+            colors = "none"
+
+        self.chords.set_facecolor(colors)
+        self.chords.set_edgecolor(colors)
+
+    def _update_gradient_image(self, chord_paths):
+        ''' Update the data of the gradient image '''
+        image = _get_gradient_image(
+            self.layout, chord_paths, self._chord_colors, self._radius,
+            self._extent, self._alpha, self._gradient_resolution, self.ax)
+
+        self.gradient.set_visible(image is not None)
+
+        if image is not None:
+            self.gradient.set_data(image)
+
+    def _update_names(self):
+        ''' Set the position, alignment, and visibility of the names '''
+        visible = visible_names(self.layout, self._name_extents,
+                                min_angle=self._min_name_angle,
+                                avoid_overlap=self._hide_overlapping_names)
+
+        for i, text in enumerate(self.texts):
+            text.set_visible(visible[i])
+
+            x, y, rotation, ha, va = _name_props(self.layout, i,
+                                                 self._rotate_names[i])
+
+            text.set_position((x, y))
+            text.set_rotation(rotation)
+            text.set_horizontalalignment(ha)
+            text.set_verticalalignment(va)
@@ -0,0 +1,287 @@
+"""
+Read large edge lists into sparse flux matrices, by chunks.
+"""
+
+import os
+import zipfile
+
+from itertools import islice
+
+import numpy as np
+import scipy.sparse as ssp
+
+
+def read_edge_list(path, chunk_size=1000000, delimiter=",", skiprows=0,
+                   fields=("source", "target", "weight")):
+    '''
+    Read an edge list (source, target, weight) into a sparse flux matrix.
+
+    The file is read by chunks of `chunk_size` edges (memory-mapped for
+    ``.npy`` files) which are aggregated one after the other, so the memory
+    used is proportional to the number of distinct (source, target) pairs,
+    not to the number of rows.
+
+    Parameters
+    ----------
+    path : str
+        Path to the edge list, either:
+
+        * a ``.npy`` file containing a 2D array with 2 or 3 columns, or a
+          structured array with the fields given by `fields`,
+        * a ``.npz`` file containing the arrays given by `fields`, or a
+          single array as in the ``.npy`` case,
+        * a text (CSV) file with 2 or 3 columns.
+
+        The sources and targets can be any labels (integers or strings); the
+        weight is 1 for all edges if it is missing.
+    chunk_size : int, optional (default: 1e6)
+        Number of edges read at once.
+    delimiter : str, optional (default: ",")
+        Delimiter of the columns of text files.
+    skiprows : int, optional (default: 0)
+        Number of lines to skip at the beginning of text files (e.g. 1 for
+        a header).
+    fields : tuple of str, optional (default: ("source", "target", "weight"))
+        Names of the source, target, and weight arrays in structured arrays
+        and ``.npz`` files.
+
+    Returns
+    -------
+    mat : :class:`scipy.sparse.csr_matrix`
+        Flux matrix, where ``mat[i, j]`` is the sum of the weights of all
+        edges from ``names[i]`` to ``names[j]``.
+    names : array
+        Sorted labels of the nodes.
+
+    Examples
+    --------
+    >>> mat, names = read_edge_list("flux.csv", skiprows=1)
+    >>> chord_diagram(mat, names=names, max_chords=500)
+    '''
+    ext = os.path.splitext(str(path))[1].lower()
+
+    if ext == ".npy":
+        chunks = _npy_chunks(path, chunk_size, fields)
+    elif ext == ".npz":
+        chunks = _npz_chunks(path, chunk_size, fields)
+    else:
+        chunks = _text_chunks(path, chunk_size, delimiter, skiprows)
+
+    return aggregate_edges(chunks)
+
+
+def aggregate_edges(chunks):
+    '''
+    Aggregate chunks of edges into a sparse flux matrix.
+
+    Parameters
+    ----------
+    chunks : iterable of tuples
+        Chunks of edges, as (sources, targets, weights) arrays; weights can
+        be None (1 for all edges of the chunk).
+
+    Returns
+    -------
+    mat : :class:`scipy.sparse.csr_matrix`
+        Flux matrix, where ``mat[i, j]`` is the sum of the weights of all
+        edges from ``names[i]`` to ``names[j]``.
+    names : array
+        Sorted labels of the nodes.
+
+    Notes
+    -----
+    Each chunk is reduced to its distinct (source, target) pairs, then merged
+    with the pairs of the previous chunks (via :func:`numpy.unique` and
+    :func:`numpy.bincount`), so the memory used only depends on the size of
+    a chunk and on the number of distinct pairs.
+    '''
+    index = {}
+
+    keys = np.empty(0, dtype=np.int64)
+    sums = np.empty(0, dtype=float)
+
+    for sources, targets, weights in chunks:
+        sources, targets = np.asarray(sources), np.asarray(targets)
+
+        num_edges = len(sources)
+
+        if num_edges == 0:
+            continue
+
+        if weights is None:
+            weights = np.ones(num_edges)
+
+        # map the labels to node indices (only the distinct labels of the
+        # chunk go through the dictionary)
+        labels, inverse = np.unique(np.concatenate((sources, targets)),
+                                    return_inverse=True)
+
+        ids = np.fromiter(
+            (index.setdefault(lbl, len(index)) for lbl in labels.tolist()),
+            dtype=np.int64, count=len(labels))[inverse.ravel()]
+
+        # merge with the previous pairs
+        keys, inverse = np.unique(
+            np.concatenate((keys, (ids[:num_edges] << 32) | ids[num_edges:])),
+            return_inverse=True)
+
+        sums = np.bincount(
+            inverse.ravel(), minlength=len(keys),
+            weights=np.concatenate((sums, np.asarray(weights, dtype=float))))
+
+    num_nodes = len(index)
+
+    names = np.array(list(index))
+
+    # sort the nodes by label
+    order = np.argsort(names, kind="stable")
+    rank = np.empty(num_nodes, dtype=np.int64)
+    rank[order] = np.arange(num_nodes)
+
+    rows, cols = rank[keys >> 32], rank[keys & 0xFFFFFFFF]
+
+    mat = ssp.csr_matrix((sums, (rows, cols)), shape=(num_nodes, num_nodes))
+
+    return mat, names[order]
+
+
+# In-file functions
+
+def _npy_chunks(path, chunk_size, fields):
+    ''' Chunks of a memory-mapped .npy file '''
+    data = np.load(path, mmap_mode="r")
+
+    for start in range(0, len(data), chunk_size):
+        yield _split(data[start:start + chunk_size], fields)
+
+
+def _npz_chunks(path, chunk_size, fields):
+    ''' Chunks of the arrays of a .npz file, streamed from the archive '''
+    with zipfile.ZipFile(path) as archive:
+        members = {os.path.splitext(n)[0]: n for n in archive.namelist()}
+
+        if all(f in members for f in fields[:2]):
+            names = [members[f] for f in fields if f in members]
+
+            streams = [_npy_stream(archive.open(n), chunk_size)
+                       for n in names]
+
+            for arrays in zip(*streams):
+                yield arrays[0], arrays[1], (
+                    arrays[2] if len(arrays) > 2 else None)
+        elif len(members) == 1:
+            name, = members.values()
+
+            for chunk in _npy_stream(archive.open(name), chunk_size):
+                yield _split(chunk, fields)
+        else:
+            raise ValueError(
+                "'{}' should contain the arrays {} or a single array.".format(
+                    path, fields))
+
+
+def _npy_stream(fp, chunk_size):
+    ''' Read the rows of an array in .npy format from a stream, by chunks '''
+    with fp:
+        version = np.lib.format.read_magic(fp)
+
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(fp)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(fp)
+
+        if dtype.hasobject:
+            raise ValueError("Arrays of objects are not supported.")
+
+        if fortran and len(shape) > 1:
+            # columns are stored one after the other, rows can't be streamed
+            data = np.frombuffer(fp.read(), dtype=dtype)
+
+            yield data.reshape(shape, order="F")
+            return
+
+        row_shape = shape[1:]
+        row_size = dtype.itemsize*int(np.prod(row_shape))
+
+        for start in range(0, shape[0] if shape else 0, chunk_size):
+            num_rows = min(chunk_size, shape[0] - start)
+
+            buffer = fp.read(num_rows*row_size)
+
+            yield np.frombuffer(buffer, dtype=dtype).reshape(
+                (num_rows,) + row_shape)
+
+
+def _text_chunks(path, chunk_size, delimiter, skiprows):
+    ''' Chunks of the lines of a text file '''
+    numeric = None
+
+    with open(path) as f:
+        for _ in range(skiprows):
+            next(f, None)
+
+        while True:
+            lines = list(islice(f, chunk_size))
+
+            if not lines:
+                break
+
+            columns = np.loadtxt(lines, dtype=str, delimiter=delimiter,
+                                 ndmin=2).T
+
+            # integer labels are converted, the type is set by the first chunk
+            labels = columns[:2]
+
+            if numeric is None:
+                numeric = _is_integer(labels)
+
+            if numeric:
+                try:
+                    labels = labels.astype(np.int64)
+                except ValueError:
+                    raise ValueError(
+                        "Non-integer node labels found after the first {} "
+                        "lines of '{}', which only had integer labels: use a "
+                        "larger `chunk_size`.".format(chunk_size, path)
+                    ) from None
+
+            sources, targets = labels
+
+            weights = columns[2].astype(float) if len(columns) > 2 else None
+
+            yield sources, targets, weights
+
+
+def _is_integer(labels):
+    ''' Whether all string labels are integers '''
+    try:
+        labels.astype(np.int64)
+    except ValueError:
+        return False
+
+    return True
+
+
+def _split(data, fields):
+    ''' Source, target, and weight columns of a chunk of an edge array '''
+    if data.dtype.names is not None:
+        weights = data[fields[2]] if fields[2] in data.dtype.names else None
+
+        return (np.asarray(data[fields[0]]), np.asarray(data[fields[1]]),
+                None if weights is None else np.asarray(weights))
+
+    data = np.asarray(data)
+
+    if data.ndim != 2 or data.shape[1] not in (2, 3):
+        raise ValueError("Edge arrays should have 2 or 3 columns.")
+
+    sources, targets = data[:, 0], data[:, 1]
+
+    # float arrays (needed to store the weights) often contain integer ids
+    if np.issubdtype(data.dtype, np.floating):
+        ids = data[:, :2].astype(np.int64)
+
+        if np.array_equal(ids, data[:, :2]):
+            sources, targets = ids.T
+
+    return sources, targets, data[:, 2] if data.shape[1] == 3 else None
@@ -0,0 +1,498 @@
+"""
+Vectorized geometry for the arcs and chords of the diagram.
+
+All functions take arrays of angles (in degrees) and return the vertices of
+all the shapes at once as an array of shape (num_shapes, num_vertices, 2).
+Each kind of shape always has the same number of vertices, so a single array
+of path codes is shared by all shapes of the same kind.
+
+:func:`polygon_vertices` approximates such shapes by polygons, e.g. to test
+which shapes contain a point or to fill them on a grid.
+"""
+
+import numpy as np
+
+
+# path codes (same values as the :class:`matplotlib.path.Path` constants)
+
+MOVETO = 1
+LINETO = 2
+CURVE4 = 4
+CLOSEPOLY = 79
+
+#: codes for the 16 vertices of a circular arc made of 4 cubic Bezier curves
+_ARC = [MOVETO] + [CURVE4]*3 + ([LINETO] + [CURVE4]*3)*3
+
+#: codes to close a shape with 4 Bezier curves back along the arc
+_ARC_BACK = ([LINETO] + [CURVE4]*3)*4
+
+ARC_CODES = np.array(_ARC + _ARC_BACK + [CLOSEPOLY], dtype=np.uint8)
+
+CHORD_CODES = np.array(
+    _ARC + [CURVE4]*3 + [CURVE4]*3 + ([LINETO] + [CURVE4]*3)*3 + [CURVE4]*3,
+    dtype=np.uint8)
+
+DIRECTED_CHORD_CODES = np.array(
+    _ARC + [CURVE4]*3 + [LINETO]*2 + [CURVE4]*3, dtype=np.uint8)
+
+SELF_CHORD_CODES = np.array(_ARC + [CURVE4]*3, dtype=np.uint8)
+
+# each curve of an arc is [knot k, leave k, reach k+1, knot k+1], the control
+# points being along the tangents at the knots: the vertices of the 4 curves
+# are given by this matrix, applied to the 5 knots followed by the 5 tangents
+_KNOT_IDS = np.array([0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4])
+
+_ARC_MATRIX = np.zeros((16, 10))
+_ARC_MATRIX[np.arange(16), _KNOT_IDS] = 1
+_ARC_MATRIX[np.arange(16), _KNOT_IDS + 5] = [0., 1., -1., 0.]*4
+
+
+def polar2xy_array(r, theta, out=None):
+    '''
+    Convert arrays of polar coordinates (r, theta) to an array of cartesian
+    coordinates with shape ``theta.shape + (2,)``, optionally written into
+    `out`.
+    '''
+    if out is None:
+        out = np.empty(np.shape(theta) + (2,))
+
+    np.multiply(r, np.cos(theta), out=out[..., 0])
+    np.multiply(r, np.sin(theta), out=out[..., 1])
+
+    return out
+
+
+def arc_path(start, end, radius, factor=4/3, out=None):
+    '''
+    Vertices of circular arcs, going from `start` to `end`.
+
+    Parameters
+    ----------
+    start : array of floats (degrees)
+        Starting angles.
+    end : array of floats (degrees)
+        Final angles (swapped with `start` when they are smaller).
+    radius : float or array
+        Radius of the arcs.
+    factor : float, optional (default: 4/3)
+        Factor setting the distance to the Bezier control points.
+    out : array of shape (len(start), 16, 2), optional
+        Array where the vertices should be written.
+
+    Returns
+    -------
+    start, end : arrays
+        Ordered start and end angles, in radians.
+    verts : array of shape (len(start), 16, 2)
+        Vertices of the arcs (see :data:`ARC_CODES` for the first 16 codes).
+    '''
+    start, end = _to_radians(start, end)
+
+    if out is None:
+        out = np.empty((len(start), 16, 2))
+
+    # optimal distance to the control points
+    # https://stackoverflow.com/questions/1734745/
+    # how-to-create-circle-with-b%C3%A9zier-curves
+    # use 16-vertex curves (4 quadratic Beziers which accounts for worst case
+    # scenario of 360 degrees)
+    opt = factor * np.tan((end - start) / 16.) * radius
+
+    _bezier_arc(radius, _knots(start, end), opt, out)
+
+    return start, end, out
+
+
+def ideogram_vertices(start, end, radius=1., width=0.2, dtype=float):
+    '''
+    Vertices of the ideogram arcs.
+
+    Parameters
+    ----------
+    start : array of floats (degrees)
+        Starting angles.
+    end : array of floats (degrees)
+        Final angles.
+    radius : float, optional (default: 1)
+        External radius of the arcs.
+    width : float, optional (default: 0.2)
+        Width of the arcs.
+    dtype : numpy dtype, optional (default: float)
+        Floating-point type of the vertices.
+
+    Returns
+    -------
+    verts : array of shape (len(start), 33, 2)
+        Vertices of the arcs, to use with :data:`ARC_CODES`.
+    '''
+    verts = np.empty((np.size(start), 33, 2), dtype=dtype)
+
+    start, end, _ = arc_path(start, end, radius, out=verts[:, :16])
+
+    opt   = 4./3. * np.tan((end - start) / 16.) * radius
+    inner = radius*(1 - width)
+
+    # go back along the inner border
+    knots = _knots(start, end)[:, ::-1]
+
+    _bezier_arc(inner, knots, -opt*(1 - width), verts[:, 16:32])
+
+    verts[:, 32] = verts[:, 0]
+
+    return verts
+
+
+def chord_vertices(start1, end1, start2, end2, radius=1., gap=0.03, pad=2,
+                   chordwidth=0.7, extent=360, directed=False, dtype=float):
+    '''
+    Vertices of the chords between two regions (arcs) of the diagram.
+
+    Parameters
+    ----------
+    start1, end1 : arrays of floats (degrees)
+        Limits of the chords on the source arcs.
+    start2, end2 : arrays of floats (degrees)
+        Limits of the chords on the target arcs.
+    radius : float, optional (default: 1)
+        External radius of the chords.
+    gap : float, optional (default: 0.03)
+        Distance between the arc and the beginning of the cord, used to set
+        the arrow size of directed chords.
+    pad : float, optional (default: 2)
+        Distance between two neighboring arcs, in degrees.
+    chordwidth : float, optional (default: 0.7)
+        Position of the control points for the chords.
+    extent : float, optional (default : 360)
+        The angular aperture, in degrees, of the diagram.
+    directed : bool, optional (default: False)
+        Whether the chords should be directed, ending in an arrow.
+    dtype : numpy dtype, optional (default: float)
+        Floating-point type of the vertices.
+
+    Returns
+    -------
+    verts : array of shape (len(start1), 24 or 37, 2)
+        Vertices of the chords, to use with :data:`DIRECTED_CHORD_CODES` if
+        `directed` is True, :data:`CHORD_CODES` otherwise.
+    '''
+    start1, end1, start2, end2 = (
+        np.asarray(a, dtype=float).ravel()
+        for a in (start1, end1, start2, end2))
+
+    # index of the vertices after the second arc (or arrow)
+    k = 21 if directed else 34
+
+    verts = np.empty((len(start1), k + 3, 2), dtype=dtype)
+
+    dtheta1 = np.minimum((start1 - end2) % extent, (end2 - start1) % extent)
+    dtheta2 = np.minimum((end1 - start2) % extent, (start2 - end1) % extent)
+
+    start1, end1, _ = arc_path(start1, end1, radius, out=verts[:, :16])
+
+    if directed:
+        start2, end2 = _to_radians(start2, end2)
+
+        tip = 0.5*(start2 + end2)
+        asize = max(gap, 0.02)
+
+        polar2xy_array(radius - asize, start2, out=verts[:, 18])
+        polar2xy_array(radius, tip, out=verts[:, 19])
+        polar2xy_array(radius - asize, end2, out=verts[:, 20])
+    else:
+        start2, end2, _ = arc_path(start2, end2, radius, out=verts[:, 18:34])
+
+    chordwidth2 = chordwidth*np.clip(0.4 + (dtheta1 - 2*pad) / (15*pad),
+                                     0.2, 1)
+    chordwidth1 = chordwidth*np.clip(0.4 + (dtheta2 - 2*pad) / (15*pad),
+                                     0.2, 1)
+
+    rchord  = radius * (1 - chordwidth1)
+    rchord2 = radius * (1 - chordwidth2)
+
+    polar2xy_array(rchord, end1, out=verts[:, 16])
+    polar2xy_array(rchord, start2, out=verts[:, 17])
+    polar2xy_array(rchord2, end2, out=verts[:, k])
+    polar2xy_array(rchord2, start1, out=verts[:, k + 1])
+
+    verts[:, k + 2] = verts[:, 0]
+
+    return verts
+
+
+def self_chord_vertices(start, end, radius=1., chordwidth=0.7, dtype=float):
+    '''
+    Vertices of the chords going from one arc to itself.
+
+    Parameters
+    ----------
+    start, end : arrays of floats (degrees)
+        Limits of the chords on the arcs.
+    radius : float, optional (default: 1)
+        External radius of the chords.
+    chordwidth : float, optional (default: 0.7)
+        Position of the control points for the chords.
+    dtype : numpy dtype, optional (default: float)
+        Floating-point type of the vertices.
+
+    Returns
+    -------
+    verts : array of shape (len(start), 19, 2)
+        Vertices of the chords, to use with :data:`SELF_CHORD_CODES`.
+    '''
+    verts = np.empty((np.size(start), 19, 2), dtype=dtype)
+
+    start, end, _ = arc_path(start, end, radius, out=verts[:, :16])
+
+    rchord = radius * (1 - chordwidth)
+
+    polar2xy_array(rchord, end, out=verts[:, 16])
+    polar2xy_array(rchord, start, out=verts[:, 17])
+
+    verts[:, 18] = verts[:, 0]
+
+    return verts
+
+
+def gradient_points(start1, end1, start2, end2, radius=1., extent=360):
+    '''
+    Start and end points of the color gradients along the chords.
+
+    The gradient goes between the two closest extremities of the chord
+    (either start1 and end2, or end1 and start2).
+
+    Parameters
+    ----------
+    start1, end1 : arrays of floats (degrees)
+        Limits of the chords on the source arcs.
+    start2, end2 : arrays of floats (degrees)
+        Limits of the chords on the target arcs.
+    radius : float, optional (default: 1)
+        External radius of the chords.
+    extent : float, optional (default : 360)
+        The angular aperture, in degrees, of the diagram.
+
+    Returns
+    -------
+    starts, ends : arrays of shape (len(start1), 2)
+        Start and end points of the gradients.
+    min_angles : array
+        Angular distance between start1 and end2, in degrees.
+    '''
+    start1, end1, start2, end2 = (
+        np.asarray(a, dtype=float).ravel()
+        for a in (start1, end1, start2, end2))
+
+    dtheta1 = np.minimum((start1 - end2) % extent, (end2 - start1) % extent)
+    dtheta2 = np.minimum((end1 - start2) % extent, (start2 - end1) % extent)
+
+    start1, end1 = _to_radians(start1, end1)
+    start2, end2 = _to_radians(start2, end2)
+
+    closest = dtheta1 < dtheta2
+
+    starts = polar2xy_array(radius, np.where(closest, start1, end1))
+    ends = polar2xy_array(radius, np.where(closest, end2, start2))
+
+    return starts, ends, dtheta1
+
+
+def chord_triangles(verts, directed=False, num_points=16):
+    '''
+    Triangulate chords from their vertices.
+
+    The band between the two curves of each chord is split into a strip of
+    triangles and the regions between the band and the arcs (or the arrow)
+    are split into fans of triangles.
+
+    Parameters
+    ----------
+    verts : array of shape (num_chords, 24 or 37, 2)
+        Vertices of the chords, as returned by :func:`chord_vertices`.
+    directed : bool, optional (default: False)
+        Whether the chords are directed.
+    num_points : int, optional (default: 16)
+        Number of points sampled along each curve of the band.
+
+    Returns
+    -------
+    triangles : array of shape (num_chords, num_triangles, 3, 2)
+        Vertices of the triangles of each chord.
+    '''
+    verts = np.asarray(verts, dtype=float)
+
+    k = 21 if directed else 34
+
+    t = np.linspace(0, 1, num_points)
+
+    # both sides of the band, going from the source to the target
+    right = _bezier_points(verts[:, 15:19], t)
+    left  = _bezier_points(verts[:, k - 1:k + 3], t)[:, ::-1]
+
+    strip = np.concatenate((
+        np.stack((left[:, :-1], right[:, :-1], right[:, 1:]), axis=2),
+        np.stack((left[:, :-1], right[:, 1:], left[:, 1:]), axis=2)), axis=1)
+
+    caps = [_arc_fan(verts[:, :16])]
+
+    if directed:
+        caps.append(verts[:, None, 18:21])
+    else:
+        caps.append(_arc_fan(verts[:, 18:34]))
+
+    return np.concatenate([strip] + caps, axis=1)
+
+
+def polygon_vertices(verts, codes, tol=1e-3):
+    '''
+    Polygons approximating shapes with the same codes.
+
+    Each Bezier curve is replaced by enough points for the polygon to stay
+    within `tol` of the curve in all shapes (the distance is bounded by
+    ``3*d/(4*n**2)`` for `n` segments, with `d` the largest second difference
+    of the control points).
+
+    Parameters
+    ----------
+    verts : array of shape (num_shapes, num_vertices, 2)
+        Vertices of the shapes.
+    codes : array of length num_vertices
+        Path codes shared by all shapes.
+    tol : float, optional (default: 1e-3)
+        Maximal distance between the polygons and the shapes.
+
+    Returns
+    -------
+    polygons : float32 array of shape (num_shapes, num_points, 2)
+        Vertices of the polygons, which are implicitly closed (CLOSEPOLY is
+        dropped).
+    '''
+    weights = []
+    previous = 0
+
+    i = 0
+
+    while i < len(codes):
+        if codes[i] == CURVE4:
+            # cubic Bezier from the previous point
+            control = verts[:, [previous, i, i + 1, i + 2]]
+
+            second = np.diff(control, n=2, axis=1)
+            d = np.linalg.norm(second, axis=-1).max() if len(verts) else 0
+
+            n = max(1, int(np.ceil(np.sqrt(0.75*d/tol))))
+
+            t = np.linspace(0, 1, n + 1)[1:, None]
+
+            w = np.zeros((n, len(codes)))
+            w[:, [previous, i, i + 1, i + 2]] = np.hstack(
+                ((1 - t)**3, 3*(1 - t)**2*t, 3*(1 - t)*t**2, t**3))
+
+            weights.extend(w)
+
+            previous = i + 2
+            i += 3
+        elif codes[i] in (MOVETO, LINETO):
+            w = np.zeros(len(codes))
+            w[i] = 1
+
+            weights.append(w)
+
+            previous = i
+            i += 1
+        else:
+            # CLOSEPOLY: polygons are closed implicitly
+            i += 1
+
+    return np.einsum("pv,nvd->npd", np.array(weights), verts).astype(
+        np.float32)
+
+
+# In-file functions
+
+def _to_radians(start, end):
+    ''' Order the angles and convert them to radians '''
+    start = np.asarray(start, dtype=float).ravel()
+    end   = np.asarray(end, dtype=float).ravel()
+
+    start, end = np.minimum(start, end), np.maximum(start, end)
+
+    return start*(np.pi/180.), end*(np.pi/180.)
+
+
+def _knots(start, end):
+    ''' Angles delimiting the 4 Bezier curves of an arc, shape (n, 5) '''
+    inter1 = start*(3./4.) + end*(1./4.)
+    inter2 = start*(2./4.) + end*(2./4.)
+    inter3 = start*(1./4.) + end*(3./4.)
+
+    return np.stack((start, inter1, inter2, inter3, end), axis=1)
+
+
+def _bezier_arc(radius, knots, opt, out):
+    '''
+    Write into `out` the 16 vertices of the 4 Bezier curves joining the
+    successive `knots` on a circle of `radius`.
+    A positive `opt` (distance to the control points) goes counter-clockwise,
+    a negative one goes clockwise.
+    '''
+    n = len(knots)
+
+    cos, sin = np.cos(knots), np.sin(knots)
+
+    # points at the knots and tangent vectors (of length opt) at the knots
+    points = np.empty((n, 10, 2))
+
+    np.multiply(radius, cos, out=points[:, :5, 0])
+    np.multiply(radius, sin, out=points[:, :5, 1])
+
+    opt = np.reshape(opt, (-1, 1))
+
+    np.multiply(-opt, sin, out=points[:, 5:, 0])
+    np.multiply(opt, cos, out=points[:, 5:, 1])
+
+    # each vertex is a knot, plus or minus its tangent for control points
+    return np.matmul(_ARC_MATRIX, points, out=out)
+
+
+def _bezier_points(control, t):
+    '''
+    Points at parameters `t` of cubic Bezier curves given by their control
+    points (array of shape (..., 4, 2)), with shape (..., len(t), 2).
+    '''
+    s = 1 - t
+
+    basis = np.stack((s*s*s, 3*s*s*t, 3*s*t*t, t*t*t), axis=1)
+
+    return np.einsum("mk,...kd->...md", basis, control)
+
+
+def _arc_fan(arc, num_points=4):
+    '''
+    Triangles between the 16-vertex arcs and the segments joining their
+    extremities, shape (n, 4*num_points, 3, 2).
+    '''
+    t = np.linspace(0, 1, num_points + 1)[:-1]
+
+    n = len(arc)
+
+    # points along the 4 curves, then the final point of the arc
+    points = np.concatenate((
+        _bezier_points(arc.reshape(n, 4, 4, 2), t).reshape(n, -1, 2),
+        arc[:, None, 15]), axis=1)
+
+    center = np.broadcast_to(0.5*(arc[:, None, 0] + arc[:, None, 15]),
+                             points[:, 1:].shape)
+
+    return np.stack((center, points[:, :-1], points[:, 1:]), axis=2)
+
+
+def _expand(starts, lengths):
+    '''
+    Index of each range and the consecutive integers of the ranges starting
+    at `starts` with `lengths`.
+    '''
+    ids = np.repeat(np.arange(len(starts)), lengths)
+
+    offsets = np.cumsum(lengths) - lengths
+
+    return ids, starts[ids] + np.arange(len(ids)) - offsets[ids]
@@ -2,11 +2,17 @@
 Create linear color gradients
 """
 
+from functools import lru_cache
+
+from matplotlib.artist import Artist, allow_rasterization
 from matplotlib.colors import ColorConverter, LinearSegmentedColormap
-from scipy.ndimage import gaussian_filter
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
 
 import numpy as np
 
+from .geometry import _expand, polygon_vertices
+
 
 def linear_gradient(cstart, cend, n=10):
     '''
@@ -30,6 +36,8 @@ def gradient(start, end, min_angle, color1, color2, meshgrid, mask, ax,
     xs, ys = start
     xe, ye = end
 
+    from scipy.ndimage import gaussian_filter
+
     X, Y = meshgrid
 
     # get the distance to each point
@@ -47,13 +55,439 @@ def gradient(start, end, min_angle, color1, color2, meshgrid, mask, ax,
     Z = gaussian_filter((d2end < d2start).astype(float), sigma=sigma)
 
     # generate the colormap
-    n_bin = 100
-
-    color_list = linear_gradient(color1, color2, n_bin)
-
-    cmap = LinearSegmentedColormap.from_list("gradient", color_list, N=n_bin)
+    cmap = _gradient_cmap(ColorConverter.to_rgb(color1),
+                          ColorConverter.to_rgb(color2))
 
     im = ax.imshow(Z, interpolation='bilinear', cmap=cmap,
                    origin='lower', extent=[-1, 1, -1, 1], alpha=alpha)
 
     im.set_clip_path(mask)
+
+    # the extent of the clipped image is that of the mask, which is already
+    # part of the axis
+    im.set_in_layout(False)
+
+
+def gradient_image(paths, starts, ends, min_angles, colors1, colors2, alpha,
+                   resolution=100):
+    '''
+    Composite the linear gradients of several shapes into a single RGBA
+    image covering the [-1, 1] x [-1, 1] square.
+
+    Each gradient goes from ``starts[i]`` to ``ends[i]`` and is restricted to
+    the inside of ``paths[i]``; the shapes are composited in order, as if
+    they were drawn one above the other.
+
+    Parameters
+    ----------
+    paths : list of :class:`~matplotlib.path.Path`
+        Shapes where the gradients should be drawn.
+    starts, ends : arrays of shape (len(paths), 2)
+        Start and end points of the gradients.
+    min_angles : array
+        Angles used to set the width of the transitions (see :func:`gradient`).
+    colors1, colors2 : lists of colors
+        Colors at the start and end of each gradient.
+    alpha : float
+        Opacity of the gradients.
+    resolution : int, optional (default: 100)
+        Number of pixels along each side of the image.
+
+    Returns
+    -------
+    image : array of shape (resolution, resolution, 4)
+        RGBA image (with origin at the lower left corner).
+
+    Notes
+    -----
+    The pixels of all shapes are found at once by a scanline fill of the
+    polygons approximating them, and each pixel of a shape is weighted by
+    ``alpha*(1 - alpha)**m``, `m` being the number of shapes above it, which
+    gives the result of compositing the shapes one by one without looping
+    over them. The cost is proportional to the number of covered pixels.
+    '''
+    n = int(resolution)
+    step = 2. / n
+
+    starts, ends = np.asarray(starts, float), np.asarray(ends, float)
+
+    sigmas = _gradient_widths(starts, ends, min_angles)
+
+    c1 = np.array([_to_rgb(c) for c in colors1]).reshape(-1, 3)
+    c2 = np.array([_to_rgb(c) for c in colors2]).reshape(-1, 3)
+
+    premult = np.zeros((n*n, 3))
+
+    # number of shapes covering each pixel, among those already composited
+    count = np.zeros(n*n, dtype=np.int64)
+
+    # the shapes are composited from the top one to the bottom one: a pixel
+    # of a shape covered by `m` shapes drawn above it gets the weight
+    # alpha*(1 - alpha)**m, which is the same as the "over" operator
+    for shapes, pixels in _coverage(paths, n):
+        order = np.argsort(pixels, kind="stable")
+
+        shapes, pixels = shapes[order], pixels[order]
+
+        # shapes above, in the chunk (pixels sorted by shape for each pixel)
+        first = np.searchsorted(pixels, pixels, side="right")
+        above = first - 1 - np.arange(len(pixels)) + count[pixels]
+
+        weights = alpha*(1 - alpha)**above
+
+        # colors at the pixel centers
+        points = np.stack((-1 + (pixels % n + 0.5)*step,
+                           -1 + (pixels // n + 0.5)*step), axis=-1)
+
+        Z = _blurred_step(points, starts[shapes], ends[shapes],
+                          sigmas[shapes])[:, None]
+
+        rgb = c1[shapes] + Z*(c2[shapes] - c1[shapes])
+
+        for c in range(3):
+            premult[:, c] += np.bincount(pixels, weights=weights*rgb[:, c],
+                                         minlength=n*n)
+
+        count += np.bincount(pixels, minlength=n*n)
+
+    opacity = 1 - (1 - alpha)**count
+
+    image = np.zeros((n*n, 4))
+
+    visible = opacity > 0
+
+    image[visible, :3] = premult[visible] / opacity[visible, None]
+    image[:, 3] = opacity
+
+    return image.reshape(n, n, 4)
+
+
+def gradient_mesh(triangles, starts, ends, min_angles, colors1, colors2,
+                  alpha):
+    '''
+    Create the linear gradients of several shapes as a single mesh of
+    triangles with Gouraud shading.
+
+    The colors are evaluated at the vertices of the triangles, using the same
+    transition as :func:`gradient_image`, and interpolated inside each
+    triangle by the renderer, so the result does not depend on the
+    resolution of the figure and stays a vector shape.
+
+    Parameters
+    ----------
+    triangles : array of shape (num_shapes, num_triangles, 3, 2)
+        Triangles of each shape, e.g. from
+        :func:`~mpl_chord_diagram.geometry.chord_triangles`.
+    starts, ends : arrays of shape (num_shapes, 2)
+        Start and end points of the gradients.
+    min_angles : array
+        Angles used to set the width of the transitions (see :func:`gradient`).
+    colors1, colors2 : lists of colors
+        Colors at the start and end of each gradient.
+    alpha : float
+        Opacity of the gradients.
+
+    Returns
+    -------
+    mesh : :class:`GradientMesh`
+        Artist drawing all the triangles, to add with
+        :meth:`~matplotlib.axes.Axes.add_artist`.
+    '''
+    triangles = np.asarray(triangles, dtype=float)
+
+    starts, ends = np.asarray(starts, float), np.asarray(ends, float)
+
+    sigmas = _gradient_widths(starts, ends, min_angles)
+
+    # add dimensions to broadcast over the triangles and their vertices
+    Z = _blurred_step(triangles, starts[:, None, None], ends[:, None, None],
+                      sigmas[:, None, None])[..., None]
+
+    c1 = np.array([_to_rgb(c) for c in colors1]).reshape(-1, 1, 1, 3)
+    c2 = np.array([_to_rgb(c) for c in colors2]).reshape(-1, 1, 1, 3)
+
+    colors = np.empty(triangles.shape[:3] + (4,))
+
+    colors[..., :3] = c1 + Z*(c2 - c1)
+    colors[..., 3] = 1
+
+    return GradientMesh(triangles, colors, alpha=alpha)
+
+
+class GradientMesh(Artist):
+    '''
+    Shapes made of triangles drawn with Gouraud shading, i.e. with colors
+    linearly interpolated between the colors of their vertices.
+
+    Parameters
+    ----------
+    triangles : array of shape (num_shapes, num_triangles, 3, 2)
+        Vertices of the triangles of each shape.
+    colors : array of shape (num_shapes, num_triangles, 3, 4)
+        RGBA colors of the vertices.
+    alpha : float, optional (default: None)
+        Global opacity of the shapes.
+
+    Notes
+    -----
+    With the Agg backend, triangles are slightly enlarged so that they do not
+    leave gaps between them, which would make their edges visible if they
+    were transparent. Each shape is therefore drawn opaque on a scratch
+    buffer shared by all shapes, then the part of the buffer covering its
+    bounding box is composited with opacity `alpha` and cleared, so that
+    overlapping shapes blend like patches would.
+
+    The mesh can be rasterized in vector outputs with
+    :meth:`~matplotlib.artist.Artist.set_rasterized`; otherwise, the
+    triangles are drawn as vector shapes with a transparency per vertex.
+    '''
+
+    def __init__(self, triangles, colors, alpha=None):
+        super().__init__()
+
+        self._triangles = np.asarray(triangles, dtype=float)
+        self._colors = np.asarray(colors, dtype=float)
+
+        self.set_alpha(alpha)
+
+    def get_triangles(self):
+        ''' Vertices of the triangles of each shape '''
+        return self._triangles
+
+    def get_colors(self):
+        ''' RGBA colors of the vertices '''
+        return self._colors
+
+    def set_data(self, triangles, colors):
+        '''
+        Replace the triangles and their colors (see the class parameters).
+        '''
+        self._triangles = np.asarray(triangles, dtype=float)
+        self._colors = np.asarray(colors, dtype=float)
+
+        self.stale = True
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or self._triangles.size == 0:
+            return
+
+        renderer.open_group(self.__class__.__name__, gid=self.get_gid())
+
+        alpha = self.get_alpha()
+        transform = self.get_transform().frozen()
+
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+
+        # Agg renderers, including the one drawing the rasterized parts of
+        # vector outputs, give access to their buffer
+        if hasattr(renderer, "buffer_rgba") and alpha is not None:
+            triangles = transform.transform(
+                self._triangles.reshape(-1, 2)).reshape(self._triangles.shape)
+
+            _draw_layers(renderer, gc, triangles, self._colors, alpha)
+        else:
+            colors = self._colors.reshape(-1, 3, 4)
+
+            if alpha is not None:
+                colors = colors.copy()
+                colors[..., 3] *= alpha
+
+            renderer.draw_gouraud_triangles(
+                gc, self._triangles.reshape(-1, 3, 2), colors, transform)
+
+        gc.restore()
+
+        renderer.close_group(self.__class__.__name__)
+
+        self.stale = False
+
+
+# In-file functions
+
+def _gradient_widths(starts, ends, min_angles):
+    '''
+    Width of the color transitions, same as the blur of :func:`gradient` in
+    data units.
+    '''
+    dmax = np.sum((ends - starts)**2, axis=-1)
+    smin = 0.015
+    smax = np.maximum(smin, 0.1*np.minimum(np.asarray(min_angles)/120, 1))
+
+    return 2*np.clip(dmax, smin, smax)
+
+
+def _draw_layers(renderer, gc, triangles, colors, alpha):
+    '''
+    Draw the opaque Gouraud triangles of each shape (in display coordinates)
+    on a scratch Agg buffer, then draw the part of this buffer covering the
+    shape on `renderer` with opacity `alpha`, one shape after the other.
+    '''
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    # bounding box of each shape, with a margin for antialiasing
+    lower = np.maximum(np.floor(triangles.min(axis=(1, 2))) - 2, 0)
+    upper = np.minimum(np.ceil(triangles.max(axis=(1, 2))) + 2,
+                       [renderer.width, renderer.height])
+
+    visible = np.all(upper > lower, axis=1)
+
+    if not visible.any():
+        return
+
+    # a single buffer covering all the shapes
+    x0, y0 = lower[visible].min(axis=0).astype(int)
+    x1, y1 = upper[visible].max(axis=0).astype(int)
+
+    layer = RendererAgg(x1 - x0, y1 - y0, renderer.dpi)
+    layer_gc = layer.new_gc()
+
+    # the buffer starts at the top
+    buffer = np.asarray(layer.buffer_rgba())
+
+    height = y1 - y0
+
+    # opacity of each value of the alpha channel
+    opacity = np.round(np.arange(256)*alpha).astype(np.uint8)
+
+    for i in np.flatnonzero(visible):
+        (xmin, ymin), (xmax, ymax) = (
+            lower[i].astype(int) - [x0, y0], upper[i].astype(int) - [x0, y0])
+
+        layer.draw_gouraud_triangles(layer_gc, triangles[i] - [x0, y0],
+                                     colors[i], IdentityTransform())
+
+        region = buffer[height - ymax:height - ymin, xmin:xmax]
+
+        image = region[::-1].copy()
+
+        image[..., 3] = opacity[image[..., 3]]
+
+        # draw_image expects the bottom row first
+        renderer.draw_image(gc, x0 + xmin, y0 + ymin, image)
+
+        # clear the buffer for the next shape
+        region[...] = 0
+
+
+def _blurred_step(points, start, end, sigma):
+    '''
+    Blurred step function between `start` and `end` evaluated at `points`:
+    0 close to start, 1 close to end.
+    '''
+    from scipy.special import ndtr
+
+    direction = end - start
+
+    norm = np.sqrt(np.sum(direction**2, axis=-1))
+    norm = np.where(norm == 0, 1, norm)
+
+    dist = np.sum((points - 0.5*(start + end))*direction, axis=-1) / norm
+
+    return ndtr(dist / sigma)
+
+
+@lru_cache(maxsize=256)
+def _gradient_cmap(color1, color2, n_bin=100):
+    ''' Colormap from `color1` to `color2` (cached by color pair) '''
+    color_list = linear_gradient(color1, color2, n_bin)
+
+    return LinearSegmentedColormap.from_list("gradient", color_list, N=n_bin)
+
+
+@lru_cache(maxsize=1024)
+def _to_rgb_cached(color):
+    return np.array(ColorConverter.to_rgb(color))
+
+
+def _to_rgb(color):
+    ''' Convert a color to an RGB array (cached for hashable colors) '''
+    try:
+        return _to_rgb_cached(color)
+    except TypeError:
+        return np.array(ColorConverter.to_rgb(color))
+
+
+def _coverage(paths, n, chunk_size=128):
+    '''
+    Pixels of a (n, n) image covering [-1, 1] x [-1, 1] whose center is
+    inside each path, computed for all paths at once by an even-odd scanline
+    fill of the polygons approximating them.
+
+    Yields (shapes, pixels) arrays for chunks of `chunk_size` consecutive
+    paths, from the last paths to the first ones, with pixels as flat
+    indices (``row*n + column``, first row at the bottom). In each chunk,
+    the pixels are sorted by shape.
+    '''
+    step = 2. / n
+
+    # polygons, grouped by path structure (curves are flattened to a tenth
+    # of a pixel)
+    groups = {}
+
+    for i, path in enumerate(paths):
+        groups.setdefault(path.codes.tobytes() if path.codes is not None
+                          else len(path.vertices), []).append(i)
+
+    shape_ids, u0, u1, v0, v1 = [], [], [], [], []
+
+    for ids in groups.values():
+        codes = paths[ids[0]].codes
+
+        if codes is None:
+            codes = np.full(len(paths[ids[0]].vertices), Path.LINETO)
+
+        verts = np.array([paths[i].vertices for i in ids])
+
+        poly = polygon_vertices(verts, codes, tol=0.1*step).astype(float)
+
+        # pixel coordinates (centers at integer values)
+        poly = (poly + 1) / step - 0.5
+
+        shape_ids.append(np.repeat(ids, poly.shape[1]))
+
+        v0.append(poly[..., 0].ravel())
+        u0.append(poly[..., 1].ravel())
+        v1.append(np.roll(poly[..., 0], 1, axis=1).ravel())
+        u1.append(np.roll(poly[..., 1], 1, axis=1).ravel())
+
+    shape_ids, u0, u1, v0, v1 = (
+        np.concatenate(a) if a else np.empty(0)
+        for a in (shape_ids, u0, u1, v0, v1))
+
+    shape_ids = shape_ids.astype(np.int64)
+
+    # rows crossed by each edge: lo <= row < hi (half-open, so that each row
+    # crosses a closed polygon an even number of times)
+    lo = np.clip(np.ceil(np.minimum(u0, u1)), 0, n).astype(np.int64)
+    hi = np.clip(np.ceil(np.maximum(u0, u1)), 0, n).astype(np.int64)
+
+    edges, rows = _expand(lo, np.maximum(hi - lo, 0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = v0[edges] + (rows - u0[edges]) * (
+            (v1[edges] - v0[edges]) / (u1[edges] - u0[edges]))
+
+    shapes = shape_ids[edges]
+
+    # pair the sorted crossings of each shape and row
+    order = np.lexsort((x, rows, shapes))
+
+    shapes, rows, x = shapes[order][::2], rows[order][::2], x[order]
+
+    first = np.clip(np.ceil(x[::2]), 0, n).astype(np.int64)
+    last = np.clip(np.ceil(x[1::2]), 0, n).astype(np.int64)
+
+    length = np.maximum(last - first, 0)
+
+    # expand the runs of pixels, by chunks of shapes
+    bounds = np.searchsorted(shapes, np.arange(0, len(paths), chunk_size))
+
+    for start, stop in reversed(list(zip(
+            bounds.tolist(), bounds[1:].tolist() + [len(shapes)]))):
+        runs, columns = _expand(first[start:stop], length[start:stop])
+
+        runs += start
+
+        yield shapes[runs], rows[runs]*n + columns
@@ -0,0 +1,229 @@
+"""
+Small multiples: chord diagrams of several matrices sharing the same nodes.
+"""
+
+import inspect
+
+import numpy as np
+
+from ._chord_diagram import _check_inputs, _draw_diagram, chord_diagram
+from .layout import _compute_geometries, _prepare_matrix, compute_layout
+from .profiling import _stage
+
+
+def chord_grid(matrices, names=None, order=None, colors=None, cmap=None,
+               chord_colors=None, fontcolor="k", rotate_names=False,
+               shared_scale=True, titles=None, ncols=None, axes=None,
+               figsize=None, show=False, **kwargs):
+    '''
+    Plot the chord diagrams of several matrices with the same nodes, as a
+    grid of small multiples.
+
+    The names, node order, and colors are checked and converted once for
+    all panels, the geometries of all panels are computed in a single batch,
+    and the figure layout is only adjusted once, at the end.
+
+    Parameters
+    ----------
+    matrices : list of square matrices
+        Flux data of each panel (at least one), all with the same nodes (and
+        therefore the same shape).
+    names, order, colors, cmap, chord_colors, fontcolor, rotate_names :
+        Same as in :func:`~mpl_chord_diagram.chord_diagram`, shared by all
+        panels: a node keeps the same position and color in each of them.
+    shared_scale : bool, optional (default: True)
+        Whether the arcs should use the same scale in all panels, so that
+        their sizes can be compared: the panel with the largest total flux
+        spans `extent` degrees, the others only span a part of it.
+        Otherwise, each panel spans `extent` degrees.
+    titles : list of str, optional (default: no titles)
+        Title of each panel.
+    ncols : int, optional (default: a square grid)
+        Number of columns of the grid (unused if `axes` is given).
+    axes : list of :class:`matplotlib.axes.Axes`, optional
+        Axes where the panels should be drawn (one per matrix). By default, a
+        new figure is created.
+    figsize : tuple, optional (default: 4 inches per panel)
+        Size of the new figure (unused if `axes` is given).
+    show : bool, optional (default: False)
+        Whether the plot should be displayed immediately via an automatic
+        call to `plt.show()`.
+    **kwargs
+        Other arguments of :func:`~mpl_chord_diagram.chord_diagram`
+        (except `ax` and `cache`), used for all panels.
+
+    Returns
+    -------
+    axes : list of :class:`matplotlib.axes.Axes`
+        Axis of each panel.
+    results : list
+        For each panel, the output of
+        :func:`~mpl_chord_diagram.chord_diagram`.
+
+    Examples
+    --------
+    >>> axes, _ = chord_grid([mat_2020, mat_2021, mat_2022], names=names,
+    ...                      titles=["2020", "2021", "2022"], ncols=3)
+    '''
+    import matplotlib.pyplot as plt
+
+    args = _get_args(kwargs)
+
+    num_panels = len(matrices)
+
+    if not num_panels:
+        raise ValueError("At least one matrix is required.")
+
+    num_nodes = np.shape(matrices[0])[0]
+
+    for mat in matrices:
+        if np.shape(mat) != (num_nodes, num_nodes):
+            raise ValueError(
+                "All matrices should have the same shape, got {} and "
+                "{}.".format(np.shape(matrices[0]), np.shape(mat)))
+
+    if titles is not None and len(titles) != num_panels:
+        raise ValueError("One title per matrix is required.")
+
+    if args["gradient_mode"] not in ("image", "mesh"):
+        raise ValueError(
+            "Invalid `gradient_mode`: '{}'".format(args["gradient_mode"]))
+
+    # don't use gradient with directed chords
+    use_gradient = args["use_gradient"] and not args["directed"]
+
+    # create the figure
+    if axes is None:
+        ncols = ncols or int(np.ceil(np.sqrt(num_panels)))
+        nrows = int(np.ceil(num_panels / ncols))
+
+        if figsize is None:
+            figsize = (4*ncols, 4*nrows)
+
+        fig, axes = plt.subplots(nrows, ncols, figsize=figsize,
+                                 squeeze=False)
+
+        axes = list(axes.ravel())
+
+        for ax in axes[num_panels:]:
+            ax.axis('off')
+    else:
+        axes = list(np.ravel(axes))
+
+        if len(axes) < num_panels:
+            raise ValueError("One axis per matrix is required.")
+
+        fig = axes[0].figure
+
+    axes = axes[:num_panels]
+
+    # the same names, colors, and rotations are used for all panels
+    with _stage("inputs"):
+        names, colors, chord_colors, fontcolor, rotate_names = _check_inputs(
+            num_nodes, names, order, colors, cmap, chord_colors, fontcolor,
+            rotate_names)
+
+    layout_kwargs = {
+        k: args[k] for k in inspect.signature(compute_layout).parameters
+        if k in args
+    }
+
+    layout_kwargs["order"] = order
+
+    with _stage("layout"):
+        if shared_scale:
+            extents = _shared_extents(matrices, layout_kwargs["extent"],
+                                      layout_kwargs["pad"],
+                                      layout_kwargs["min_chord_width"])
+        else:
+            extents = [layout_kwargs["extent"]]*num_panels
+
+        layout_kwargs.pop("extent")
+
+        layouts = [compute_layout(mat, extent=extent, **layout_kwargs)
+                   for mat, extent in zip(matrices, extents)]
+
+    # build the paths of all panels at once
+    with _stage("geometry"):
+        geometries = _compute_geometries(
+            layouts, width=args["width"], gap=args["gap"],
+            chordwidth=args["chordwidth"])
+
+    results = []
+
+    for k, (layout, geometry, ax) in enumerate(
+            zip(layouts, geometries, axes)):
+        nodePos, collections = _draw_diagram(
+            layout, geometry, ax, names, colors, chord_colors, fontcolor,
+            rotate_names, args["fontsize"], args["alpha"], use_gradient,
+            args["gradient_mode"], args["gradient_resolution"],
+            args["use_collections"], args["other_color"],
+            args["rasterize_chords"], args["min_name_angle"],
+            args["hide_overlapping_names"])
+
+        if titles is not None:
+            ax.set_title(titles[k])
+
+        results.append(
+            nodePos if collections is None else (nodePos,) + collections)
+
+    with _stage("tight_layout"):
+        fig.tight_layout()
+
+    if show:
+        plt.show()
+
+    return axes, results
+
+
+# In-file functions
+
+# arguments of chord_diagram that are set by chord_grid
+_GRID_ARGS = {
+    "mat", "names", "order", "colors", "cmap", "chord_colors", "fontcolor",
+    "rotate_names", "ax", "show", "cache"
+}
+
+
+def _get_args(kwargs):
+    ''' Arguments of chord_diagram used for all panels, with defaults '''
+    params = inspect.signature(chord_diagram).parameters
+
+    invalid = set(kwargs).difference(set(params).difference(_GRID_ARGS))
+
+    if invalid:
+        raise TypeError(
+            "Invalid arguments for `chord_grid`: {}.".format(sorted(invalid)))
+
+    args = {
+        k: p.default for k, p in params.items() if p.default is not p.empty
+    }
+
+    args.update(kwargs)
+
+    return args
+
+
+def _shared_extents(matrices, extent, pad, min_chord_width):
+    '''
+    Extent of each panel, so that a degree of the arcs represents the same
+    flux in all panels while the padding between the arcs stays the same.
+    '''
+    totals = []
+
+    for mat in matrices:
+        if min_chord_width:
+            # small entries are enlarged, which changes the total flux
+            mat = _prepare_matrix(mat, None, min_chord_width)[0]
+
+        totals.append(float(mat.sum()))
+
+    totals = np.array(totals)
+
+    fixed = pad*np.shape(matrices[0])[0]
+    largest = totals.max()
+
+    if largest <= 0:
+        return [extent]*len(matrices)
+
+    return (fixed + (extent - fixed)*totals/largest).tolist()
@@ -0,0 +1,258 @@
+"""
+Grouping of the nodes into clusters, to draw the diagram of the groups.
+"""
+
+import numpy as np
+import scipy.sparse as ssp
+
+from ._chord_diagram import chord_diagram
+
+
+def grouped_chord_diagram(mat, groups, expand=None, names=None, **kwargs):
+    '''
+    Plot the chord diagram of groups of nodes.
+
+    The flux between groups is computed with a single sparse product (see
+    :meth:`NodeGrouping.aggregate`), then the reduced diagram is drawn.
+
+    Parameters
+    ----------
+    mat : square matrix
+        Flux data between the nodes, ``mat[i, j]`` is the flux from i to j.
+    groups : list or :class:`NodeGrouping`
+        Group label of each node, or an existing grouping.
+        The labels of the groups are used as names for the arcs.
+    expand : label or list of labels, optional (default: None)
+        Groups that should be expanded, i.e. replaced by their members.
+    names : list, optional (default: (group, index) for each node)
+        Names of the nodes, used for the members of the expanded groups.
+    **kwargs
+        Other arguments of :func:`~mpl_chord_diagram.chord_diagram`.
+
+    Returns
+    -------
+    grouping : :class:`NodeGrouping`
+        Grouping used for the diagram (with the expanded groups), which can be
+        expanded further.
+    result
+        The output of :func:`~mpl_chord_diagram.chord_diagram`.
+
+    Examples
+    --------
+    >>> labels = label_propagation(mat)
+    >>> grouping, _ = grouped_chord_diagram(mat, labels)
+    >>> # show the members of the first group
+    >>> grouped_chord_diagram(mat, grouping, expand=grouping.groups[0])
+    '''
+    if not isinstance(groups, NodeGrouping):
+        groups = NodeGrouping(groups)
+
+    if expand is not None:
+        groups = groups.expand(expand, names=names)
+
+    result = chord_diagram(groups.aggregate(mat),
+                           names=[str(g) for g in groups.groups], **kwargs)
+
+    return groups, result
+
+
+def label_propagation(mat, max_iter=30, seed=None):
+    '''
+    Cluster the nodes via label propagation on the (undirected) weighted
+    graph given by `mat`.
+
+    At each iteration, a random half of the nodes take the label carrying the
+    largest weight among their neighbors (keeping their own label on ties),
+    until no node would change its label.
+
+    Parameters
+    ----------
+    mat : square matrix
+        Flux data between the nodes.
+    max_iter : int, optional (default: 30)
+        Maximal number of iterations.
+    seed : int, optional (default: None)
+        Seed of the random generator choosing the nodes updated at each
+        iteration.
+
+    Returns
+    -------
+    labels : int array of shape (num_nodes,)
+        Cluster of each node, numbered from 0.
+
+    Notes
+    -----
+    Each iteration is done in O(nnz) on the sparse structure of `mat`.
+    '''
+    csr = abs(ssp.csr_matrix(mat, dtype=float))
+    csr = (csr + csr.T).tocoo()
+
+    num_nodes = csr.shape[0]
+
+    nodes = np.arange(num_nodes)
+
+    # small vote of each node for its own label, to break ties
+    self_vote = 1e-9*(csr.data.max() if csr.nnz else 1)
+
+    row = np.concatenate((csr.row, nodes))
+    weights = np.concatenate((csr.data, np.full(num_nodes, self_vote)))
+
+    labels = nodes
+
+    rng = np.random.default_rng(seed)
+
+    for _ in range(max_iter):
+        cols = np.concatenate((labels[csr.col], labels))
+
+        scores = ssp.csr_matrix((weights, (row, cols)),
+                                shape=(num_nodes, num_nodes))
+
+        new_labels = np.asarray(scores.argmax(axis=1)).ravel()
+
+        if np.array_equal(new_labels, labels):
+            break
+
+        # updating all nodes at once makes neighbors swap their labels
+        labels = np.where(rng.random(num_nodes) < 0.5, new_labels, labels)
+
+    return np.unique(labels, return_inverse=True)[1]
+
+
+class NodeGrouping:
+    '''
+    Mapping from the nodes of a matrix to groups of nodes.
+
+    Parameters
+    ----------
+    labels : list of length num_nodes
+        Group label (any hashable object) of each node.
+    groups : list, optional (default: order of first appearance in `labels`)
+        Order of the groups.
+
+    Attributes
+    ----------
+    groups : list
+        Labels of the groups.
+    membership : int array of shape (num_nodes,)
+        Index of the group of each node.
+    indicator : :class:`scipy.sparse.csr_matrix`
+        Sparse indicator matrix of shape (num_nodes, num_groups), with
+        ``indicator[i, g] = 1`` if node i belongs to group g.
+    '''
+
+    def __init__(self, labels, groups=None):
+        if groups is None:
+            index = {}
+
+            membership = [index.setdefault(lbl, len(index)) for lbl in labels]
+        else:
+            index = {g: k for k, g in enumerate(groups)}
+
+            if len(index) != len(groups):
+                raise ValueError("`groups` contains duplicate labels.")
+
+            try:
+                membership = [index[lbl] for lbl in labels]
+            except KeyError as e:
+                raise ValueError(
+                    "Label {} is missing from `groups`.".format(e)) from None
+
+        self.groups = list(index)
+        self.membership = np.asarray(membership, dtype=int)
+
+        num_nodes = len(self.membership)
+
+        self.indicator = ssp.csr_matrix(
+            (np.ones(num_nodes), (np.arange(num_nodes), self.membership)),
+            shape=(num_nodes, len(self.groups)))
+
+    @property
+    def num_groups(self):
+        ''' Number of groups '''
+        return len(self.groups)
+
+    @property
+    def sizes(self):
+        ''' Number of nodes in each group '''
+        return np.bincount(self.membership, minlength=self.num_groups)
+
+    def members(self, group):
+        ''' Indices of the nodes belonging to `group` (given by its label) '''
+        return np.where(self.membership == self.groups.index(group))[0]
+
+    def aggregate(self, mat):
+        '''
+        Compute the flux between groups.
+
+        Parameters
+        ----------
+        mat : square matrix of shape (num_nodes, num_nodes)
+            Flux between the nodes.
+
+        Returns
+        -------
+        grouped : matrix of shape (num_groups, num_groups)
+            Flux between the groups, ``grouped[g, h]`` being the sum of
+            ``mat[i, j]`` for all i in g and j in h. It is a CSR matrix if
+            `mat` is sparse, an array otherwise.
+
+        Notes
+        -----
+        The aggregation is a product with the sparse indicator matrix, done
+        in O(nnz) for sparse matrices: `mat` is never densified.
+        '''
+        if ssp.issparse(mat):
+            mat = ssp.csr_matrix(mat)
+
+            return (self.indicator.T @ mat @ self.indicator).tocsr()
+
+        return np.asarray(self.indicator.T @ np.asarray(mat) @ self.indicator)
+
+    def expand(self, groups, names=None):
+        '''
+        Return a new grouping where the nodes of `groups` are split into one
+        group per node.
+
+        Parameters
+        ----------
+        groups : label or list of labels
+            Groups that should be expanded.
+        names : list of length num_nodes, optional
+            Labels of the expanded nodes, which should differ from the labels
+            of the other groups. By default, node i of group g gets the label
+            ``(g, i)``.
+
+        Returns
+        -------
+        grouping : :class:`NodeGrouping`
+            New grouping where the members of the expanded groups take the
+            place of their group.
+        '''
+        if not isinstance(groups, list):
+            groups = [groups]
+
+        expanded = set(self.groups.index(g) for g in groups)
+
+        if names is None:
+            names = [
+                (self.groups[m], i) for i, m in enumerate(self.membership)
+            ]
+
+        labels = [
+            names[i] if m in expanded else self.groups[m]
+            for i, m in enumerate(self.membership)
+        ]
+
+        order = []
+
+        for k, g in enumerate(self.groups):
+            if k in expanded:
+                order.extend(names[i] for i in self.members(g))
+            else:
+                order.append(g)
+
+        return NodeGrouping(labels, groups=order)
+
+    def __repr__(self):
+        return "<NodeGrouping: {} nodes in {} groups>".format(
+            len(self.membership), self.num_groups)
@@ -0,0 +1,117 @@
+"""
+Selection of the names to display on diagrams with many nodes.
+"""
+
+import bisect
+
+import numpy as np
+
+
+def visible_names(layout, extents=None, min_angle=0, avoid_overlap=False,
+                  radius=1.05):
+    '''
+    Nodes whose names should be displayed.
+
+    Parameters
+    ----------
+    layout : :class:`~mpl_chord_diagram.ChordLayout`
+        Layout of the diagram.
+    extents : array of shape (num_nodes,), optional
+        Size of each name along the circle, in data units (required if
+        `avoid_overlap` is True, see :func:`name_extents`).
+    min_angle : float, optional (default: 0)
+        Arcs smaller than this angle (in degrees) get no name.
+    avoid_overlap : bool, optional (default: False)
+        Whether overlapping names should be hidden, keeping the names of the
+        largest arcs.
+    radius : float, optional (default: 1.05)
+        Radius at which the names are placed.
+
+    Returns
+    -------
+    visible : bool array of shape (num_nodes,)
+
+    Notes
+    -----
+    Overlaps are resolved from the largest arc to the smallest: a name is
+    kept if it does not overlap the kept names on each side, which are found
+    by a binary search among the kept names sorted by angle. The cost is
+    therefore O(N log N), N being the number of nodes.
+    '''
+    size = layout.arcs[:, 1] - layout.arcs[:, 0]
+
+    visible = size >= min_angle
+
+    if not avoid_overlap:
+        return visible
+
+    center = layout.arcs.mean(axis=1)
+    half = np.degrees(0.5*np.asarray(extents, dtype=float) / radius)
+
+    start, end = (center - half).tolist(), (center + half).tolist()
+
+    nodes = np.where(visible)[0]
+
+    # kept names, sorted by angle (they do not overlap, so their starts and
+    # ends are both sorted)
+    kept, starts, ends = [], [], []
+
+    full_circle = layout.extent >= 360
+
+    for i in nodes[np.argsort(-size[nodes], kind="stable")].tolist():
+        k = bisect.bisect(starts, start[i])
+
+        if k > 0 and ends[k - 1] > start[i]:
+            continue
+
+        if k < len(starts) and starts[k] < end[i]:
+            continue
+
+        # neighbors on the other side of the start of the circle
+        if full_circle and kept and (ends[-1] - 360 > start[i]
+                                     or starts[0] + 360 < end[i]):
+            continue
+
+        kept.insert(k, i)
+        starts.insert(k, start[i])
+        ends.insert(k, end[i])
+
+    visible = np.zeros(layout.num_nodes, dtype=bool)
+    visible[kept] = True
+
+    return visible
+
+
+def name_extents(names, fontsize, rotate_names, ax):
+    '''
+    Estimated size of each name along the circle, in data units: the width
+    of the text for tangential names, its height for rotated (radial) names.
+
+    Widths are the sum of the advances of the characters (each distinct
+    character is measured once), so no text artist is created.
+    '''
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.textpath import text_to_path
+
+    prop = FontProperties(size=fontsize)
+
+    # data units per point (the axis shows [-1.1, 1.1] on its smallest side)
+    bbox = ax.get_window_extent()
+    scale = 2.2*ax.figure.dpi / (72*min(bbox.width, bbox.height))
+
+    names = [str(name) for name in names]
+
+    advance = {
+        c: text_to_path.get_text_width_height_descent(
+            c, prop, ismath=False)[0]
+        for c in set("".join(names))
+    }
+
+    height = prop.get_size_in_points()
+
+    extents = [
+        height if rotate else sum(advance[c] for c in name)
+        for name, rotate in zip(names, rotate_names)
+    ]
+
+    return scale*np.array(extents, dtype=float)
@@ -0,0 +1,587 @@
+"""
+Layout of the chord diagram: positions of the arcs and chords, and geometry
+of all the shapes.
+
+This module only depends on NumPy and SciPy, so layouts can be computed
+without loading matplotlib and drawn with any renderer.
+"""
+
+import numpy as np
+import scipy.sparse as ssp
+
+from .geometry import (ARC_CODES, CHORD_CODES, DIRECTED_CHORD_CODES,
+                       SELF_CHORD_CODES, chord_vertices, ideogram_vertices,
+                       self_chord_vertices)
+from .utilities import compute_positions
+
+
+class ChordLayout:
+    '''
+    Positions of the arcs and chords of a chord diagram.
+
+    The chords are stored as contiguous arrays aligned with the (row, col)
+    indices of the associated matrix entries, in COO (row-major) order.
+    For undirected diagrams, each chord appears only once, with ``row >= col``
+    (self-chords are the entries where ``row == col``).
+
+    Indexing or slicing a layout returns a new layout containing only the
+    selected chords (the arcs and the pruned flux segments are kept).
+
+    Attributes
+    ----------
+    num_nodes : int
+        Number of nodes (arcs) in the diagram.
+    directed : bool
+        Whether the chords are directed.
+    arcs : array of shape (num_nodes, 2)
+        Start and end angle (in degrees) of each arc.
+    node_pos : array of shape (num_nodes, 3)
+        Position (x, y) and angle of the name of each node.
+    rotation : bool array of shape (num_nodes,)
+        Whether the names are upside-down (on the lower part of the circle).
+    row, col : int arrays of shape (num_chords,)
+        Source and target nodes of each chord.
+    positions : array of shape (num_chords, 4)
+        Positions (start1, end1, start2, end2) of the chords, in degrees,
+        where (start1, end1) are the limits of the chord on the source arc,
+        and (start2, end2) on the target arc.
+    flux : array of shape (num_chords,)
+        Flux from `row` to `col` for each chord.
+    reverse_flux : array of shape (num_chords,)
+        Flux from `col` to `row` for each chord.
+    other_node : int array of shape (num_other,)
+        Nodes where part of the flux was pruned (see :func:`compute_layout`).
+    other_positions : array of shape (num_other, 2)
+        Start and end angles, on the arc of `other_node`, of the segment
+        corresponding to the pruned flux. For directed layouts, a node can
+        have two segments: one for the outgoing and one for the incoming flux.
+    other_flux : array of shape (num_other,)
+        Total pruned flux associated to each segment.
+    extent : float
+        Angular aperture of the diagram, in degrees.
+    dtype : numpy dtype
+        Floating-point type of all the arrays of positions and fluxes (and of
+        the vertices computed from them by :func:`compute_geometry`).
+    '''
+
+    def __init__(self, arcs, node_pos, rotation, row, col, positions, flux,
+                 reverse_flux, directed=False, other_node=None,
+                 other_positions=None, other_flux=None, extent=360,
+                 dtype=float):
+        self.dtype = np.dtype(dtype)
+        self.arcs = np.asarray(arcs, dtype=dtype).reshape(-1, 2)
+        self.node_pos = np.asarray(node_pos, dtype=dtype).reshape(-1, 3)
+        self.rotation = np.asarray(rotation, dtype=bool)
+        self.row = np.asarray(row, dtype=int)
+        self.col = np.asarray(col, dtype=int)
+        self.positions = np.asarray(positions, dtype=dtype).reshape(-1, 4)
+        self.flux = np.asarray(flux, dtype=dtype)
+        self.reverse_flux = np.asarray(reverse_flux, dtype=dtype)
+        self.directed = directed
+        self.extent = extent
+
+        self.other_node = np.asarray(
+            [] if other_node is None else other_node, dtype=int)
+        self.other_positions = np.asarray(
+            [] if other_positions is None else other_positions,
+            dtype=dtype).reshape(-1, 2)
+        self.other_flux = np.asarray(
+            [] if other_flux is None else other_flux, dtype=dtype)
+
+    @property
+    def num_nodes(self):
+        ''' Number of nodes (arcs) '''
+        return len(self.arcs)
+
+    @property
+    def is_self(self):
+        ''' Boolean mask of the self-chords (only for undirected layouts) '''
+        if self.directed:
+            return np.zeros(len(self), dtype=bool)
+
+        return self.row == self.col
+
+    def __len__(self):
+        return len(self.row)
+
+    def __getitem__(self, key):
+        return ChordLayout(
+            self.arcs, self.node_pos, self.rotation, self.row[key],
+            self.col[key], self.positions[key], self.flux[key],
+            self.reverse_flux[key], directed=self.directed,
+            other_node=self.other_node, other_positions=self.other_positions,
+            other_flux=self.other_flux, extent=self.extent, dtype=self.dtype)
+
+    def __repr__(self):
+        return "<ChordLayout: {} nodes, {} {}chords>".format(
+            self.num_nodes, len(self), "directed " if self.directed else "")
+
+
+def compute_layout(mat, order=None, sort="size", directed=False, start_at=0,
+                   extent=360, pad=2., min_chord_width=0, max_chords=None,
+                   min_flux_fraction=None, top_k=None, dtype=float):
+    '''
+    Compute the positions of the arcs and chords of a chord diagram.
+
+    Parameters
+    ----------
+    mat : square matrix
+        Flux data, ``mat[i, j]`` is the flux from i to j.
+    order : list, optional (default: order of the matrix entries)
+        Order in which the arcs should be placed around the trigonometric
+        circle.
+    sort : str, optional (default: "size")
+        Order in which the chords should be sorted: either None (unsorted),
+        "size" (largest chords first), or "distance".
+    directed : bool, optional (default: False)
+        Whether the chords should be directed.
+    start_at : float, optional (default : 0)
+        Location, in degrees, where the diagram should start on the unit circle.
+    extent : float, optional (default : 360)
+        The angular aperture, in degrees, of the diagram.
+    pad : float, optional (default: 2)
+        Distance between two neighboring ideogram arcs. Unit: degree.
+    min_chord_width : float, optional (default: 0)
+        Minimal chord width to replace small entries and zero reciprocals in
+        the matrix.
+    max_chords : int, optional (default: all chords)
+        Maximal number of chords, only the largest ones are kept.
+    min_flux_fraction : float, optional (default: 0)
+        Only keep the chords carrying at least this fraction of the total flux.
+    top_k : int, optional (default: all chords)
+        Only keep the chords that are among the `top_k` largest chords of one
+        of their nodes (of their source node if `directed` is True).
+    dtype : numpy dtype, optional (default: float)
+        Floating-point type used to store the layout and, afterwards, the
+        vertices of its geometry. Use ``np.float32`` to halve their memory.
+
+    Returns
+    -------
+    layout : :class:`ChordLayout`
+        Positions of the arcs and chords. If `order` is given, node indices
+        in the layout refer to the reordered matrix.
+
+    Notes
+    -----
+    The size of a chord is the sum of the fluxes in both directions for
+    undirected diagrams. When chords are pruned via `max_chords`,
+    `min_flux_fraction`, or `top_k`, the arcs keep their exact sizes: the
+    pruned flux of each node is gathered into an "other" segment at the end
+    of its arc (see :attr:`ChordLayout.other_positions`).
+    Pruning is done before computing the positions, so the cost of the layout
+    then depends on the number of kept chords.
+    Dense matrices are not copied (read-only and memory-mapped arrays can be
+    used directly): they are read by blocks of rows and only their nonzero
+    entries are kept, so the memory used on top of the input is proportional
+    to the number of chords.
+
+    See also
+    --------
+    :func:`~mpl_chord_diagram.chord_diagram` for details on the parameters.
+    '''
+    mat, is_sparse = _prepare_matrix(mat, order, min_chord_width)
+
+    # sum over rows
+    out_deg = np.asarray(mat.sum(axis=1), dtype=float).ravel()
+    in_deg = None
+    degree = out_deg.copy()
+
+    if directed:
+        # also sum over columns
+        in_deg = np.asarray(mat.sum(axis=0), dtype=float).ravel()
+        degree += in_deg
+
+    prune = (max_chords is not None or top_k is not None
+             or bool(min_flux_fraction))
+
+    kept = mat
+
+    if prune:
+        kept = _prune(mat, max_chords, min_flux_fraction, top_k, directed)
+
+    # compute all values and optionally apply sort
+    arcs, rotation, node_pos, row, col, positions, flux, reverse_flux = \
+        compute_positions(kept, degree, in_deg, out_deg, start_at, is_sparse,
+                          sort, directed, extent, pad)
+
+    other = {}
+
+    if prune:
+        other_node, other_positions, other_flux = _get_other(
+            kept, arcs, degree, out_deg, in_deg, directed)
+
+        if directed and len(row):
+            # the chords in the reverse direction may have been pruned
+            reverse_flux = np.asarray(mat[col, row], dtype=float).ravel()
+
+        other = dict(other_node=other_node, other_positions=other_positions,
+                     other_flux=other_flux)
+
+    return ChordLayout(arcs, node_pos, rotation, row, col, positions, flux,
+                       reverse_flux, directed=directed, extent=extent,
+                       dtype=dtype, **other)
+
+
+class ChordGeometry:
+    '''
+    Vertices of all the shapes of a chord diagram, as returned by
+    :func:`compute_geometry`.
+
+    Each shape is made of lines and cubic Bezier curves; the path codes
+    (same values as the :class:`matplotlib.path.Path` constants) are shared
+    by all shapes of the same kind.
+
+    Attributes
+    ----------
+    arc_vertices : array of shape (num_nodes, 33, 2)
+        Vertices of the arcs, with codes `arc_codes`.
+    chord_vertices : array of shape (num_chords, 37 or 24, 2)
+        Vertices of the chords between different nodes, with codes
+        `chord_codes` (24 vertices for directed chords, 37 otherwise).
+    chord_ids : int array of shape (num_chords,)
+        Index of each of these chords in the layout.
+    self_chord_vertices : array of shape (num_self_chords, 19, 2)
+        Vertices of the chords from a node to itself, with codes
+        `self_chord_codes`.
+    self_chord_ids : int array of shape (num_self_chords,)
+        Index of each self-chord in the layout.
+    other_vertices : array of shape (num_other, 19, 2)
+        Vertices of the stubs showing the pruned flux, with codes
+        `self_chord_codes`.
+    label_positions : array of shape (num_nodes, 2)
+        Position of the name of each node.
+    label_angles : array of shape (num_nodes,)
+        Angle of the name of each node, in degrees.
+    label_flipped : bool array of shape (num_nodes,)
+        Whether the names are on the lower part of the circle (their text
+        should then be aligned on its top instead of its bottom).
+    radius : float
+        Radius at which the chords start.
+    width : float
+        Width of the arcs (their inner radius is ``1 - width``).
+    gap : float
+        Distance between the arcs and the chords.
+    arc_codes, chord_codes, self_chord_codes : uint8 arrays
+        Path codes: 1 for MOVETO, 2 for LINETO, 4 for CURVE4 (the two control
+        points and the end point of a cubic Bezier curve), 79 for CLOSEPOLY.
+    '''
+
+    def __init__(self, arc_vertices, chord_vertices, chord_ids,
+                 self_chord_vertices, self_chord_ids, other_vertices,
+                 label_positions, label_angles, label_flipped, radius,
+                 directed=False, width=0.1, gap=0.03):
+        self.arc_vertices = arc_vertices
+        self.chord_vertices = chord_vertices
+        self.chord_ids = chord_ids
+        self.self_chord_vertices = self_chord_vertices
+        self.self_chord_ids = self_chord_ids
+        self.other_vertices = other_vertices
+        self.label_positions = label_positions
+        self.label_angles = label_angles
+        self.label_flipped = label_flipped
+        self.radius = radius
+        self.width = width
+        self.gap = gap
+
+        self.arc_codes = ARC_CODES
+        self.chord_codes = DIRECTED_CHORD_CODES if directed else CHORD_CODES
+        self.self_chord_codes = SELF_CHORD_CODES
+
+    def __repr__(self):
+        return "<ChordGeometry: {} arcs, {} chords, {} self-chords>".format(
+            len(self.arc_vertices), len(self.chord_vertices),
+            len(self.self_chord_vertices))
+
+
+def compute_geometry(layout, width=0.1, gap=0.03, chordwidth=0.7):
+    '''
+    Compute the vertices of the arcs and chords of a layout.
+
+    Parameters
+    ----------
+    layout : :class:`ChordLayout`
+        Positions of the arcs and chords.
+    width : float, optional (default: 0.1)
+        Width of the arcs.
+    gap : float, optional (default: 0.03)
+        Distance between the arcs and the beginning of the chords.
+    chordwidth : float, optional (default: 0.7)
+        Position of the control points of the chords.
+
+    Returns
+    -------
+    geometry : :class:`ChordGeometry`
+        Vertices of all shapes and positions of the names, with the same
+        floating-point type as the layout.
+
+    See also
+    --------
+    :func:`~mpl_chord_diagram.chord_diagram` for details on the parameters.
+    '''
+    return _compute_geometries([layout], width, gap, chordwidth)[0]
+
+
+# In-file functions
+
+def _prepare_matrix(mat, order, min_chord_width):
+    '''
+    Convert the matrix to CSR, set the minimal chord width and reorder it.
+
+    Dense inputs (including read-only or memory-mapped arrays) are never
+    copied: they are converted by blocks of rows, `order` being applied as a
+    permutation of the row and column indices.
+    '''
+    is_sparse = ssp.issparse(mat)
+
+    if is_sparse:
+        mat = ssp.csr_matrix(mat)
+
+        if order is not None:
+            mat = mat[order][:, order]
+    else:
+        mat = _dense_to_csr(mat, order)
+
+    # set min entry size for small entries and zero reciprocals
+    # mat[i, j]:  i -> j
+    if min_chord_width:
+        # entries of the pattern or of its transpose get at least the min width
+        pattern = ((mat != 0) + (mat.T != 0)).tocsr()
+
+        mat = mat.maximum(pattern * min_chord_width).tocsr()
+
+    return mat, is_sparse
+
+
+def _dense_to_csr(mat, order=None, block_size=1 << 20):
+    '''
+    CSR matrix containing the nonzero entries of a dense matrix, reordered by
+    `order`, reading about `block_size` entries at once.
+    '''
+    mat = np.asarray(mat)
+
+    num_nodes = mat.shape[0]
+
+    # new index of each column
+    rank = None
+
+    if order is not None:
+        order = np.asarray(order, dtype=np.int64)
+
+        rank = np.empty(num_nodes, dtype=np.int64)
+        rank[order] = np.arange(num_nodes)
+
+    step = max(1, block_size // max(num_nodes, 1))
+
+    counts, indices, data = [], [], []
+
+    for start in range(0, num_nodes, step):
+        if order is None:
+            block = mat[start:start + step]
+        else:
+            block = mat[order[start:start + step]]
+
+        rows, cols = np.nonzero(block)
+
+        counts.append(np.bincount(rows, minlength=len(block)))
+        indices.append(cols if rank is None else rank[cols])
+        data.append(block[rows, cols])
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+
+    if num_nodes:
+        np.cumsum(np.concatenate(counts), out=indptr[1:])
+
+    csr = ssp.csr_matrix(
+        (np.concatenate(data) if data else np.empty(0),
+         np.concatenate(indices) if indices else np.empty(0, dtype=np.int64),
+         indptr), shape=(num_nodes, num_nodes))
+
+    # permuted columns are not sorted anymore
+    csr.sort_indices()
+
+    return csr
+
+
+def _prune(mat, max_chords, min_flux_fraction, top_k, directed):
+    '''
+    Return a CSR matrix containing only the entries of the kept chords.
+    '''
+    coo = ssp.coo_matrix(mat)
+    coo.sum_duplicates()
+
+    row, col, data = coo.row, coo.col, coo.data.astype(float)
+
+    nnz = data != 0
+
+    row, col, data = row[nnz], col[nnz], data[nnz]
+
+    # size of each chord
+    if directed:
+        src, tgt, size = row, col, data
+    else:
+        # chord (i, j) with i >= j carries the flux in both directions
+        src, tgt = np.maximum(row, col), np.minimum(row, col)
+
+        keys = src.astype(np.int64)*mat.shape[0] + tgt
+
+        keys, chord_ids = np.unique(keys, return_inverse=True)
+
+        size = np.bincount(chord_ids, weights=data)
+
+        src, tgt = keys // mat.shape[0], keys % mat.shape[0]
+
+    keep = np.ones(len(size), dtype=bool)
+
+    if min_flux_fraction:
+        keep &= size >= min_flux_fraction*size.sum()
+
+    if top_k is not None:
+        if directed:
+            keep &= _ranks(src, size) < top_k
+        else:
+            is_top = np.zeros(len(size), dtype=bool)
+
+            # each chord is ranked among the chords of both of its nodes
+            ranks = _ranks(np.concatenate((src, tgt)), np.tile(size, 2))
+
+            np.logical_or.at(is_top, np.tile(np.arange(len(size)), 2),
+                             ranks < top_k)
+
+            keep &= is_top
+
+    if max_chords is not None and keep.sum() > max_chords:
+        kept = np.where(keep)[0]
+
+        largest = kept[np.argsort(-size[kept], kind="stable")[:max_chords]]
+
+        keep[:] = False
+        keep[largest] = True
+
+    if not directed:
+        keep = keep[chord_ids]
+
+    return ssp.csr_matrix((data[keep], (row[keep], col[keep])),
+                          shape=mat.shape)
+
+
+def _ranks(nodes, size):
+    '''
+    Rank of each chord among the chords of its node (0 for the largest).
+    '''
+    order = np.lexsort((-size, nodes))
+
+    counts = np.bincount(nodes, minlength=1)
+
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+
+    ranks = np.empty(len(nodes), dtype=int)
+    ranks[order] = np.arange(len(nodes)) - first
+
+    return ranks
+
+
+def _get_other(mat, arcs, degree, out_deg, in_deg, directed):
+    '''
+    Segments of the arcs corresponding to the pruned flux of each node.
+    '''
+    length = arcs[:, 1] - arcs[:, 0]
+
+    # angle per unit of flux
+    scale = np.divide(length, degree, out=np.zeros(len(degree)),
+                      where=(degree != 0))
+
+    kept_out = np.asarray(mat.sum(axis=1), dtype=float).ravel()
+
+    # chords start at the beginning of the arc, pruned flux comes last
+    out_end = arcs[:, 0] + scale*out_deg
+
+    nodes = [np.arange(len(arcs))]
+    segments = [np.stack((arcs[:, 0] + scale*kept_out, out_end), axis=1)]
+    fluxes = [out_deg - kept_out]
+
+    if directed:
+        # incoming chords come after the outgoing ones
+        kept_in = np.asarray(mat.sum(axis=0), dtype=float).ravel()
+
+        nodes.append(nodes[0])
+        segments.append(np.stack(
+            (out_end + scale*kept_in, out_end + scale*in_deg), axis=1))
+        fluxes.append(in_deg - kept_in)
+
+    nodes, segments, fluxes = (
+        np.concatenate(x) for x in (nodes, segments, fluxes))
+
+    # only keep the nodes where some flux was pruned
+    pruned = fluxes > 1e-10*degree[nodes]
+
+    order = np.argsort(nodes[pruned], kind="stable")
+
+    return (nodes[pruned][order], segments[pruned][order],
+            fluxes[pruned][order])
+
+
+def _compute_geometries(layouts, width=0.1, gap=0.03, chordwidth=0.7):
+    '''
+    Geometries of several layouts, computed in a single batch: the shapes
+    of all layouts are passed at once to each vertex function, then split.
+    '''
+    radius = 1 - width - gap
+    dtype = np.result_type(*(layout.dtype for layout in layouts))
+
+    def concat(arrays, shape):
+        arrays = list(arrays)
+        return np.concatenate(arrays) if arrays else np.empty(shape)
+
+    def split(arr, counts):
+        return np.split(arr, np.cumsum(counts)[:-1])
+
+    is_self = [layout.is_self for layout in layouts]
+
+    num_arcs = [layout.num_nodes for layout in layouts]
+    num_self = [np.count_nonzero(s) for s in is_self]
+    num_chords = [len(s) - n for s, n in zip(is_self, num_self)]
+    num_other = [len(layout.other_positions) for layout in layouts]
+
+    arcs = concat((layout.arcs for layout in layouts), (0, 2))
+
+    arc_verts = ideogram_vertices(arcs[:, 0], arcs[:, 1], 1., width,
+                                  dtype=dtype)
+
+    # self chords only exist in the undirected case
+    start1, end1, _, _ = concat(
+        (layout.positions[s] for layout, s in zip(layouts, is_self)),
+        (0, 4)).T
+
+    self_verts = self_chord_vertices(start1, end1, radius, 0.7*chordwidth,
+                                     dtype=dtype)
+
+    # chords of each layout are computed with its own extent
+    start1, end1, start2, end2 = concat(
+        (layout.positions[~s] for layout, s in zip(layouts, is_self)),
+        (0, 4)).T
+
+    extent = np.repeat([layout.extent for layout in layouts], num_chords)
+
+    chord_verts = chord_vertices(start1, end1, start2, end2, radius=radius,
+                                 gap=gap, chordwidth=chordwidth,
+                                 extent=extent, directed=layouts[0].directed,
+                                 dtype=dtype)
+
+    start, end = concat(
+        (layout.other_positions for layout in layouts), (0, 2)).T
+
+    other_verts = self_chord_vertices(start, end, radius, 0.1*chordwidth,
+                                      dtype=dtype)
+
+    geometries = []
+
+    for layout, s, arc_v, chord_v, self_v, other_v in zip(
+            layouts, is_self, split(arc_verts, num_arcs),
+            split(chord_verts, num_chords), split(self_verts, num_self),
+            split(other_verts, num_other)):
+        geometries.append(ChordGeometry(
+            arc_v, chord_v, np.where(~s)[0], self_v, np.where(s)[0], other_v,
+            layout.node_pos[:, :2], layout.node_pos[:, 2], layout.rotation,
+            radius, directed=layout.directed, width=width, gap=gap))
+
+    return geometries
@@ -0,0 +1,354 @@
+"""
+Fast lookup of the node or chord under a point, for hover and picking.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .geometry import _expand, polygon_vertices
+
+
+PickResult = namedtuple("PickResult",
+                        ["kind", "source", "target", "flux", "index"])
+PickResult.__doc__ = '''
+Element of a chord diagram found by :meth:`PickIndex.pick`.
+
+Attributes
+----------
+kind : str
+    Either "node" (an arc), "chord", or "other" (a stub showing the pruned
+    flux of a node).
+source, target : int
+    Nodes of the chord (same as in :attr:`ChordLayout.row` and
+    :attr:`ChordLayout.col`), or the node itself for arcs and stubs.
+flux : float
+    Flux from `source` to `target` for chords, total flux of the node for
+    arcs, and pruned flux for stubs.
+index : int
+    Index of the node, of the chord in the layout, or of the stub in
+    :attr:`ChordLayout.other_node`.
+'''
+
+
+class PickIndex:
+    '''
+    Index of the shapes of a chord diagram, finding the node or chord under
+    a point without testing every artist, e.g. for hover tooltips.
+
+    Parameters
+    ----------
+    layout : :class:`~mpl_chord_diagram.ChordLayout`
+        Layout of the diagram.
+    geometry : :class:`~mpl_chord_diagram.ChordGeometry`
+        Geometry of the layout, as drawn.
+
+    Notes
+    -----
+    The arcs, the ends of the chords, and the pruned flux segments are stored
+    as sorted angular intervals, so the shape under a point on the arcs or at
+    the border of the disk is found by a binary search, in O(log N).
+    Inside the disk, the shapes are stored in a uniform grid (at most 64 x 64
+    cells), each cell listing the shapes that cross it. Only the shapes in
+    the cell of the point are tested, all at once, on polygons approximating
+    their paths (computed when the index is built), and the topmost one is
+    returned. The cost of a query is therefore proportional to the number
+    of shapes crossing a cell rather than to the total number of shapes;
+    near the center of dense diagrams, where most long chords pass, this is
+    still a sizeable fraction of them.
+
+    Examples
+    --------
+    >>> index = PickIndex(layout, geometry)
+    >>> def on_move(event):
+    ...     hit = index.pick(event.xdata, event.ydata)
+    ...     if hit is not None and hit.kind == "chord":
+    ...         print(names[hit.source], "->", names[hit.target], hit.flux)
+    >>> fig.canvas.mpl_connect("motion_notify_event", on_move)
+    '''
+
+    def __init__(self, layout, geometry):
+        self.layout = layout
+        self.geometry = geometry
+
+        num_chords = len(layout)
+
+        # arcs, in angular order
+        self._start_at = layout.arcs[0, 0] if layout.num_nodes else 0.
+        self._node_flux = _node_flux(layout)
+
+        # ends of the chords and pruned flux segments, in angular order
+        is_self = layout.is_self
+        chords = np.arange(num_chords)
+        others = num_chords + np.arange(len(layout.other_node))
+
+        starts = np.concatenate((layout.positions[:, 0],
+                                 layout.positions[~is_self, 2],
+                                 layout.other_positions[:, 0]))
+        ends = np.concatenate((layout.positions[:, 1],
+                               layout.positions[~is_self, 3],
+                               layout.other_positions[:, 1]))
+        shapes = np.concatenate((chords, chords[~is_self], others))
+
+        order = np.argsort(starts, kind="stable")
+
+        self._end_starts = starts[order]
+        self._end_stops = ends[order]
+        self._end_shapes = shapes[order]
+
+        # polygons approximating the shapes (chords then stubs, in drawing
+        # order)
+        chord_poly = polygon_vertices(geometry.chord_vertices,
+                                      geometry.chord_codes)
+        self_poly = polygon_vertices(geometry.self_chord_vertices,
+                                     geometry.self_chord_codes)
+        other_poly = polygon_vertices(geometry.other_vertices,
+                                      geometry.self_chord_codes)
+
+        self._polygons = [
+            (np.asarray(ids, dtype=int), poly)
+            for ids, poly in ((geometry.chord_ids, chord_poly),
+                              (geometry.self_chord_ids, self_poly),
+                              (others, other_poly))
+        ]
+
+        num_shapes = num_chords + len(others)
+
+        # position of each shape in its polygon array
+        self._kind = np.empty(num_shapes, dtype=int)
+        self._local = np.empty(num_shapes, dtype=int)
+
+        for kind, (ids, _) in enumerate(self._polygons):
+            self._kind[ids] = kind
+            self._local[ids] = np.arange(len(ids))
+
+        # grid of the shapes crossing each cell
+        self._grid_size = int(np.clip(np.ceil(np.sqrt(num_shapes)), 1, 64))
+
+        self._grid_lower, self._grid_step, self._cell_ptr, \
+            self._cell_shapes = _grid_index(self._polygons, self._grid_size)
+
+    def pick(self, x, y):
+        '''
+        Element under the point (x, y), in data coordinates.
+
+        Parameters
+        ----------
+        x, y : float
+            Coordinates of the point (e.g. ``event.xdata`` and
+            ``event.ydata`` for a matplotlib mouse event). None values, for
+            events outside of the axis, are accepted.
+
+        Returns
+        -------
+        hit : :class:`PickResult` or None
+            Topmost element under the point, None if there is none.
+        '''
+        if x is None or y is None:
+            return None
+
+        layout, geometry = self.layout, self.geometry
+
+        r = np.hypot(x, y)
+
+        if r > 1:
+            return None
+
+        theta = np.degrees(np.arctan2(y, x))
+        theta = self._start_at + (theta - self._start_at) % 360
+
+        if r >= 1 - geometry.width:
+            # on the arcs
+            i = np.searchsorted(layout.arcs[:, 0], theta, side="right") - 1
+
+            if i >= 0 and theta <= layout.arcs[i, 1]:
+                i = int(i)
+
+                return PickResult("node", i, i, float(self._node_flux[i]), i)
+
+            return None
+
+        if r > geometry.radius:
+            # between the arcs and the chords: end of a chord or stub
+            k = np.searchsorted(self._end_starts, theta, side="right") - 1
+
+            if k >= 0 and theta <= self._end_stops[k]:
+                return self._result(self._end_shapes[k])
+
+            return None
+
+        # shapes crossing the cell of the point
+        u, v = (np.array((x, y)) - self._grid_lower) / self._grid_step
+
+        size = self._grid_size
+
+        if not (0 <= u <= size and 0 <= v <= size):
+            return None
+
+        cell = min(int(v), size - 1)*size + min(int(u), size - 1)
+
+        candidates = self._cell_shapes[
+            self._cell_ptr[cell]:self._cell_ptr[cell + 1]]
+
+        # test the polygons, the topmost shape is the last one drawn
+        topmost = -1
+
+        for kind, (ids, poly) in enumerate(self._polygons):
+            local = self._local[candidates[self._kind[candidates] == kind]]
+
+            hits = ids[local][_contains(poly[local], x, y)]
+
+            if len(hits):
+                topmost = max(topmost, hits.max())
+
+        return self._result(topmost) if topmost >= 0 else None
+
+    def __repr__(self):
+        return "<PickIndex: {} nodes, {} chords>".format(
+            self.layout.num_nodes, len(self.layout))
+
+    def _result(self, shape):
+        ''' PickResult of a chord or stub '''
+        layout = self.layout
+
+        if shape >= len(layout):
+            k = int(shape - len(layout))
+            node = int(layout.other_node[k])
+
+            return PickResult("other", node, node, float(layout.other_flux[k]),
+                              k)
+
+        return PickResult("chord", int(layout.row[shape]),
+                          int(layout.col[shape]), float(layout.flux[shape]),
+                          int(shape))
+
+
+# In-file functions
+
+def _node_flux(layout):
+    ''' Total flux of each node (degree for directed layouts) '''
+    n = layout.num_nodes
+
+    flux = np.bincount(layout.row, weights=layout.flux, minlength=n)
+
+    if layout.directed:
+        flux += np.bincount(layout.col, weights=layout.flux, minlength=n)
+    else:
+        # reverse flux of the chords between different nodes
+        other = ~layout.is_self
+
+        flux += np.bincount(layout.col[other],
+                            weights=layout.reverse_flux[other], minlength=n)
+
+    return flux + np.bincount(layout.other_node, weights=layout.other_flux,
+                              minlength=n)
+
+
+def _grid_index(polygons, size):
+    '''
+    Uniform (size, size) grid covering all `polygons` (a list of (ids,
+    polygons) groups), with the shapes crossing each cell.
+
+    In each row of cells, a polygon lies between the leftmost and rightmost
+    points of its edges within the row, so all the cells in between are
+    listed (which can include a few extra cells for concave shapes, but
+    never misses one).
+
+    Returns the lower corner and the size of the cells (in data
+    coordinates), and the shapes of each cell as a CSR structure
+    (``shapes[indptr[c]:indptr[c + 1]]`` for cell ``c = row*size + col``).
+    '''
+    shape_ids, x0, y0, x1, y1 = [], [], [], [], []
+
+    for ids, poly in polygons:
+        poly = poly.astype(float)
+
+        shape_ids.append(np.repeat(ids, poly.shape[1]))
+
+        x0.append(poly[..., 0].ravel())
+        y0.append(poly[..., 1].ravel())
+        x1.append(np.roll(poly[..., 0], 1, axis=1).ravel())
+        y1.append(np.roll(poly[..., 1], 1, axis=1).ravel())
+
+    shape_ids, x0, y0, x1, y1 = (
+        np.concatenate(a) for a in (shape_ids, x0, y0, x1, y1))
+
+    if len(x0) == 0:
+        return (np.zeros(2), np.ones(2), np.zeros(size*size + 1, dtype=int),
+                np.empty(0, dtype=int))
+
+    lower = np.array((x0.min(), y0.min()))
+    upper = np.array((x0.max(), y0.max()))
+
+    step = np.maximum((upper - lower) / size, 1e-12)
+
+    # edges in grid coordinates (cell (row, col) is [col, col + 1] x
+    # [row, row + 1])
+    u0, u1 = (x0 - lower[0]) / step[0], (x1 - lower[0]) / step[0]
+    v0, v1 = (y0 - lower[1]) / step[1], (y1 - lower[1]) / step[1]
+
+    vmin, vmax = np.minimum(v0, v1), np.maximum(v0, v1)
+
+    first = np.clip(np.floor(vmin), 0, size - 1).astype(np.int64)
+    last = np.clip(np.floor(vmax), 0, size - 1).astype(np.int64)
+
+    # each edge in each row it crosses, with its extremities in the row
+    edges, rows = _expand(first, last - first + 1)
+
+    dv = (v1 - v0)[edges]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ta = (np.maximum(vmin[edges], rows) - v0[edges]) / dv
+        tb = (np.minimum(vmax[edges], rows + 1) - v0[edges]) / dv
+
+    # horizontal edges are entirely in their row
+    ta = np.clip(np.nan_to_num(ta, nan=0., posinf=0., neginf=0.), 0, 1)
+    tb = np.clip(np.nan_to_num(tb, nan=1., posinf=1., neginf=1.), 0, 1)
+
+    du = (u1 - u0)[edges]
+
+    ua, ub = u0[edges] + ta*du, u0[edges] + tb*du
+
+    cmin = np.clip(np.floor(np.minimum(ua, ub)), 0, size - 1).astype(np.int64)
+    cmax = np.clip(np.floor(np.maximum(ua, ub)), 0, size - 1).astype(np.int64)
+
+    # leftmost and rightmost cells of each shape in each row
+    keys = shape_ids[edges]*size + rows
+
+    order = np.argsort(keys, kind="stable")
+
+    keys = keys[order]
+
+    groups = np.flatnonzero(np.diff(keys, prepend=-1))
+
+    cmin = np.minimum.reduceat(cmin[order], groups)
+    cmax = np.maximum.reduceat(cmax[order], groups)
+
+    keys = keys[groups]
+
+    runs, cols = _expand(cmin, cmax - cmin + 1)
+
+    shapes = (keys // size)[runs]
+    cells = (keys % size)[runs]*size + cols
+
+    order = np.argsort(cells, kind="stable")
+
+    indptr = np.zeros(size*size + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(cells, minlength=size*size))
+
+    return lower, step, indptr, shapes[order]
+
+
+def _contains(polygons, x, y):
+    '''
+    Whether each polygon contains the point (x, y), via the even-odd rule.
+    '''
+    xi, yi = polygons[..., 0], polygons[..., 1]
+    xj, yj = np.roll(xi, 1, axis=1), np.roll(yi, 1, axis=1)
+
+    crosses = (yi > y) != (yj > y)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = xi + (xj - xi)*(y - yi)/(yj - yi)
+
+    return np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
@@ -0,0 +1,221 @@
+"""
+Opt-in instrumentation of the stages of :func:`chord_diagram`.
+"""
+
+import time
+import tracemalloc
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+StageRecord = namedtuple("StageRecord", ["name", "time", "artists",
+                                         "vertices", "bytes"])
+StageRecord.__doc__ = '''
+Measures of one stage recorded by :func:`profile_stages`.
+
+Attributes
+----------
+name : str
+    Name of the stage.
+time : float
+    Wall time of the stage, in seconds.
+artists : int
+    Number of artists added to the axis during the stage.
+vertices : int
+    Number of vertices (or triangle corners for gradient meshes) of these
+    artists.
+bytes : int or None
+    Peak memory allocated during the stage, None if memory was not traced.
+'''
+
+
+# reports currently recording (innermost last)
+_active_reports = []
+
+
+class ProfileReport:
+    '''
+    Measures of the stages of one or several chord diagrams, filled by
+    :func:`profile_stages`.
+
+    Attributes
+    ----------
+    stages : list of :class:`StageRecord`
+        Records, in the order in which the stages ran.
+    '''
+
+    def __init__(self, memory=False):
+        self.stages = []
+        self.memory = memory
+
+    @property
+    def total_time(self):
+        ''' Total wall time of the recorded stages '''
+        return sum(s.time for s in self.stages)
+
+    def __getitem__(self, name):
+        ''' Record of the last stage called `name` '''
+        for stage in reversed(self.stages):
+            if stage.name == name:
+                return stage
+
+        raise KeyError(name)
+
+    def __iter__(self):
+        return iter(self.stages)
+
+    def __len__(self):
+        return len(self.stages)
+
+    @contextmanager
+    def stage(self, name, ax=None):
+        '''
+        Record a custom stage (e.g. the call to ``savefig``).
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        ax : matplotlib axis, optional (default: None)
+            Axis on which the new artists are counted.
+        '''
+        artists = set(id(a) for a in _children(ax))
+        bytes_start = None
+
+        if self.memory and tracemalloc.is_tracing():
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+
+            bytes_start = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+
+            allocated = None
+
+            if bytes_start is not None:
+                allocated = tracemalloc.get_traced_memory()[1] - bytes_start
+
+            new = [a for a in _children(ax) if id(a) not in artists]
+
+            vertices = sum(_count_vertices(a) for a in new)
+
+            self.stages.append(StageRecord(name, duration, len(new), vertices,
+                                           allocated))
+
+    def to_records(self):
+        ''' List of dicts (one per stage), e.g. to log or export as JSON '''
+        return [s._asdict() for s in self.stages]
+
+    def __str__(self):
+        lines = ["{:<14}{:>10}{:>9}{:>11}{:>13}".format(
+            "stage", "time (s)", "artists", "vertices", "bytes")]
+
+        for s in self.stages:
+            lines.append("{:<14}{:>10.4f}{:>9}{:>11}{:>13}".format(
+                s.name, s.time, s.artists, s.vertices,
+                "-" if s.bytes is None else s.bytes))
+
+        lines.append("{:<14}{:>10.4f}".format("total", self.total_time))
+
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return "<ProfileReport: {} stages, {:.4f} s>".format(
+            len(self.stages), self.total_time)
+
+
+@contextmanager
+def profile_stages(memory=False):
+    '''
+    Record the wall time, number of artists, number of vertices, and
+    (optionally) allocated memory of each stage of the chord diagrams drawn
+    inside the context.
+
+    The stages of :func:`~mpl_chord_diagram.chord_diagram` are "inputs",
+    "layout", "geometry" (or "cache" if a layout cache is used), "paths",
+    "artists", "other", "gradients", "names", and "tight_layout"; stages that
+    are not run are not recorded.
+    Additional stages can be recorded with :meth:`ProfileReport.stage`.
+
+    Parameters
+    ----------
+    memory : bool, optional (default: False)
+        Whether to trace the memory allocations with :mod:`tracemalloc`,
+        which slows down the execution significantly.
+
+    Yields
+    ------
+    report : :class:`ProfileReport`
+        Report filled while the context is active.
+
+    Examples
+    --------
+    >>> with profile_stages(memory=True) as report:
+    ...     chord_diagram(mat, ax=ax)
+    ...     with report.stage("savefig"):
+    ...         fig.savefig("diagram.png")
+    >>> print(report)
+    '''
+    report = ProfileReport(memory=memory)
+
+    start_tracing = memory and not tracemalloc.is_tracing()
+
+    if start_tracing:
+        tracemalloc.start()
+
+    _active_reports.append(report)
+
+    try:
+        yield report
+    finally:
+        _active_reports.remove(report)
+
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def _stage(name, ax=None):
+    '''
+    Context recording stage `name` in the innermost active report, or doing
+    nothing if no report is active.
+    '''
+    if _active_reports:
+        return _active_reports[-1].stage(name, ax)
+
+    return _null_context()
+
+
+# In-file functions
+
+@contextmanager
+def _null_context():
+    yield
+
+
+def _children(ax):
+    ''' Artists of `ax` (empty if `ax` is None) '''
+    if ax is None:
+        return []
+
+    return ax.get_children()
+
+
+def _count_vertices(artist):
+    ''' Number of vertices drawn by `artist` '''
+    if hasattr(artist, "get_paths"):
+        return sum(len(p.vertices) for p in artist.get_paths())
+
+    if hasattr(artist, "get_path"):
+        return len(artist.get_path().vertices)
+
+    if hasattr(artist, "get_triangles"):
+        return artist.get_triangles().size // 2
+
+    # containers, e.g. the RasterizedLayer drawing the chords
+    return sum(_count_vertices(a) for a in artist.get_children())
@@ -0,0 +1,168 @@
+"""
+Layer of artists rasterized into a single image in vector outputs.
+"""
+
+from contextlib import contextmanager
+
+from matplotlib.artist import Artist, allow_rasterization
+
+
+class RasterizedLayer(Artist):
+    '''
+    Group of artists drawn as a single image when the figure is saved in a
+    vector format (PDF, SVG, PS), and normally on raster outputs.
+
+    The layer behaves as a small container for the chords: artists are added
+    with :meth:`add_collection`, :meth:`add_patch`, or :meth:`add_artist`
+    (like on an axis), and the layer itself is added to the axis.
+
+    Parameters
+    ----------
+    ax : matplotlib axis
+        Axis on which the artists are drawn (used for their transform and
+        clipping).
+    dpi : float, optional (default: resolution given to ``savefig``)
+        Resolution of the image in vector outputs.
+
+    Notes
+    -----
+    The size of a vector file, and the time needed to display it, then only
+    depend on `dpi` and not on the number of artists in the layer.
+
+    Setting `dpi` relies on private attributes of matplotlib's vector
+    renderers. If they are missing (or if the renderer cannot rasterize a
+    group of artists), each artist is rasterized on its own, as with
+    :meth:`~matplotlib.artist.Artist.set_rasterized`, at the resolution
+    given to ``savefig``.
+    '''
+
+    def __init__(self, ax, dpi=None):
+        super().__init__()
+
+        self._ax = ax
+        self._artists = []
+        self.dpi = dpi
+
+        # drawn with the other patches and collections, in insertion order
+        self.set_zorder(1)
+
+    def add_artist(self, artist):
+        ''' Add `artist` to the layer and return it '''
+        artist.set_figure(self._ax.figure)
+        artist.axes = self._ax
+
+        if not artist.is_transform_set():
+            artist.set_transform(self._ax.transData)
+
+        artist.set_clip_path(self._ax.patch)
+
+        self._artists.append(artist)
+
+        return artist
+
+    add_collection = add_artist
+    add_patch = add_artist
+
+    def get_children(self):
+        return list(self._artists)
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+
+        from matplotlib.backends.backend_mixed import MixedModeRenderer
+
+        renderer.open_group(self.__class__.__name__, gid=self.get_gid())
+
+        if not isinstance(renderer, MixedModeRenderer):
+            for artist in self._artists:
+                artist.draw(renderer)
+        elif _can_rasterize(renderer, self.dpi):
+            # vector output: draw all artists on the same raster
+            with _raster_dpi(renderer, self.dpi):
+                renderer.start_rasterizing()
+
+                try:
+                    for artist in self._artists:
+                        artist.draw(renderer)
+                finally:
+                    renderer.stop_rasterizing()
+        else:
+            # private API not available: one raster per artist
+            for artist in self._artists:
+                _draw_rasterized(artist, renderer)
+
+        renderer.close_group(self.__class__.__name__)
+
+        self.stale = False
+
+
+# In-file functions
+
+def _can_rasterize(renderer, dpi):
+    '''
+    Whether `renderer` can draw several artists on the same raster, with the
+    resolution `dpi` if it is not None.
+    '''
+    if not all(hasattr(renderer, method)
+               for method in ("start_rasterizing", "stop_rasterizing")):
+        return False
+
+    if dpi is None:
+        return True
+
+    vector = getattr(renderer, "_vector_renderer", None)
+
+    return hasattr(renderer, "dpi") and (
+        hasattr(vector, "image_dpi") or hasattr(vector, "image_magnification"))
+
+
+def _draw_rasterized(artist, renderer):
+    ''' Draw `artist` with rasterization enabled (if it supports it) '''
+    if not getattr(artist.draw, "_supports_rasterization", False):
+        artist.draw(renderer)
+        return
+
+    rasterized = artist.get_rasterized()
+
+    artist.set_rasterized(True)
+
+    try:
+        artist.draw(renderer)
+    finally:
+        artist.set_rasterized(rasterized)
+
+
+@contextmanager
+def _raster_dpi(renderer, dpi):
+    '''
+    Temporarily set the resolution of the rasterized parts of a
+    MixedModeRenderer, and the scale of the images in its vector renderer.
+    '''
+    if dpi is None:
+        yield
+        return
+
+    vector = renderer._vector_renderer
+
+    if hasattr(vector, "image_dpi"):
+        # PDF and SVG
+        old = renderer.dpi, vector.image_dpi
+
+        renderer.dpi, vector.image_dpi = dpi, dpi
+
+        try:
+            yield
+        finally:
+            renderer.dpi, vector.image_dpi = old
+    else:
+        # PostScript
+        old = renderer.dpi, vector.image_magnification
+
+        renderer.dpi, vector.image_magnification = dpi, dpi / 72
+
+        try:
+            yield
+        finally:
+            renderer.dpi, vector.image_magnification = old
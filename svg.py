@@ -0,0 +1,220 @@
+"""
+Write chord diagrams directly as SVG, without matplotlib artists.
+"""
+
+from contextlib import contextmanager
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+from .layout import ChordLayout, compute_geometry, compute_layout
+
+
+# SVG commands for the matplotlib path codes
+_COMMANDS = {1: "M", 2: "L", 4: "C", 79: "Z"}
+
+
+def write_svg(mat, output, names=None, order=None, colors=None, cmap=None,
+              chord_colors=None, alpha=0.7, width=0.1, gap=0.03,
+              chordwidth=0.7, fontsize=12.8, fontcolor="k",
+              rotate_names=False, size=500, precision=1, chunk_size=10000,
+              other_color="lightgrey", **kwargs):
+    '''
+    Write a chord diagram as an SVG file.
+
+    The shapes are streamed as compact ``<path>`` elements, in chunks of
+    `chunk_size` chords, so that the memory used does not grow with the
+    number of chords. Colors and opacity are set through shared CSS classes
+    (one per node) rather than on each element.
+
+    Parameters
+    ----------
+    mat : square matrix or :class:`~mpl_chord_diagram.ChordLayout`
+        Flux data, or a precomputed layout.
+    output : str or file-like object
+        Path of the SVG file, or text stream where the SVG is written.
+    names, order, colors, cmap, chord_colors, alpha, width, gap, chordwidth,
+    fontcolor, rotate_names, other_color :
+        Same as in :func:`~mpl_chord_diagram.chord_diagram`.
+    fontsize : float, optional (default: 12.8)
+        Size of the names, in pixels.
+    size : int, optional (default: 500)
+        Width and height of the image, in pixels.
+    precision : int, optional (default: 1)
+        Number of decimals of the coordinates (in pixels).
+    chunk_size : int, optional (default: 10000)
+        Number of chords whose vertices are computed at once.
+    **kwargs
+        Other arguments of :func:`~mpl_chord_diagram.compute_layout` (e.g.
+        `sort`, `directed`, or `max_chords`), unused if `mat` is a layout.
+
+    Notes
+    -----
+    Gradients are not supported: chords take the color of their source
+    node (or `chord_colors`).
+    '''
+    from matplotlib.colors import to_hex
+
+    from ._chord_diagram import _check_inputs, _name_props
+
+    if isinstance(mat, ChordLayout):
+        layout = mat
+    else:
+        layout = compute_layout(mat, order=order, **kwargs)
+
+    num_nodes = layout.num_nodes
+
+    names, colors, chord_colors, fontcolor, rotate_names = _check_inputs(
+        num_nodes, names, order, colors, cmap, chord_colors, fontcolor,
+        rotate_names)
+
+    # shared styles, with one class per node for arcs (a*) and chords (c*)
+    styles = [
+        "path{{fill-opacity:{}}}".format(alpha),
+        "text{{font-family:sans-serif;font-size:{}px}}".format(fontsize),
+    ]
+
+    styles.extend(".a{}{{fill:{}}}".format(i, to_hex(c))
+                  for i, c in enumerate(colors))
+    styles.extend(".c{}{{fill:{}}}".format(i, to_hex(c))
+                  for i, c in enumerate(chord_colors))
+
+    if other_color is not None:
+        styles.append(".o{{fill:{}}}".format(to_hex(other_color)))
+
+    # transform from data coordinates ([-1.1, 1.1]) to pixels (y downwards)
+    scale = size / 2.2
+
+    def to_pixels(verts):
+        return np.stack(((verts[..., 0] + 1.1)*scale,
+                         (1.1 - verts[..., 1])*scale), axis=-1)
+
+    fmt = "{{:.{}f}}".format(precision)
+
+    with _open(output) as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="{0}" '
+                'height="{0}" viewBox="0 0 {0} {0}">\n'.format(size))
+        f.write("<style>{}</style>\n".format("".join(styles)))
+
+        # arcs and pruned flux (geometry of a layout without chords)
+        shapes = compute_geometry(layout[:0], width=width, gap=gap,
+                                  chordwidth=chordwidth)
+
+        arc_template = _path_template(shapes.arc_codes, precision)
+        chord_template = _path_template(shapes.chord_codes, precision)
+        self_template = _path_template(shapes.self_chord_codes, precision)
+
+        f.write("<g>\n")
+        f.write("".join(
+            '<path class="a{}" d="{}"/>\n'.format(i, d)
+            for i, d in enumerate(_format_paths(
+                arc_template, to_pixels(shapes.arc_vertices)))))
+        f.write("</g>\n<g>\n")
+
+        # chords, by chunks
+        for start in range(0, len(layout), chunk_size):
+            chunk = layout[start:start + chunk_size]
+
+            geometry = compute_geometry(chunk, width=width, gap=gap,
+                                        chordwidth=chordwidth)
+
+            paths = np.empty(len(chunk), dtype=object)
+
+            paths[geometry.chord_ids] = _format_paths(
+                chord_template, to_pixels(geometry.chord_vertices))
+
+            paths[geometry.self_chord_ids] = _format_paths(
+                self_template, to_pixels(geometry.self_chord_vertices))
+
+            f.write("".join(
+                '<path class="c{}" d="{}"/>\n'.format(i, d)
+                for i, d in zip(chunk.row, paths)))
+
+        f.write("</g>\n")
+
+        # pruned flux
+        if other_color is not None and len(layout.other_node):
+            f.write("<g>\n")
+            f.write("".join(
+                '<path class="o" d="{}"/>\n'.format(d)
+                for d in _format_paths(self_template,
+                                       to_pixels(shapes.other_vertices))))
+            f.write("</g>\n")
+
+        # names
+        if names is not None:
+            assert len(names) == num_nodes, "One name per node is required."
+
+            f.write("<g>\n")
+
+            for i, name in enumerate(names):
+                x, y, rotation, ha, va = _name_props(layout, i,
+                                                     rotate_names[i])
+
+                (x, y), = to_pixels(np.array([[x, y]]))
+
+                f.write(
+                    '<text x="{x}" y="{y}" transform="rotate({r} {x} {y})" '
+                    'text-anchor="{ha}" dominant-baseline="{va}" fill={c}>'
+                    '{name}</text>\n'.format(
+                        x=fmt.format(x), y=fmt.format(y),
+                        r=fmt.format(-rotation), ha=_ANCHORS[ha],
+                        va=_BASELINES[va], c=quoteattr(to_hex(fontcolor[i])),
+                        name=escape(str(name))))
+
+            f.write("</g>\n")
+
+        f.write("</svg>\n")
+
+
+# In-file functions
+
+_ANCHORS = {"left": "start", "center": "middle", "right": "end"}
+
+_BASELINES = {"bottom": "text-after-edge", "center": "central",
+              "top": "text-before-edge"}
+
+
+def _path_template(codes, precision):
+    '''
+    Format string converting the vertices of a shape into SVG path data, e.g.
+    "M{:.1f} {:.1f}C{:.1f} ...Z", and indices of the vertices it uses (the
+    vertex of CLOSEPOLY is ignored). Consecutive commands of the same type
+    are merged.
+    '''
+    coord = "{{:.{0}f}} {{:.{0}f}}".format(precision)
+
+    parts, used = [], []
+    previous = None
+
+    for i, code in enumerate(codes):
+        command = _COMMANDS[code]
+
+        if command == "Z":
+            parts.append("Z")
+        else:
+            parts.append((" " if command == previous else command) + coord)
+            used.append(i)
+
+        previous = command
+
+    return "".join(parts), np.array(used, dtype=int)
+
+
+def _format_paths(template, verts):
+    ''' SVG path data of each shape in `verts` (num_shapes, num_verts, 2) '''
+    template, used = template
+
+    verts = verts[:, used].reshape(len(verts), 2*len(used))
+
+    return [template.format(*v) for v in verts.tolist()]
+
+
+@contextmanager
+def _open(output):
+    ''' Open `output` for writing if it is a path, use it as-is otherwise '''
+    if hasattr(output, "write"):
+        yield output
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            yield f
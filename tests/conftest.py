@@ -0,0 +1,33 @@
+"""
+Make the source tree importable as ``mpl_chord_diagram`` during the tests.
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the repository root is the package directory: expose it under the package
+# name through a symbolic link
+_path = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, _path, True)
+
+os.symlink(ROOT, os.path.join(_path, "mpl_chord_diagram"))
+sys.path.insert(0, _path)
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    ''' Close the figures created by a test '''
+    yield
+
+    if "matplotlib.pyplot" in sys.modules:
+        sys.modules["matplotlib.pyplot"].close("all")
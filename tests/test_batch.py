@@ -0,0 +1,62 @@
+"""
+Loading matrices and rendering batches.
+"""
+
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as ssp
+
+from mpl_chord_diagram import load_matrix, render_batch
+
+
+MAT = np.random.default_rng(0).integers(0, 10, size=(5, 5)).astype(float)
+
+
+@pytest.mark.parametrize("fmt", ["csr", "csc", "coo"])
+def test_load_sparse(tmp_path, fmt):
+    path = str(tmp_path / "mat.npz")
+
+    ssp.save_npz(path, ssp.csr_matrix(MAT).asformat(fmt))
+
+    mat = load_matrix(path)
+
+    assert ssp.issparse(mat) and mat.format == "csr"
+    assert np.array_equal(mat.toarray(), MAT)
+
+
+def test_load_dense(tmp_path):
+    np.save(str(tmp_path / "mat.npy"), MAT)
+    np.savez(str(tmp_path / "single.npz"), MAT)
+    np.savez(str(tmp_path / "named.npz"), mat=MAT, other=MAT.T)
+    np.savetxt(str(tmp_path / "mat.csv"), MAT, delimiter=",",
+               header="flux matrix")
+
+    for name in ("mat.npy", "single.npz", "named.npz", "mat.csv"):
+        assert np.array_equal(load_matrix(str(tmp_path / name)), MAT), name
+
+
+def test_load_invalid(tmp_path):
+    path = str(tmp_path / "mats.npz")
+
+    np.savez(path, a=MAT, b=MAT.T)
+
+    with pytest.raises(ValueError, match="named 'mat'"):
+        load_matrix(path)
+
+    with pytest.raises(ValueError, match="Unsupported"):
+        load_matrix(str(tmp_path / "mat.xlsx"))
+
+
+def test_render_batch(tmp_path):
+    out = [str(tmp_path / "a.png"), str(tmp_path / "b.svg")]
+
+    results = render_batch([MAT, 2*MAT], out, workers=0)
+
+    assert [r.out_path for r in results] == out
+    assert all(r.error is None for r in results)
+    assert all(os.path.getsize(p) > 0 for p in out)
+
+    with pytest.raises(ValueError):
+        render_batch([MAT, MAT], [out[0]]*2, workers=0)
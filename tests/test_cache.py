@@ -0,0 +1,105 @@
+"""
+Cache of the layouts and geometries.
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as ssp
+
+from mpl_chord_diagram import (ChordDiagram, LayoutCache, chord_diagram,
+                               chord_grid, compute_geometry, compute_layout)
+from mpl_chord_diagram.cache import _GEOMETRY_ARRAYS, _LAYOUT_ARRAYS
+
+
+MAT = np.random.default_rng(0).integers(0, 10, size=(6, 6)).astype(float)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_dtype(dtype):
+    ''' The dtype reaches the layout and is part of the cache key '''
+    cache = LayoutCache()
+
+    chord_diagram(MAT, cache=cache, dtype=dtype)
+    ChordDiagram(MAT, cache=cache, dtype=dtype)
+    chord_grid([MAT], dtype=dtype, use_gradient=True)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    layout, geometry = cache.get(MAT, dtype=dtype)
+
+    assert layout.dtype == dtype
+    assert geometry.chord_vertices.dtype == dtype
+
+    # a different dtype is a different entry
+    other = np.float64 if dtype == np.float32 else np.float32
+
+    cache.get(MAT, dtype=other)
+
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def _assert_same(entry, layout, geometry):
+    ''' The cached entry is identical to the computed layout and geometry '''
+    for attr in _LAYOUT_ARRAYS + ("directed", "extent", "dtype"):
+        assert np.array_equal(getattr(entry[0], attr), getattr(layout, attr))
+
+    for attr in _GEOMETRY_ARRAYS + (
+            "label_positions", "label_angles", "label_flipped", "radius",
+            "width", "gap", "arc_codes", "chord_codes"):
+        assert np.array_equal(getattr(entry[1], attr),
+                              getattr(geometry, attr))
+
+
+@pytest.mark.parametrize("kwargs", [
+    {}, {"directed": True, "max_chords": 10, "dtype": np.float32},
+    {"order": [5, 4, 3, 2, 1, 0], "top_k": 2, "extent": 270}])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_round_trip(tmp_path, kwargs, sparse):
+    ''' Entries read from memory or disk are the computed ones '''
+    mat = ssp.csr_matrix(MAT) if sparse else MAT
+
+    layout = compute_layout(mat, **kwargs)
+    geometry = compute_geometry(layout, width=0.2)
+
+    cache = LayoutCache(directory=str(tmp_path))
+
+    entry = cache.get(mat, width=0.2, **kwargs)
+
+    _assert_same(entry, layout, geometry)
+
+    # in memory: same objects, read-only arrays
+    assert cache.get(mat, width=0.2, **kwargs) is entry
+    assert not entry[0].positions.flags.writeable
+
+    # on disk, from another cache
+    other = LayoutCache(directory=str(tmp_path))
+
+    _assert_same(other.get(mat, width=0.2, **kwargs), layout, geometry)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (other.hits, other.misses) == (1, 0)
+
+
+def test_keys():
+    ''' Entries are only reused for the same data and arguments '''
+    cache = LayoutCache(maxsize=2)
+
+    cache.get(MAT)
+    cache.get(MAT.copy(), extent=360.0, sort="size")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    changed = MAT.copy()
+    changed[0, 1] += 1
+
+    cache.get(changed)
+    cache.get(MAT, gap=0.05)
+
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # the least recently used entry was discarded
+    assert len(cache) == 2
+
+    cache.get(MAT)
+
+    assert (cache.hits, cache.misses) == (1, 4)
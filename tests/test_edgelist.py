@@ -0,0 +1,136 @@
+"""
+Aggregation of edge lists into flux matrices.
+"""
+
+import numpy as np
+import pytest
+
+from mpl_chord_diagram import aggregate_edges, read_edge_list
+
+
+def _edges(num_edges=500, num_nodes=20, seed=0):
+    ''' Random edges, with repeated (source, target) pairs '''
+    rng = np.random.default_rng(seed)
+
+    sources = rng.integers(0, num_nodes, num_edges)
+    targets = rng.integers(0, num_nodes, num_edges)
+    weights = rng.uniform(0, 5, num_edges)
+
+    return sources, targets, weights
+
+
+def _expected(sources, targets, weights):
+    ''' Flux matrix and names obtained by summing the edges one by one '''
+    names = np.unique(np.concatenate((sources, targets)))
+    rank = {name: i for i, name in enumerate(names.tolist())}
+
+    mat = np.zeros((len(names), len(names)))
+
+    if weights is None:
+        weights = np.ones(len(sources))
+
+    for s, t, w in zip(sources.tolist(), targets.tolist(), weights):
+        mat[rank[s], rank[t]] += w
+
+    return mat, names
+
+
+@pytest.mark.parametrize("chunk_size", [1, 37, 1000])
+@pytest.mark.parametrize("labels", ["int", "str"])
+def test_aggregate(chunk_size, labels):
+    ''' The result does not depend on the chunks '''
+    sources, targets, weights = _edges()
+
+    if labels == "str":
+        sources = np.array(["node {}".format(s) for s in sources])
+        targets = np.array(["node {}".format(t) for t in targets])
+
+    chunks = [
+        (sources[i:i + chunk_size], targets[i:i + chunk_size],
+         weights[i:i + chunk_size])
+        for i in range(0, len(sources), chunk_size)
+    ]
+
+    # empty chunks are ignored
+    chunks.insert(1, ([], [], []))
+
+    mat, names = aggregate_edges(chunks)
+
+    expected, expected_names = _expected(sources, targets, weights)
+
+    assert np.array_equal(names, expected_names)
+    assert np.allclose(mat.toarray(), expected)
+
+    # one entry per distinct pair
+    assert mat.nnz == np.count_nonzero(expected)
+
+
+def test_unweighted():
+    sources, targets, _ = _edges()
+
+    mat, names = aggregate_edges([(sources[:100], targets[:100], None),
+                                  (sources[100:], targets[100:], None)])
+
+    expected, _ = _expected(sources, targets, None)
+
+    assert np.array_equal(mat.toarray(), expected)
+
+
+def test_empty():
+    mat, names = aggregate_edges([])
+
+    assert mat.shape == (0, 0) and len(names) == 0
+
+
+@pytest.mark.parametrize("fmt", ["csv", "csv-unweighted", "npy", "npy-fields",
+                                 "npz", "npz-single"])
+def test_read(tmp_path, fmt):
+    ''' All file formats give the same matrix, whatever the chunk size '''
+    sources, targets, weights = _edges()
+
+    if fmt.startswith("csv"):
+        path = tmp_path / "edges.csv"
+
+        columns = (sources, targets) if fmt == "csv-unweighted" \
+            else (sources, targets, weights)
+
+        with open(path, "w") as f:
+            f.write("source,target,weight\n")
+
+            for row in zip(*(c.tolist() for c in columns)):
+                f.write(",".join(repr(x) for x in row) + "\n")
+
+        if fmt == "csv-unweighted":
+            weights = None
+
+        kwargs = {"skiprows": 1}
+    elif fmt == "npy":
+        path = tmp_path / "edges.npy"
+        np.save(path, np.stack((sources, targets, weights), axis=1))
+        kwargs = {}
+    elif fmt == "npy-fields":
+        path = tmp_path / "edges.npy"
+
+        data = np.empty(len(sources), dtype=[("src", int), ("tgt", int),
+                                             ("w", float)])
+        data["src"], data["tgt"], data["w"] = sources, targets, weights
+
+        np.save(path, data)
+        kwargs = {"fields": ("src", "tgt", "w")}
+    elif fmt == "npz":
+        path = tmp_path / "edges.npz"
+        np.savez(path, source=sources, target=targets, weight=weights)
+        kwargs = {}
+    else:
+        path = tmp_path / "edges.npz"
+        np.savez_compressed(path,
+                            edges=np.stack((sources, targets), axis=1))
+        weights = None
+        kwargs = {}
+
+    mat, names = read_edge_list(str(path), chunk_size=64, **kwargs)
+
+    expected, expected_names = _expected(sources, targets, weights)
+
+    assert np.array_equal(names.astype(float), expected_names)
+    assert np.allclose(mat.toarray(), expected)
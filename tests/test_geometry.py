@@ -0,0 +1,116 @@
+"""
+Vertices of the arcs and chords.
+
+``data/baseline_geometry.npz`` contains the vertices computed shape by shape
+by the former implementation of :func:`ideogram_arc`, :func:`chord_arc`, and
+:func:`self_chord_arc`, for random angles.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from mpl_chord_diagram import compute_geometry, compute_layout
+from mpl_chord_diagram.geometry import (ARC_CODES, CHORD_CODES,
+                                        DIRECTED_CHORD_CODES,
+                                        SELF_CHORD_CODES, chord_vertices,
+                                        ideogram_vertices, polygon_vertices,
+                                        self_chord_vertices)
+
+
+DATA = os.path.join(os.path.dirname(__file__), "data",
+                    "baseline_geometry.npz")
+
+
+@pytest.fixture(scope="module")
+def ref():
+    with np.load(DATA) as data:
+        return dict(data)
+
+
+def test_arcs(ref):
+    verts = ideogram_vertices(ref["start1"], ref["end1"], radius=1.,
+                              width=0.1)
+
+    assert np.array_equal(ARC_CODES, ref["arc_codes"])
+    assert np.allclose(verts, ref["arc_vertices"], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("extent", [360, 270])
+@pytest.mark.parametrize("directed", [False, True])
+def test_chords(ref, directed, extent):
+    key = "{}chord_{}".format("directed_" if directed else "", extent)
+    codes = DIRECTED_CHORD_CODES if directed else CHORD_CODES
+
+    verts = chord_vertices(ref["start1"], ref["end1"], ref["start2"],
+                           ref["end2"], radius=0.87, gap=0.03, pad=2,
+                           chordwidth=0.7, extent=extent, directed=directed)
+
+    assert np.array_equal(codes, ref[key + "_codes"])
+    assert np.allclose(verts, ref[key + "_vertices"], rtol=0, atol=1e-12)
+
+
+def test_self_chords(ref):
+    verts = self_chord_vertices(ref["start1"], ref["end1"], radius=0.87,
+                                chordwidth=0.7)
+
+    assert np.array_equal(SELF_CHORD_CODES, ref["self_chord_codes"])
+    assert np.allclose(verts, ref["self_chord_vertices"], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_compute_geometry(dtype):
+    ''' Batched geometry of a layout, in single or double precision '''
+    mat = np.random.default_rng(0).integers(0, 5, size=(8, 8))
+
+    layout = compute_layout(mat, dtype=dtype)
+    geometry = compute_geometry(layout)
+
+    diag = layout.row == layout.col
+
+    assert geometry.arc_vertices.shape == (8, 33, 2)
+    assert geometry.chord_vertices.dtype == dtype
+    assert len(geometry.chord_vertices) == np.count_nonzero(~diag)
+    assert len(geometry.self_chord_vertices) == np.count_nonzero(diag)
+
+    ref = chord_vertices(*layout.positions[~diag].T.astype(float),
+                         radius=0.87, extent=layout.extent)
+
+    tol = 1e-6 if dtype == np.float32 else 1e-12
+
+    assert np.allclose(geometry.chord_vertices, ref, rtol=0, atol=tol)
+
+
+def test_polygon_vertices(ref):
+    ''' Polygons stay close to the Bezier curves '''
+    from matplotlib.path import Path
+
+    verts, codes = ref["chord_360_vertices"], CHORD_CODES
+
+    t = np.linspace(0, 1, 20)
+
+    for tol in (1e-2, 1e-4):
+        poly = polygon_vertices(verts, codes, tol=tol)
+
+        assert poly.dtype == np.float32 and len(poly) == len(verts)
+
+        poly = poly.astype(float)
+
+        for v, p in zip(verts, poly):
+            # points along the curves and the lines of the shape
+            curve = np.concatenate([
+                bezier(t) for bezier, _ in Path(v, codes).iter_bezier()])
+
+            # distance to the edges of the polygon
+            a, b = p, np.roll(p, -1, axis=0)
+            ab = b - a
+
+            u = np.einsum("pjd,jd->pj", curve[:, None] - a, ab)
+            u = np.clip(u / np.maximum((ab**2).sum(axis=1), 1e-30), 0, 1)
+
+            closest = a + u[..., None]*ab
+            dist = np.linalg.norm(curve[:, None] - closest, axis=-1)
+
+            # float32 rounding on top of the tolerance
+            assert dist.min(axis=1).max() < tol + 1e-6
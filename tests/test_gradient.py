@@ -0,0 +1,141 @@
+"""
+Chord gradients.
+"""
+
+import numpy as np
+import pytest
+
+from matplotlib.path import Path
+
+from mpl_chord_diagram import chord_diagram, compute_geometry, compute_layout
+from mpl_chord_diagram.geometry import polygon_vertices
+from mpl_chord_diagram.gradient import GradientMesh, gradient_image
+
+
+MAT = np.random.default_rng(0).integers(0, 10, size=(6, 6))
+
+
+def _chord_paths():
+    layout = compute_layout(MAT + MAT.T)
+    geometry = compute_geometry(layout)
+
+    paths = [Path(v, geometry.chord_codes) for v in geometry.chord_vertices]
+
+    # matplotlib flattens the curves with a tolerance suited to pixel units,
+    # so the reference uses finely flattened polygons
+    polygons = polygon_vertices(geometry.chord_vertices, geometry.chord_codes,
+                                tol=1e-5)
+
+    return paths, [Path(p, closed=False) for p in polygons.astype(float)]
+
+
+def test_image_coverage():
+    ''' The opacity of each pixel is that of the chords covering it '''
+    paths, polygons = _chord_paths()
+
+    n, alpha = 60, 0.7
+    num = len(paths)
+
+    image = gradient_image(paths, np.zeros((num, 2)), np.ones((num, 2)),
+                           np.full(num, 90.), ["r"]*num, ["b"]*num, alpha,
+                           resolution=n)
+
+    assert image.shape == (n, n, 4)
+
+    # pixel centers
+    x = -1 + (np.arange(n) + 0.5)*2/n
+    points = np.stack(np.meshgrid(x, x), axis=-1).reshape(-1, 2)
+
+    count = sum(p.contains_points(points).astype(int) for p in polygons)
+
+    expected = 1 - (1 - alpha)**count
+
+    # pixels at the very border of a chord may differ (polygonal
+    # approximation of the curves)
+    close = np.isclose(image[..., 3].ravel(), expected)
+
+    assert np.mean(close) > 0.98
+
+    # only red and blue are mixed, and nothing is drawn outside of the disk
+    assert np.allclose(image[..., 1], 0)
+
+    outside = np.hypot(*points.T) > 0.9
+
+    assert np.all(image[..., 3].ravel()[outside] == 0)
+
+
+@pytest.mark.parametrize("gradient_mode", ["image", "mesh"])
+def test_no_clip_path(gradient_mode):
+    ''' Gradients are not clipped by a path made of all chords '''
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+
+    chord_diagram(MAT, use_gradient=True, gradient_mode=gradient_mode, ax=ax)
+
+    artists = ax.images if gradient_mode == "image" else ax.artists
+
+    assert len(artists) == 1
+    assert artists[0].get_clip_path() is None
+
+    fig.canvas.draw()
+
+
+def _squares_mesh(alpha):
+    ''' Two overlapping red and blue squares, each made of two triangles '''
+    square = np.array([[[0, 0], [1, 0], [1, 1]], [[0, 0], [1, 1], [0, 1]]])
+
+    triangles = np.array([square*0.5 - 0.25, square*0.5])
+
+    colors = np.zeros((2, 2, 3, 4))
+    colors[0, ..., 0] = colors[1, ..., 2] = colors[..., 3] = 1
+
+    return GradientMesh(triangles, colors, alpha=alpha)
+
+
+def test_mesh_compositing():
+    ''' Shapes blend like patches, without seams between their triangles '''
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(2, 2), dpi=50)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(-0.5, 1)
+    ax.set_ylim(-0.5, 1)
+
+    mesh = ax.add_artist(_squares_mesh(alpha=0.5))
+
+    assert mesh.get_clip_path() is None
+
+    fig.canvas.draw()
+
+    image = np.asarray(fig.canvas.buffer_rgba())[::-1, :, :3].astype(float)
+
+    def pixel(x, y):
+        return image[int((y + 0.5)/1.5*100), int((x + 0.5)/1.5*100)]
+
+    # red only, on the diagonal of the first square and outside of it
+    assert np.allclose(pixel(-0.1, -0.1), [255, 127.5, 127.5], atol=1)
+    assert np.allclose(pixel(-0.2, 0.1), [255, 127.5, 127.5], atol=1)
+
+    # blue above red, and white outside of both squares
+    assert np.allclose(pixel(0.1, 0.1), [127.5, 63.75, 191.25], atol=1)
+    assert np.allclose(pixel(0.5, -0.4), 255)
+
+
+@pytest.mark.parametrize("rasterized", [False, True])
+def test_mesh_vector(rasterized):
+    ''' The mesh is rasterized in vector outputs only if required '''
+    import io
+
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+
+    mesh = ax.add_artist(_squares_mesh(alpha=0.5))
+    mesh.set_rasterized(rasterized)
+
+    out = io.StringIO()
+
+    fig.savefig(out, format="svg")
+
+    assert ("<image" in out.getvalue()) == rasterized
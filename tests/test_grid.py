@@ -0,0 +1,63 @@
+"""
+Small multiples.
+"""
+
+import numpy as np
+import pytest
+
+from mpl_chord_diagram import chord_diagram, chord_grid
+from mpl_chord_diagram.grid import _shared_extents
+
+
+rng = np.random.default_rng(0)
+
+MAT = rng.integers(0, 10, size=(5, 5))
+
+
+def test_empty():
+    with pytest.raises(ValueError, match="At least one matrix"):
+        chord_grid([])
+
+
+def test_shape_mismatch():
+    with pytest.raises(ValueError, match="same shape"):
+        chord_grid([MAT, MAT[:4, :4]])
+
+
+def test_shared_extents():
+    ''' A degree represents the same flux in all panels '''
+    pad, extent = 2., 360
+    fixed = pad*len(MAT)
+
+    extents = _shared_extents([MAT, 0.5*MAT, 0*MAT], extent, pad, 0)
+
+    assert extents[0] == extent
+    assert np.isclose(extents[1] - fixed, 0.5*(extent - fixed))
+    assert extents[2] == fixed
+
+    # unchanged when no panel has any flux
+    assert _shared_extents([0*MAT, 0*MAT], extent, pad, 0) == [extent]*2
+
+
+@pytest.mark.parametrize("shared_scale", [True, False])
+def test_panels(shared_scale):
+    ''' The largest panel is the same as a single diagram '''
+    axes, results = chord_grid([0.5*MAT, MAT], shared_scale=shared_scale,
+                               titles=["a", "b"])
+
+    assert len(axes) == len(results) == 2
+    assert [ax.get_title() for ax in axes] == ["a", "b"]
+
+    ref = chord_diagram(MAT)
+
+    assert np.allclose(results[1], ref)
+
+    # the nodes of the smaller panel only span a part of the circle
+    same = np.allclose(results[0], ref)
+
+    assert same != shared_scale
+
+
+def test_invalid_argument():
+    with pytest.raises(TypeError, match="cache"):
+        chord_grid([MAT], cache=None)
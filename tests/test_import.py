@@ -0,0 +1,86 @@
+"""
+Import-time budget of the package.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# maximal duration of ``import mpl_chord_diagram`` (a few milliseconds are
+# expected, the margin is for slow or loaded machines)
+MAX_IMPORT_TIME = 0.5
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def run(tmp_path):
+    ''' Run a script in a fresh interpreter importing the source tree '''
+    # the repository root is the package directory
+    os.symlink(ROOT, tmp_path / "mpl_chord_diagram")
+
+    env = dict(os.environ, PYTHONPATH=str(tmp_path))
+
+    def run_script(script):
+        res = subprocess.run([sys.executable, "-c", script], env=env,
+                             cwd=str(tmp_path), capture_output=True,
+                             text=True)
+
+        assert res.returncode == 0, res.stderr
+
+        return res.stdout.split()
+
+    return run_script
+
+
+def test_import_budget(run):
+    ''' The package is imported without NumPy, SciPy, or matplotlib '''
+    out = run(
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import mpl_chord_diagram\n"
+        "print(time.perf_counter() - start)\n"
+        "for m in ('numpy', 'scipy', 'matplotlib'):\n"
+        "    print(m in sys.modules)\n")
+
+    duration, loaded = float(out[0]), out[1:]
+
+    assert loaded == ["False"]*3, \
+        "numpy, scipy, matplotlib loaded: {}".format(loaded)
+
+    assert duration < MAX_IMPORT_TIME
+
+
+@pytest.mark.parametrize("submodule", ["grouping", "diagram", "grid"])
+def test_chord_diagram_not_shadowed(run, submodule):
+    ''' Importing a submodule does not hide the chord_diagram function '''
+    out = run(
+        "import mpl_chord_diagram.{}\n"
+        "from mpl_chord_diagram import chord_diagram\n"
+        "print(callable(chord_diagram), type(chord_diagram).__name__)\n"
+        .format(submodule))
+
+    assert out == ["True", "function"]
+
+
+def test_deprecated_module(run):
+    ''' The former chord_diagram submodule is a callable alias '''
+    out = run(
+        "import warnings\n"
+        "warnings.simplefilter('error', DeprecationWarning)\n"
+        "try:\n"
+        "    import mpl_chord_diagram.chord_diagram\n"
+        "except DeprecationWarning:\n"
+        "    print('warned')\n"
+        "warnings.simplefilter('ignore', DeprecationWarning)\n"
+        "import inspect\n"
+        "import mpl_chord_diagram as mcd\n"
+        "from mpl_chord_diagram.chord_diagram import chord_arc, ideogram_arc\n"
+        "print(chord_arc is mcd.chord_arc, ideogram_arc is mcd.ideogram_arc)\n"
+        "print('mat' in inspect.signature(mcd.chord_diagram).parameters)\n"
+        "print(len(mcd.chord_diagram([[1, 2], [3, 4]])))\n")
+
+    assert out == ["warned", "True", "True", "True", "2"]
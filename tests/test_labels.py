@@ -0,0 +1,146 @@
+"""
+Selection of the visible names.
+"""
+
+import numpy as np
+import pytest
+
+from mpl_chord_diagram import ChordDiagram, chord_diagram, compute_layout
+from mpl_chord_diagram.labels import name_extents, visible_names
+
+
+def _layout(num_nodes, extent=360, seed=0):
+    rng = np.random.default_rng(seed)
+
+    # a few large nodes and many small ones
+    mat = rng.pareto(1, (num_nodes, num_nodes))
+
+    return compute_layout(mat, extent=extent, pad=0.2)
+
+
+def _reference(layout, extents, min_angle, radius=1.05):
+    ''' Names kept from the largest arc, by testing all the kept names '''
+    size = layout.arcs[:, 1] - layout.arcs[:, 0]
+    center = layout.arcs.mean(axis=1)
+    half = np.degrees(0.5*extents / radius)
+
+    shifts = (-360, 0, 360) if layout.extent >= 360 else (0,)
+
+    kept = []
+
+    for i in np.argsort(-size, kind="stable"):
+        if size[i] < min_angle:
+            continue
+
+        if all(abs(center[i] - center[j] + s) >= half[i] + half[j]
+               for j in kept for s in shifts):
+            kept.append(i)
+
+    visible = np.zeros(len(size), dtype=bool)
+    visible[kept] = True
+
+    return visible
+
+
+@pytest.mark.parametrize("extent", [360, 270])
+@pytest.mark.parametrize("min_angle", [0, 1])
+def test_overlaps(extent, min_angle):
+    ''' Same names as testing each pair of names '''
+    layout = _layout(300, extent)
+
+    extents = np.random.default_rng(1).uniform(0.01, 0.1, layout.num_nodes)
+
+    visible = visible_names(layout, extents, min_angle=min_angle,
+                            avoid_overlap=True)
+
+    assert np.array_equal(visible, _reference(layout, extents, min_angle))
+    assert 0 < visible.sum() < layout.num_nodes
+
+
+def test_min_angle():
+    layout = _layout(50)
+
+    size = layout.arcs[:, 1] - layout.arcs[:, 0]
+
+    assert np.array_equal(visible_names(layout, min_angle=3), size >= 3)
+    assert visible_names(layout).all()
+
+
+def test_extents():
+    ''' Estimated widths are those of the texts '''
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(5, 5))
+
+    ax.set_xlim(-1.1, 1.1)
+    ax.set_ylim(-1.1, 1.1)
+    ax.set_aspect(1)
+
+    names = ["a", "node 12", "A much longer name", "WW"]
+
+    extents = name_extents(names, 10, [False]*4, ax)
+
+    fig.canvas.draw()
+
+    renderer = fig.canvas.get_renderer()
+    scale = 2.2 / min(ax.get_window_extent().width,
+                      ax.get_window_extent().height)
+
+    for name, extent in zip(names, extents):
+        width = ax.text(0, 0, name, fontsize=10).get_window_extent(
+            renderer).width
+
+        assert np.isclose(extent, scale*width, rtol=0.1)
+
+    # the height is used for radial names
+    rotated = name_extents(names, 10, [True]*4, ax)
+
+    assert np.allclose(rotated, rotated[0])
+
+
+def test_diagrams():
+    ''' Only the visible names are created, or shown '''
+    rng = np.random.default_rng(0)
+
+    mat = rng.pareto(1, (100, 100)) * (rng.uniform(size=(100, 100)) < 0.05)
+    names = ["node {}".format(i) for i in range(100)]
+
+    layout = compute_layout(mat)
+
+    size = layout.arcs[:, 1] - layout.arcs[:, 0]
+
+    _, ax = _subplots()
+
+    chord_diagram(mat, names=names, ax=ax, min_name_angle=2)
+
+    assert len(ax.texts) == np.sum(size >= 2)
+
+    _, ax = _subplots()
+
+    chord_diagram(mat, names=names, ax=ax, hide_overlapping_names=True)
+
+    shown = len(ax.texts)
+
+    assert 0 < shown < 100
+
+    _, ax = _subplots()
+
+    diagram = ChordDiagram(mat, names=names, ax=ax,
+                           hide_overlapping_names=True)
+
+    assert sum(t.get_visible() for t in diagram.texts) == shown
+
+    # larger nodes for the second half
+    mat[50:] *= 10
+
+    diagram.update(mat)
+
+    visible = [i for i, t in enumerate(diagram.texts) if t.get_visible()]
+
+    assert np.mean(np.array(visible) >= 50) > 0.5
+
+
+def _subplots():
+    import matplotlib.pyplot as plt
+
+    return plt.subplots(figsize=(5, 5))
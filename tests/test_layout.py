@@ -0,0 +1,154 @@
+"""
+Layout of the arcs and chords.
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as ssp
+
+from mpl_chord_diagram import compute_layout
+from mpl_chord_diagram.utilities import _get_bounds
+
+
+def _reference_positions(mat, sort, directed, start_at=0, extent=360,
+                         pad=2.):
+    '''
+    Arcs and chord positions computed by the original loop over the rows of
+    the dense matrix (ties are broken by column index).
+    '''
+    num_nodes = len(mat)
+
+    out_deg = mat.sum(axis=1)
+    in_deg = mat.sum(axis=0)
+    deg = out_deg + in_deg if directed else out_deg
+
+    y = deg / np.sum(deg) * (extent - pad*num_nodes)
+    y_out = out_deg / np.sum(deg) * (extent - pad*num_nodes)
+
+    starts = [start_at] + (start_at + np.cumsum(y + pad)).tolist()
+    out_ends = [s + d for s, d in zip(starts, y_out if directed else y)]
+
+    def normed(m, x, start, end):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return [np.nan_to_num(m[i] / x[i]) * (end[i] - start[i])
+                    for i in range(num_nodes)]
+
+    zmat = normed(mat, out_deg if directed else deg, starts, out_ends)
+    zin_mat = normed(mat.T, in_deg, out_ends, np.array(starts[1:]) - pad) \
+        if directed else zmat
+
+    if sort == "size":
+        mat_ids = [np.argsort(z, kind="stable") for z in zmat]
+    elif sort == "distance":
+        mat_ids = []
+
+        for i in range(num_nodes):
+            half = int(0.5*num_nodes)
+            remainder = 0 if num_nodes % 2 else -1
+
+            ids = list(range(i - half, i))[::-1]
+            ids += [] if directed else [i]
+            ids += list(range(i + half + remainder, i, -1))
+            ids += [i] if directed else []
+
+            mat_ids.append(np.array(ids) % num_nodes)
+    else:
+        mat_ids = [np.arange(num_nodes)]*num_nodes
+
+    arcs, pos = [], {}
+
+    for i in range(num_nodes):
+        arcs.append((starts[i], starts[i] + y[i]))
+
+        z0 = starts[i]
+
+        for j in mat_ids[i]:
+            zj = zin_mat[j]
+            startj = out_ends[j] if directed else starts[j]
+
+            jids = mat_ids[j]
+
+            if directed and sort != "distance":
+                jids = jids[::-1]
+
+            stop = np.where(jids == i)[0][0]
+
+            startji = startj + zj[jids[:stop]].sum()
+
+            if sort == "distance" and directed:
+                startji += zj[j]
+
+            if sort == "distance" and directed and i == j:
+                pos[(i, j)] = (z0, z0 + zmat[i][j], startj, startj + zj[j])
+            else:
+                pos[(i, j)] = (z0, z0 + zmat[i][j], startji,
+                               startji + zj[jids[stop]])
+
+            z0 += zmat[i][j]
+
+    return np.array(arcs), pos
+
+
+def _random_matrix(rng, num_nodes, density, directed):
+    mat = rng.uniform(0, 10, (num_nodes, num_nodes))
+    mat *= rng.uniform(size=mat.shape) < density
+
+    # a node without any flux
+    mat[0] = mat[:, 0] = 0
+
+    return mat if directed else mat + mat.T
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("sort", ["size", "distance", None])
+@pytest.mark.parametrize("num_nodes", [5, 6, 40])
+def test_reference_positions(num_nodes, sort, directed):
+    ''' Same layout as the original implementation, up to rounding '''
+    rng = np.random.default_rng(num_nodes)
+
+    for density in (0.3, 1):
+        mat = _random_matrix(rng, num_nodes, density, directed)
+
+        arcs, pos = _reference_positions(mat, sort, directed, start_at=10,
+                                         extent=300)
+
+        layout = compute_layout(mat, sort=sort, directed=directed,
+                                start_at=10, extent=300)
+
+        ref = np.array([pos[(i, j)] for i, j in zip(layout.row, layout.col)])
+
+        assert np.allclose(layout.arcs, arcs, rtol=0, atol=1e-10)
+        assert np.allclose(layout.positions, ref, rtol=0, atol=1e-10)
+
+        # chords are drawn for all nonzero entries
+        expected = mat if directed else np.tril(mat + mat.T)
+
+        assert len(layout) == np.count_nonzero(expected)
+
+        # sparse inputs give the same layout
+        sparse = compute_layout(ssp.csr_matrix(mat), sort=sort,
+                                directed=directed, start_at=10, extent=300)
+
+        assert np.array_equal(sparse.positions, layout.positions)
+
+
+def test_bounds_summation():
+    ''' Summation order of the source and target positions '''
+    z = np.array([0.3, 0.2, 0.5, 0.7])
+    indptr = np.array([0, 3, 3, 4])
+    order = np.array([1, 0, 2, 3])
+    starts = np.array([0.1, 20., 30.])
+
+    src, end = _get_bounds(indptr, order, z, starts)
+
+    # accumulated from the start of the row
+    assert src.tolist() == [0.1 + 0.2, 0.1, (0.1 + 0.2) + 0.3, 30.]
+    assert np.array_equal(end, src + z)
+
+    tgt, end = _get_bounds(indptr, order, z, starts, offsets=True)
+
+    # offset within the row, then added to its start
+    assert tgt.tolist() == [0.1 + 0.2, 0.1, 0.1 + (0.2 + 0.3), 30.]
+    assert np.array_equal(end, tgt + z)
+
+    assert src[2] != tgt[2]
@@ -0,0 +1,116 @@
+"""
+Picking the node or chord under a point.
+"""
+
+import numpy as np
+import pytest
+
+from mpl_chord_diagram import PickIndex, compute_geometry, compute_layout
+from mpl_chord_diagram.geometry import polygon_vertices
+from mpl_chord_diagram.picking import _contains
+
+
+def _diagram(num_nodes, directed=False, **kwargs):
+    rng = np.random.default_rng(num_nodes)
+
+    mat = rng.uniform(0, 10, (num_nodes, num_nodes))
+    mat *= rng.uniform(size=mat.shape) < 0.5
+
+    layout = compute_layout(mat, directed=directed, **kwargs)
+
+    return layout, compute_geometry(layout)
+
+
+def _brute_force(layout, geometry, x, y):
+    ''' Topmost chord or stub containing the point, testing all of them '''
+    topmost = -1
+
+    others = len(layout) + np.arange(len(layout.other_node))
+
+    for ids, verts, codes in (
+            (geometry.chord_ids, geometry.chord_vertices,
+             geometry.chord_codes),
+            (geometry.self_chord_ids, geometry.self_chord_vertices,
+             geometry.self_chord_codes),
+            (others, geometry.other_vertices, geometry.self_chord_codes)):
+        hits = np.asarray(ids)[_contains(polygon_vertices(verts, codes), x,
+                                         y)]
+
+        if len(hits):
+            topmost = max(topmost, hits.max())
+
+    return topmost
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("kwargs", [{}, {"max_chords": 20}])
+def test_chords(directed, kwargs):
+    ''' Same result as testing every shape, inside the disk '''
+    layout, geometry = _diagram(20, directed, **kwargs)
+
+    index = PickIndex(layout, geometry)
+
+    rng = np.random.default_rng(1)
+
+    num_hits = 0
+
+    for r, theta in zip(np.sqrt(rng.uniform(0, 1, 2000))*geometry.radius,
+                        rng.uniform(0, 2*np.pi, 2000)):
+        x, y = r*np.cos(theta), r*np.sin(theta)
+
+        shape = _brute_force(layout, geometry, x, y)
+        hit = index.pick(x, y)
+
+        if shape < 0:
+            assert hit is None
+        elif shape < len(layout):
+            assert hit.kind == "chord" and hit.index == shape
+            assert (hit.source, hit.target) == (layout.row[shape],
+                                                layout.col[shape])
+
+            num_hits += 1
+        else:
+            assert hit.kind == "other"
+            assert hit.index == shape - len(layout)
+
+    # both hits and misses were tested
+    assert 0 < num_hits < 2000
+
+
+def test_arcs():
+    layout, geometry = _diagram(10)
+
+    index = PickIndex(layout, geometry)
+
+    r = 1 - 0.5*geometry.width
+
+    for i, (start, end) in enumerate(layout.arcs):
+        theta = np.radians(0.5*(start + end))
+
+        hit = index.pick(r*np.cos(theta), r*np.sin(theta))
+
+        assert hit.kind == "node" and hit.source == hit.target == i
+
+    # in the padding between two arcs
+    theta = np.radians(layout.arcs[0, 1] + 1)
+
+    assert index.pick(r*np.cos(theta), r*np.sin(theta)) is None
+
+
+def test_outside():
+    layout, geometry = _diagram(10)
+
+    index = PickIndex(layout, geometry)
+
+    assert index.pick(None, 0.5) is None
+    assert index.pick(1.2, 0) is None
+    assert index.pick(-0.8, -0.8) is None
+
+
+def test_self_chords_only():
+    ''' Nothing at the center when there are only self-chords '''
+    layout = compute_layout(np.eye(3))
+
+    index = PickIndex(layout, compute_geometry(layout))
+
+    assert index.pick(0, 0) is None
@@ -0,0 +1,39 @@
+"""
+Profiling of the drawing stages.
+"""
+
+import numpy as np
+import pytest
+
+from mpl_chord_diagram import chord_diagram, profile_stages
+
+
+MAT = np.random.default_rng(0).integers(0, 10, size=(6, 6))
+
+
+def _profile(**kwargs):
+    with profile_stages() as report:
+        chord_diagram(MAT, **kwargs)
+
+    return {s.name: s for s in report.stages}
+
+
+def test_stages():
+    stages = _profile()
+
+    for name in ("layout", "geometry", "tight_layout"):
+        assert name in stages
+
+    assert sum(s.vertices for s in stages.values()) > 0
+
+
+@pytest.mark.parametrize("use_collections", [False, True])
+def test_rasterized_vertices(use_collections):
+    ''' Chords drawn by a RasterizedLayer are counted '''
+    ref = _profile(use_collections=use_collections)
+    res = _profile(use_collections=use_collections, rasterize_chords=True)
+
+    count = [sum(s.vertices for s in stages.values())
+             for stages in (ref, res)]
+
+    assert count[0] == count[1]
@@ -0,0 +1,151 @@
+"""
+Pruning of the smallest chords, with the "other" flux segments.
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as ssp
+
+from mpl_chord_diagram import compute_layout
+
+
+def _matrix(num_nodes=12, seed=0):
+    rng = np.random.default_rng(seed)
+
+    mat = rng.uniform(0, 10, (num_nodes, num_nodes))
+
+    return mat * (rng.uniform(size=mat.shape) < 0.6)
+
+
+def _sizes(layout):
+    ''' Size of each chord, as used to rank them '''
+    if layout.directed:
+        return layout.flux
+
+    return np.where(layout.row == layout.col, layout.flux,
+                    layout.flux + layout.reverse_flux)
+
+
+def _coverage(layout):
+    ''' Angle covered on each arc by the chords and the "other" segments '''
+    covered = np.zeros(len(layout.arcs))
+
+    pos = layout.positions
+
+    np.add.at(covered, layout.row, pos[:, 1] - pos[:, 0])
+    np.add.at(covered, layout.col, pos[:, 3] - pos[:, 2])
+
+    if not layout.directed:
+        # self-chords start and end on the same segment
+        is_self = layout.row == layout.col
+
+        np.subtract.at(covered, layout.row[is_self],
+                       (pos[:, 3] - pos[:, 2])[is_self])
+
+    np.add.at(covered, layout.other_node,
+              layout.other_positions[:, 1] - layout.other_positions[:, 0])
+
+    return covered
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("kwargs", [
+    {"max_chords": 10}, {"min_flux_fraction": 0.02}, {"top_k": 2},
+    {"max_chords": 15, "top_k": 3}])
+def test_invariants(directed, kwargs):
+    mat = _matrix()
+
+    full = compute_layout(mat, directed=directed)
+    pruned = compute_layout(mat, directed=directed, **kwargs)
+
+    # the arcs keep their sizes
+    assert np.allclose(pruned.arcs, full.arcs)
+
+    # the kept chords are chords of the full layout, with the same flux
+    chords = {(i, j): k for k, (i, j) in enumerate(zip(full.row, full.col))}
+    kept = [chords[(i, j)] for i, j in zip(pruned.row, pruned.col)]
+
+    assert np.allclose(pruned.flux, full.flux[kept])
+    assert np.allclose(pruned.reverse_flux, full.reverse_flux[kept])
+
+    sizes = _sizes(full)
+    removed = np.setdiff1d(np.arange(len(full)), kept)
+
+    assert 0 < len(kept) < len(full)
+
+    if "max_chords" in kwargs:
+        assert len(kept) <= kwargs["max_chords"]
+
+    if "min_flux_fraction" in kwargs:
+        assert sizes[kept].min() >= kwargs["min_flux_fraction"]*sizes.sum()
+
+    if kwargs.keys() == {"max_chords"} or kwargs.keys() == {
+            "min_flux_fraction"}:
+        # the largest chords are kept
+        assert sizes[kept].min() >= sizes[removed].max()
+
+    if "top_k" in kwargs:
+        k = kwargs["top_k"]
+
+        for c in kept:
+            i, j = full.row[c], full.col[c]
+
+            rank_i = np.sum(sizes[full.row == i] > sizes[c]) if directed \
+                else np.sum(sizes[(full.row == i) | (full.col == i)] >
+                            sizes[c])
+            rank_j = np.sum(sizes[(full.row == j) | (full.col == j)] >
+                            sizes[c])
+
+            assert rank_i < k or (not directed and rank_j < k)
+
+    # the pruned flux is gathered in the "other" segments, which fill the
+    # rest of the arcs
+    total = mat.sum()
+    pruned_flux = total - pruned.flux.sum() - (
+        0 if directed else pruned.reverse_flux[pruned.row != pruned.col].sum())
+
+    num_ends = 2 if directed else 1
+
+    assert np.isclose(pruned.other_flux.sum(), num_ends*pruned_flux)
+
+    lengths = pruned.arcs[:, 1] - pruned.arcs[:, 0]
+
+    assert np.allclose(_coverage(pruned), lengths)
+
+    for node, (start, end) in zip(pruned.other_node, pruned.other_positions):
+        assert pruned.arcs[node, 0] - 1e-9 <= start <= end \
+            <= pruned.arcs[node, 1] + 1e-9
+
+
+def test_sparse():
+    ''' Same pruning for dense and sparse matrices '''
+    mat = _matrix()
+
+    dense = compute_layout(mat, max_chords=10, top_k=3)
+    sparse = compute_layout(ssp.csr_matrix(mat), max_chords=10, top_k=3)
+
+    for attr in ("row", "col", "positions", "other_node", "other_positions",
+                 "other_flux"):
+        assert np.allclose(getattr(dense, attr), getattr(sparse, attr))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_all_pruned(directed):
+    ''' All the flux goes into the "other" segments '''
+    layout = compute_layout(np.ones((4, 4)), directed=directed,
+                            min_flux_fraction=0.5)
+
+    assert len(layout) == 0
+    assert np.isclose(layout.other_flux.sum(), 16*(2 if directed else 1))
+
+
+def test_no_pruning():
+    ''' Thresholds keeping all the chords give no "other" segment '''
+    mat = _matrix()
+
+    full = compute_layout(mat)
+    layout = compute_layout(mat, max_chords=len(full))
+
+    assert len(layout) == len(full)
+    assert np.allclose(layout.positions, full.positions)
+    assert np.allclose(layout.other_flux, 0)
@@ -2,8 +2,8 @@
 Utilities for the chord diagram.
 """
 
-from collections import defaultdict
 import numpy as np
+import scipy.sparse as ssp
 
 
 def dist(points):
@@ -31,7 +31,7 @@ def polar2xy(r, theta):
 
 
 def compute_positions(mat, deg, in_deg, out_deg, start_at, is_sparse, sort,
-                      directed, extent, pad, arc, rotation, nodePos, pos):
+                      directed, extent, pad):
     '''
     Compute all arcs and chords start/end positions.
 
@@ -60,17 +60,31 @@ def compute_positions(mat, deg, in_deg, out_deg, start_at, is_sparse, sort,
         Angular aperture of the diagram.
     pad : float
         Gap between entries.
-    arc : list
-        Used to store the arcs start and endpoints.
-    rotation : list
-        Store the rotation booleans for the names.
-    nodePos : list
-        Store the name positions.
-    pos : dict
-        Store the start and end positions for each arc under the form:
+
+    Returns
+    -------
+    arcs : array of shape (N, 2)
+        The arcs start and endpoints.
+    rotation : bool array
+        The rotation booleans for the names.
+    node_pos : array of shape (N, 3)
+        The name positions and angles.
+    row, col : int arrays
+        Source and target of each chord to draw, in COO order (only the
+        chords with ``row >= col`` are returned if `directed` is False).
+    positions : array of shape (num_chords, 4)
+        The start and end positions for each chord under the form:
         (start1, end1, start2, end2), where (start1, end1) are the limits of the
         chords starting point, and (start2, end2) are the limits of the chord's
         end point.
+    flux, reverse_flux : arrays
+        The values of ``mat[row, col]`` and ``mat[col, row]``.
+
+    Notes
+    -----
+    The matrix is never densified: all computations are done on its CSR
+    structure, so time and memory are proportional to the number of nonzero
+    entries.
     '''
     num_nodes = len(deg)
 
@@ -85,113 +99,226 @@ def compute_positions(mat, deg, in_deg, out_deg, start_at, is_sparse, sort,
 
     out_ends = [s + d for s, d in zip(starts, (y_out if directed else y))]
 
+    starts, out_ends = np.array(starts), np.array(out_ends)
+
+    # symmetric structure: each chord (i, j) has an entry in both row i and
+    # row j, containing mat[i, j] (out_val) and mat[j, i] (in_val)
+    indptr, indices, out_val, in_val = _get_symmetric_structure(mat)
+
+    rows = np.repeat(np.arange(num_nodes), np.diff(indptr))
 
     # relative positions within an arc
-    zmat = [
-        _get_normed_line(mat, i, out_deg if directed else deg, starts[i],
-                         out_ends[i], is_sparse)
-        for i in range(num_nodes)
-    ]
+    z = _get_normed_data(out_val, rows, out_deg if directed else deg,
+                         starts[:-1], out_ends)
 
-    zin_mat = zmat
+    zin = z
 
     if directed:
-        zin_mat = [
-            _get_normed_line(mat.T, i, in_deg, out_ends[i], starts[i + 1] - pad,
-                             is_sparse)
-            for i in range(num_nodes)
-        ]
+        zin = _get_normed_data(in_val, rows, in_deg, out_ends,
+                               starts[1:] - pad)
 
     # sort
-    mat_ids = _get_sorted_ids(sort, zmat, num_nodes, directed)
-
-    # compute positions
-    for i in range(num_nodes):
-        # arcs
-        start = starts[i]
-        end = start + y[i]
-        arc.append((start, end))
-        angle = 0.5*(start + end)
-
-        if -30 <= (angle % 360) <= 180:
-            angle -= 90
-            rotation.append(False)
-        else:
-            angle -= 270
-            rotation.append(True)
+    order = _get_sorted_ids(sort, indptr, indices, out_val, num_nodes,
+                            directed)
 
-        nodePos.append(
-            tuple(polar2xy(1.05, 0.5*(start + end)*np.pi/180.)) + (angle,))
+    tgt_order = order
 
-        # sort chords
-        z = zmat[i]
-        z0 = start
+    if directed:
+        tgt_order = _get_target_ids(sort, indptr, indices, order, num_nodes)
+
+    # positions of all entries within their arc
+    src_start, src_end = _get_bounds(indptr, order, z, starts)
 
-        for j in mat_ids[i]:
-            # compute the arrival points
-            zj = zin_mat[j]
-            startj = out_ends[j] if directed else starts[j]
+    tgt_start, tgt_end = _get_bounds(
+        indptr, tgt_order, zin, out_ends if directed else starts,
+        offsets=True)
 
-            jids = mat_ids[j]
+    # arcs
+    arcs = np.stack((starts[:-1], starts[:-1] + y), axis=1)
 
-            distsort = (sort == "distance")
+    angle = 0.5*(arcs[:, 0] + arcs[:, 1])
 
-            if directed and not distsort:
-                jids = jids[::-1]
+    rotation = ~((-30 <= (angle % 360)) & ((angle % 360) <= 180))
 
-            stop = np.where(np.equal(jids, i))[0][0]
+    node_pos = np.empty((num_nodes, 3))
+    node_pos[:, :2] = polar2xy(1.05, angle*np.pi/180.).T
+    node_pos[:, 2] = np.where(rotation, angle - 270, angle - 90)
 
-            startji = startj + zj[jids[:stop]].sum()
+    # chords: the end of chord (i, j) is given by entry (j, i)
+    transpose = _get_transpose_ids(rows, indices, num_nodes)
 
-            if distsort and directed:
-                # we want j first for target positions
-                startji += zj[j]
+    if directed:
+        keep = out_val > 0
+    else:
+        keep = (rows >= indices) & ((out_val > 0) | (in_val > 0))
 
-            if distsort and directed and i == j:
-                pos[(i, j)] = (z0, z0 + z[j], startj, startj + zj[j])
-            else:
-                pos[(i, j)] = (z0, z0 + z[j], startji, startji + zj[jids[stop]])
+    positions = np.stack((src_start, src_end, tgt_start[transpose],
+                          tgt_end[transpose]), axis=1)[keep]
 
-            z0 += z[j]
+    return (arcs, rotation, node_pos, rows[keep], indices[keep], positions,
+            out_val[keep], in_val[keep])
 
 
 # In-file functions
 
-def _get_normed_line(mat, i, x, start, end, is_sparse):
-    if is_sparse:
-        row = mat.getrow(i).todense().A1
-        return (row / x[i]) * (end - start)
+def _get_symmetric_structure(mat):
+    '''
+    Return the CSR structure (indptr, indices) of the union of the nonzero
+    patterns of `mat` and its transpose, together with the values of `mat`
+    and of its transpose for each entry of the structure.
+    '''
+    csr = ssp.csr_matrix(mat, dtype=float, copy=True)
+    csr.eliminate_zeros()
+    csr.sum_duplicates()
+
+    pattern = csr.copy()
+    pattern.data[:] = 1
+
+    pattern = (pattern + pattern.T).tocsr()
+    pattern.sort_indices()
+
+    rows = np.repeat(np.arange(csr.shape[0]), np.diff(pattern.indptr))
+    cols = pattern.indices
+
+    out_val = _get_values(csr, rows, cols)
+    in_val = _get_values(csr, cols, rows)
+
+    return pattern.indptr, pattern.indices, out_val, in_val
+
+
+def _get_values(csr, rows, cols):
+    '''
+    Return the values of a canonical CSR matrix for the (rows, cols) entries
+    (zero where the entry is not stored), without scalar indexing.
+    '''
+    num_nodes = csr.shape[1]
+
+    keys = np.repeat(np.arange(csr.shape[0], dtype=np.int64),
+                     np.diff(csr.indptr))*num_nodes + csr.indices
+
+    query = rows.astype(np.int64)*num_nodes + cols
+
+    idx = np.minimum(np.searchsorted(keys, query), max(len(keys) - 1, 0))
+
+    found = keys[idx] == query if len(keys) else np.zeros(len(query), bool)
+
+    return np.where(found, csr.data[idx] if len(keys) else 0., 0.)
+
+
+def _get_normed_data(values, rows, x, start, end):
+    '''
+    Angular size of each entry within its arc, going from `start` to `end`.
+    '''
+    x = x[rows]
+
+    normed = np.divide(values, x, out=np.zeros(len(values)), where=(x != 0))
+
+    return normed * (end - start)[rows]
+
+
+def _get_bounds(indptr, order, z, starts, offsets=False):
+    '''
+    Return the start and end positions of each entry given the order of the
+    entries in each row, their size `z`, and the start of each row.
+
+    The summation order is the one of the original loop over the rows: by
+    default, positions are accumulated from the start of the row (source
+    positions), if `offsets` is True, the sizes of the previous entries are
+    summed first, then added to the start of the row (target positions).
+    '''
+    start = np.empty(len(z))
+
+    lengths = np.diff(indptr)
+
+    # visit rows from the longest to the shortest, so that the rows having
+    # more than k entries are always the first ones
+    by_length = np.argsort(-lengths, kind="stable")
+    num_active = np.cumsum(np.bincount(lengths, minlength=1)[::-1])[::-1]
+
+    # running sums in each row, incremented rank after rank
+    row_starts = np.asarray(starts, dtype=float)[by_length]
+
+    current = np.zeros(len(by_length)) if offsets else row_starts.copy()
+
+    for k in range(1, len(num_active)):
+        active = by_length[:num_active[k]]
 
-    return (mat[i, :] / x[i]) * (end - start)
+        ids = order[indptr[active] + k - 1]
+
+        if offsets:
+            start[ids] = row_starts[:num_active[k]] + current[:num_active[k]]
+        else:
+            start[ids] = current[:num_active[k]]
+
+        current[:num_active[k]] += z[ids]
+
+    return start, start + z
+
+
+def _get_transpose_ids(rows, cols, num_nodes):
+    '''
+    For a symmetric CSR structure, return the position of entry (j, i) for
+    each entry (i, j).
+    '''
+    keys = rows.astype(np.int64)*num_nodes + cols
 
+    return np.searchsorted(keys, cols.astype(np.int64)*num_nodes + rows)
 
-def _get_sorted_ids(sort, zmat, num_nodes, directed):
-    mat_ids = defaultdict(lambda: list(range(num_nodes)))
 
-    if sort == "size":
-        mat_ids = [np.argsort(z) for z in zmat]
+def _get_sorted_ids(sort, indptr, indices, values, num_nodes, directed):
+    '''
+    Return the order of the entries of each row (as positions in the CSR
+    structure, row after row).
+    '''
+    rows = np.repeat(np.arange(num_nodes), np.diff(indptr))
+
+    if sort is None:
+        # the structure is already sorted by column
+        return np.arange(len(indices))
+    elif sort == "size":
+        return np.lexsort((indices, values, rows))
     elif sort == "distance":
-        mat_ids = []
-        for i in range(num_nodes):
-            remainder = 0 if num_nodes % 2 else -1
+        return np.lexsort(
+            (_distance_keys(rows, indices, num_nodes, directed), rows))
+
+    raise ValueError("Invalid `sort`: '{}'".format(sort))
+
+
+def _get_target_ids(sort, indptr, indices, order, num_nodes):
+    '''
+    Order of the entries of each row for the incoming chords (directed case).
+    '''
+    rows = np.repeat(np.arange(num_nodes), np.diff(indptr))
 
-            ids  = list(range(i - int(0.5*num_nodes), i))[::-1]
+    if sort == "distance":
+        # same order as outgoing chords, but the self-chord comes first
+        keys = _distance_keys(rows, indices, num_nodes, True)
+        keys[rows == indices] = -1
 
-            if not directed:
-                ids += [i]
+        return np.lexsort((keys, rows))
 
-            ids += list(range(i + int(0.5*num_nodes) + remainder, i, -1))
+    # otherwise, use the reverse order within each row
+    ranks = np.empty(len(order), dtype=int)
+    ranks[order] = np.arange(len(order))
 
-            if directed:
-                ids += [i]
+    return np.lexsort((-ranks, rows))
+
+
+def _distance_keys(rows, cols, num_nodes, directed):
+    '''
+    Rank of each column in its row when sorting by distance: the two closest
+    arcs on each side come first, then progressively the farthest ones.
+    '''
+    half = int(0.5*num_nodes)
+
+    dist = (rows - cols) % num_nodes
+
+    if directed:
+        # self-loop comes last
+        return (dist - 1) % num_nodes
 
-            # put them back into [0, num_nodes[
-            ids = np.array(ids)
-            ids[ids < 0] += num_nodes
-            ids[ids >= num_nodes] -= num_nodes
+    keys = np.where(dist <= half, dist - 1, dist)
 
-            mat_ids.append(ids)
-    elif sort is not None:
-        raise ValueError("Invalid `sort`: '{}'".format(sort))
+    keys[dist == 0] = half
 
-    return mat_ids
+    return keys